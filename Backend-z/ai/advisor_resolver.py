@@ -0,0 +1,164 @@
+"""
+Fuzzy advisor-name resolution.
+
+Archive advisor fields are hand-typed: titles vary ("Dr", "Dr.", "Prof.
+Dr."), names are misspelt ("Asad Afreen", "Urooj Amuddin") or split
+("Urooj Ain Uddin"), and co-supervised projects list several names joined
+by "/". Names are compared as sets of character trigrams of the
+title-free, lower-cased name; variants close enough to each other are
+grouped under one canonical name — the advisors collection's spelling when
+the person is in it, otherwise the archive's most frequent spelling.
+
+A query is scored against every variant as the mean of trigram Jaccard
+similarity and containment (the share of the query's trigrams found in the
+name, so a surname alone still matches), and resolves to the best group.
+"""
+
+import re
+from collections import Counter
+
+from ai.archive import normalize_advisor
+
+RESOLVE_MIN_CONFIDENCE = 0.45
+AMBIGUITY_MARGIN       = 0.05   # runner-up group this close -> ambiguous
+VARIANT_MIN_JACCARD    = 0.5    # typo / spacing variants of one name
+VARIANT_MIN_CONTAINED  = 0.85   # "ali ismail" inside "muhammad ali ismail"
+
+_CO_ADVISOR_SPLIT = re.compile(r"\s*(?:/|&|,|\band\b)\s*", re.IGNORECASE)
+
+
+def split_advisors(field: str) -> list[str]:
+    """Individual names of a (possibly co-supervised) advisor field."""
+    return [part for part in _CO_ADVISOR_SPLIT.split(str(field or "")) if part.strip()]
+
+
+def trigrams(name: str) -> frozenset:
+    padded = f"  {name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _similarity(query: frozenset, name: frozenset) -> tuple[float, float]:
+    """(Jaccard, containment of query in name)."""
+    shared = len(query & name)
+    return shared / len(query | name), shared / len(query)
+
+
+class AdvisorResolver:
+    def __init__(self, archive_fields, directory_names=()):
+        spellings: dict = {}   # normalized -> Counter of archive spellings
+        directory: dict = {}   # normalized -> advisors-collection spelling
+
+        for field in archive_fields:
+            for part in split_advisors(field):
+                norm = normalize_advisor(part)
+                if norm:
+                    spellings.setdefault(norm, Counter())[part.strip()] += 1
+        for name in directory_names:
+            norm = normalize_advisor(name)
+            if norm:
+                spellings.setdefault(norm, Counter())
+                directory[norm] = name.strip()
+
+        self._names    = sorted(spellings)
+        self._trigrams = {n: trigrams(n) for n in self._names}
+        self._index: dict = {}   # trigram -> normalized names containing it
+        for n, tris in self._trigrams.items():
+            for t in tris:
+                self._index.setdefault(t, set()).add(n)
+
+        self._group     = self._group_variants()
+        self._canonical: dict = {}
+        self._variants:  dict = {}
+        for root in set(self._group.values()):
+            members = [n for n in self._names if self._group[n] == root]
+            counts  = Counter()
+            for n in members:
+                counts.update(spellings[n])
+            listed = [n for n in members if n in directory]
+            if listed:
+                # the advisors collection is the system of record for spelling
+                best    = max(listed, key=lambda n: sum(spellings[n].values()))
+                display = directory[best]
+            else:
+                display = max(counts, key=lambda s: (counts[s], len(s)))   # ties: fullest spelling
+
+            self._canonical[root] = display
+            self._variants[root]  = {
+                "normalized":   members,
+                "spellings":    sorted(counts),
+                "projects":     sum(counts.values()),
+                "in_directory": bool(listed),
+            }
+
+    # ── grouping ────────────────────────────────────────────
+
+    def _group_variants(self) -> dict:
+        parent = {n: n for n in self._names}
+
+        def find(n):
+            while parent[n] != n:
+                parent[n] = parent[parent[n]]
+                n = parent[n]
+            return n
+
+        for n in self._names:
+            for other in self._candidates(self._trigrams[n]):
+                if other <= n:
+                    continue
+                a, b = self._trigrams[n], self._trigrams[other]
+                jaccard   = len(a & b) / len(a | b)
+                contained = len(a & b) / min(len(a), len(b))
+                if jaccard >= VARIANT_MIN_JACCARD or contained >= VARIANT_MIN_CONTAINED:
+                    parent[find(other)] = find(n)
+
+        return {n: find(n) for n in self._names}
+
+    def _candidates(self, tris: frozenset) -> set:
+        found: set = set()
+        for t in tris:
+            found |= self._index.get(t, set())
+        return found
+
+    # ── lookup ──────────────────────────────────────────────
+
+    def resolve(self, query: str) -> dict | None:
+        """
+        Canonical advisor for a free-form name, with a 0–1 confidence, or
+        None when nothing is close enough.
+        """
+        norm = normalize_advisor(query)
+        if not norm:
+            return None
+        q = trigrams(norm)
+
+        best_per_group: dict = {}
+        for name in self._candidates(q):
+            jaccard, contained = _similarity(q, self._trigrams[name])
+            score = (jaccard + contained) / 2
+            root  = self._group[name]
+            if score > best_per_group.get(root, (0.0, None))[0]:
+                best_per_group[root] = (score, name)
+
+        if not best_per_group:
+            return None
+        ranked = sorted(best_per_group.items(), key=lambda kv: -kv[1][0])
+        root, (score, matched) = ranked[0]
+        if score < RESOLVE_MIN_CONFIDENCE:
+            return None
+
+        runner_up = ranked[1][1][0] if len(ranked) > 1 else 0.0
+        return {
+            "query":        query,
+            "name":         self._canonical[root],
+            "confidence":   round(score, 4),
+            "matched":      matched,
+            "ambiguous":    score - runner_up < AMBIGUITY_MARGIN,
+            "alternatives": [self._canonical[r] for r, (s, _) in ranked[1:4]
+                             if s >= RESOLVE_MIN_CONFIDENCE],
+            **self._variants[root],
+        }
+
+    def matches_field(self, resolution: dict, field: str) -> bool:
+        """Whether an archive advisor field names the resolved advisor (as any co-advisor)."""
+        variants = set(resolution["normalized"])
+        return any(normalize_advisor(part) in variants for part in split_advisors(field))
@@ -0,0 +1,297 @@
+"""
+Structured agent traces, persisted off the request path.
+
+run_agent records one trace per request — every round with its LLM wall
+time and token usage, every tool call with its arguments, output size,
+truncation and wall time, and which Groq key served it — and hands it to
+submit_trace(). A single background thread batches queued traces into the
+`agent_traces` collection (and, with AGENT_TRACE_PRINT=1, renders the
+forensic report to stdout), so the request never waits on Mongo or
+terminal I/O. When the queue is full, traces are dropped and counted rather
+than blocking the caller.
+
+Each trace carries a flat `timings` list of {"stage", "ms"} samples —
+"total", "router", "llm" and "tool:<name>" — which stage_latency() rolls
+up into p50/p95/p99 per stage, plus the tool-output tokens sent to the LLM
+and how many the token-budgeted renderer saved.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+TRACE_PERSIST     = os.getenv("AGENT_TRACE_PERSIST", "1") == "1"
+TRACE_PRINT       = os.getenv("AGENT_TRACE_PRINT", "0") == "1"
+TRACE_QUEUE_MAX   = int(os.getenv("AGENT_TRACE_QUEUE_MAX", "1000"))
+TRACE_TTL_DAYS    = int(os.getenv("AGENT_TRACE_TTL_DAYS", "30"))
+TRACE_BATCH_MAX   = 50     # traces per insert_many
+TRACE_COLLECTION  = "agent_traces"
+
+_indexed = False
+
+
+def _mongo_sink(traces: list) -> None:
+    global _indexed
+    from db.db import db
+    collection = db[TRACE_COLLECTION]
+    if not _indexed:
+        collection.create_index("started_at", expireAfterSeconds=TRACE_TTL_DAYS * 86400)
+        _indexed = True
+    collection.insert_many(traces, ordered=False)
+
+
+class TraceWriter:
+    """Background batch writer; `sink(list_of_traces)` runs on its own thread."""
+
+    def __init__(self, sink=_mongo_sink, persist: bool = TRACE_PERSIST,
+                 echo: bool = TRACE_PRINT, maxsize: int = TRACE_QUEUE_MAX):
+        self.sink    = sink
+        self.persist = persist
+        self.echo    = echo
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed  = 0
+
+    def submit(self, trace: dict) -> None:
+        if not (self.persist or self.echo):
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="agent-trace-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < TRACE_BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch: list) -> None:
+        if self.echo:
+            for trace in batch:
+                print(render_trace(trace["rounds"]))
+        if not self.persist:
+            return
+        try:
+            self.sink(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"System Log: Agent trace write failed ({len(batch)} traces) — {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait (bounded) until every queued trace has been written."""
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self._queue.unfinished_tasks
+
+    def stats(self) -> dict:
+        return {
+            "queued":  self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed":  self.failed,
+        }
+
+
+trace_writer = TraceWriter()
+atexit.register(trace_writer.flush)
+
+
+def submit_trace(trace: dict) -> None:
+    trace_writer.submit(trace)
+
+
+def stage_timings(trace: dict) -> list:
+    """Flat [{"stage", "ms"}] samples of one finished trace."""
+    timings = [{"stage": "total", "ms": trace["total_ms"]}]
+    if trace.get("router_ms") is not None:
+        timings.append({"stage": "router", "ms": trace["router_ms"]})
+    for record in trace["rounds"]:
+        if record.get("llm_ms") is not None:
+            timings.append({"stage": "llm", "ms": record["llm_ms"]})
+        for tc in record["tool_calls"]:
+            if tc.get("ms") is not None:
+                timings.append({"stage": f"tool:{tc['tool']}", "ms": tc["ms"]})
+    return timings
+
+
+# ── Aggregates ──────────────────────────────────────────────
+
+def _percentile(ordered: list, pct: float) -> float:
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[idx], 2)
+
+
+async def stage_latency(collection, hours: float = 24) -> dict:
+    """p50/p95/p99 wall time per stage over traces of the last `hours` (async collection)."""
+    since  = datetime.now(timezone.utc) - timedelta(hours=hours)
+    groups = await collection.aggregate([
+        {"$match":  {"started_at": {"$gte": since}}},
+        {"$unwind": "$timings"},
+        {"$group":  {"_id": "$timings.stage", "ms": {"$push": "$timings.ms"}}},
+    ])
+
+    stages = {}
+    async for g in groups:
+        ordered = sorted(g["ms"])
+        stages[g["_id"]] = {
+            "count":  len(ordered),
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+            "max_ms": round(ordered[-1], 2),
+        }
+    return dict(sorted(stages.items()))
+
+
+# ── Forensic report ─────────────────────────────────────────
+
+def render_trace(trace: list) -> str:
+    """Box-drawn post-mortem of the agent's reasoning trace (one dict per round)."""
+    out = [
+        "\n" + "╔" + "═" * 68 + "╗",
+        "║  AGENT FORENSIC TRACE" + " " * 46 + "║",
+        "╠" + "═" * 68 + "╣",
+    ]
+
+    tools_called   = []
+    truncations    = []
+    errors         = []
+    skipped_round0 = False
+    rehydrated     = False
+
+    for record in trace:
+        rn = record["round"]
+
+        if record["free_text"] and rn == 0:
+            skipped_round0 = True
+        if record.get("rehydrated"):
+            rehydrated = True
+
+        prefix = f"║  Round {rn}"
+
+        if record.get("exit_reason") == "ROUND_LIMIT_EXHAUSTED":
+            out.append(f"{prefix}  ⚠  ROUND LIMIT EXHAUSTED — LLM summarised from memory")
+
+        elif record["free_text"]:
+            reason = record.get("exit_reason", "free text response")
+            out.append(f"{prefix}  →  No tool call. {reason}  (content: {record['content_len']} chars)")
+
+        else:
+            for tc in record["tool_calls"]:
+                tools_called.append(tc["tool"])
+
+                # Format the args cleanly
+                args_str = ", ".join(
+                    f'{k}="{v}"' if isinstance(v, str) else f"{k}={v}"
+                    for k, v in tc["args"].items()
+                )
+
+                status = "✓"
+                detail = f"{tc['output_len']} chars"
+                if tc.get("ms") is not None:
+                    detail += f", {tc['ms']:.0f} ms"
+                if tc.get("tokens_saved"):
+                    detail += (f", {tc['tokens']} tokens (saved {tc['tokens_saved']}"
+                               f"; {tc['compressed']} compressed, {tc['dropped']} dropped)")
+
+                if tc["error"]:
+                    status = "✗"
+                    detail = f"ERROR: {tc['error']}"
+                    errors.append((rn, tc["tool"], tc["error"]))
+
+                if tc["truncated"]:
+                    detail += "  ⚠ TRUNCATED"
+                    truncations.append((rn, tc["tool"]))
+
+                archive_note = ""
+                if "archive_result" in tc:
+                    archive_note = f"  [{tc['archive_result']}]"
+
+                via = "  (local router)" if record.get("routed") else ""
+                if tc.get("speculative"):
+                    via += "  (speculative hit)"
+                out.append(f"{prefix}  {status}  {tc['tool']}({args_str}){via}")
+                out.append(f"║       └─ {detail}{archive_note}")
+
+    out += [
+        "╠" + "═" * 68 + "╣",
+        "║  SUMMARY" + " " * 59 + "║",
+        "╠" + "═" * 68 + "╣",
+    ]
+
+    # Tool call sequence
+    seq = " → ".join(tools_called) if tools_called else "NONE"
+    out.append(f"║  Tool sequence    : {seq[:50]}")
+
+    # Hallucination risk flags
+    out.append("║  Hallucination flags:")
+
+    if skipped_round0 and rehydrated:
+        out.append("║    🟢  Round 0 answered from replayed tool results (follow-up)")
+    elif skipped_round0:
+        out.append("║    🔴  Round 0 had NO tool call — LLM responded from memory")
+        out.append("║        This is the primary hallucination vector.")
+    else:
+        out.append("║    🟢  Round 0 called a tool (retrieval-first confirmed)")
+
+    if "archive_search" not in tools_called:
+        out.append("║    🔴  archive_search was NEVER called — any project names")
+        out.append("║        in the response are hallucinated")
+    else:
+        out.append("║    🟢  archive_search was called")
+
+    if "web_search" not in tools_called:
+        out.append("║    🟡  web_search not called — no global novelty context")
+    else:
+        out.append("║    🟢  web_search was called")
+
+    if truncations:
+        for rn, tname in truncations:
+            out.append(f"║    🟡  Round {rn} {tname} output truncated — LLM saw partial data")
+    else:
+        out.append("║    🟢  No truncations")
+
+    for rn, tname, err in errors:
+        out.append(f"║    🔴  Round {rn} {tname} errored: {err}")
+
+    # Keyword quality check on archive_search args
+    for record in trace:
+        for tc in record["tool_calls"]:
+            if tc["tool"] == "archive_search":
+                q = tc["args"].get("query", "")
+                word_count = len(q.split())
+                if word_count > 6:
+                    out.append(f"║    🟡  archive_search query has {word_count} words: \"{q}\"")
+                    out.append("║        Expected 2–5 keywords. Retrieval quality may be degraded.")
+                else:
+                    out.append(f"║    🟢  archive_search query looks clean: \"{q}\"")
+
+    out.append("╚" + "═" * 68 + "╝\n")
+    return "\n".join(out)
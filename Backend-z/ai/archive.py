@@ -0,0 +1,164 @@
+"""
+Archive records, index locations and identity, importable without loading
+the embedding model or the agent (sidecar, offline build, analytics).
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Iterator
+
+from langchain_core.documents import Document
+
+SCRIPT_DIR      = Path(__file__).parent
+DATA_DIR        = SCRIPT_DIR / "data"
+FAISS_INDEX_DIR = SCRIPT_DIR / "faiss_index_cache"
+FAISS_SHARD_DIR = SCRIPT_DIR / "faiss_index_shards"   # one sub-index per batch year
+
+TECHNICAL_KEYWORDS = [
+    "machine learning", "deep learning", "neural network", "classification",
+    "object detection", "nlp", "natural language processing", "computer vision",
+    "transformer", "fine-tun", "training", "dataset", "model", "pipeline",
+    "iot", "embedded", "raspberry", "arduino", "sensor", "hardware",
+    "distributed", "microservices", "concurrency", "fault tolerance",
+    "recommendation", "clustering", "regression", "reinforcement",
+    "optimization", "algorithm", "graph neural", "simulation",
+    "real-time", "edge computing", "federated", "generative",
+    "api", "crud", "database", "portal", "management system"
+]
+
+COMPLEXITY_NEGATIVE_SIGNALS = [
+    "crud", "management system", "portal", "simple api", "basic website",
+    "information system", "booking system", "inventory system"
+]
+
+def extract_technical_patterns(text: str) -> dict:
+    text_lower = text.lower()
+    positive = [kw for kw in TECHNICAL_KEYWORDS
+                if kw in text_lower and kw not in COMPLEXITY_NEGATIVE_SIGNALS]
+    negative = [kw for kw in COMPLEXITY_NEGATIVE_SIGNALS if kw in text_lower]
+    return {"positive": positive, "negative": negative}
+
+
+def fingerprint_index(index_dir: Path) -> str:
+    """Short hash of the saved index files — identical across workers and restarts."""
+    h = hashlib.sha1()
+    for f in sorted(index_dir.rglob("*")):
+        if f.is_file():
+            st = f.stat()
+            name = f.relative_to(index_dir).as_posix()
+            h.update(f"{name}:{st.st_size}:{int(st.st_mtime)}".encode())
+    return h.hexdigest()[:12]
+
+
+_HONORIFICS = re.compile(r"\b(prof|dr|mr|mrs|ms|miss|sir|engr|ar)\b\.?|-ing\b", re.IGNORECASE)
+
+
+def normalize_advisor(name: str) -> str:
+    """Lower-cased advisor name without titles: "Prof. Dr. Abbas Ali" -> "abbas ali"."""
+    return " ".join(_HONORIFICS.sub(" ", str(name or "")).lower().replace("-", " ").split())
+
+
+_TERM_RE = re.compile(r"[a-z0-9][a-z0-9\-]{3,}")
+
+
+def args_share_term(args: dict, text: str) -> bool:
+    """
+    Whether a stored tool call's arguments share a content term (4+ chars)
+    with a message. Chat replays a stored result only when this holds, and
+    the agent only skips its forced retrieval round for such results, so
+    both sides must use this one rule.
+    """
+    arg_terms = set(_TERM_RE.findall(" ".join(str(v) for v in args.values()).lower()))
+    return bool(arg_terms & set(_TERM_RE.findall(text.lower())))
+
+
+def batch_key(batch) -> str:
+    """Shard key of a batch value: its 4-digit year, or "unknown"."""
+    m = re.search(r"\d{4}", str(batch))
+    return m.group() if m else "unknown"
+
+
+def install_index_dir(built_dir: Path, index_dir: Path = FAISS_INDEX_DIR) -> None:
+    """Move a freshly built index into place, keeping the old one as .previous."""
+    previous = index_dir.with_name(index_dir.name + ".previous")
+    shutil.rmtree(previous, ignore_errors=True)
+    if index_dir.exists():
+        index_dir.rename(previous)
+    built_dir.rename(index_dir)
+
+
+def archive_files(data_dir: Path = DATA_DIR) -> list[Path]:
+    return [data_dir / f for f in sorted(os.listdir(data_dir)) if f.endswith(".json")]
+
+
+def _stream_json_array(path: Path, chunk_size: int = 1 << 16) -> Iterator:
+    """Yield the elements of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf = f.read(chunk_size).lstrip()
+        if not buf.startswith("["):
+            raise ValueError("expected a JSON array")
+        buf = buf[1:]
+        eof = False
+        while True:
+            buf = buf.lstrip().lstrip(",").lstrip()
+            if buf.startswith("]"):
+                return
+            try:
+                item, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof   = not chunk
+                buf  += chunk
+                continue
+            yield item
+            buf = buf[end:]
+
+
+def iter_archive_records(data_dir: Path = DATA_DIR) -> Iterator[tuple[str, dict]]:
+    """(source filename, project record) for every record in the archive JSON files."""
+    for filepath in archive_files(data_dir):
+        try:
+            for project in _stream_json_array(filepath):
+                if isinstance(project, dict):
+                    yield filepath.name, project
+        except (ValueError, OSError) as e:
+            print(f"System Log: Skipping {filepath.name} — {e}")
+
+
+def record_to_document(project: dict, filename: str) -> Document | None:
+    title       = project.get("title", "").strip()
+    description = project.get("description", "").strip()
+    if not title or not description:
+        return None
+
+    semantic_content = (
+        f"Project Title: {title}\n"
+        f"Advisor: {project.get('advisor', 'Unknown')}\n"
+        f"Batch: {project.get('batch', 'N/A')}\n"
+        f"Students: {', '.join(project.get('team_members', []))}\n"
+        f"Description: {description}"
+    )
+    structured_metadata = {
+        "title":        title,
+        "advisor":      project.get("advisor", "Unknown"),
+        "team_members": project.get("team_members", []),
+        "batch":        project.get("batch", "N/A"),
+        "source_file":  filename
+    }
+    return Document(page_content=semantic_content, metadata=structured_metadata)
+
+
+def load_archive_documents(data_dir: Path = DATA_DIR) -> list[Document]:
+    documents = []
+    for filename, project in iter_archive_records(data_dir):
+        doc = record_to_document(project, filename)
+        if doc is not None:
+            documents.append(doc)
+    return documents
@@ -0,0 +1,239 @@
+"""
+Offline, parallel and resumable archive index build.
+
+Records are streamed from the archive JSON files and cut into fixed-size
+batches; each batch is embedded by a process-pool worker (one model copy
+per process, torch threads split between them) and checkpointed as a
+shard. An interrupted build picks up where it stopped: shards already on
+disk are skipped as long as the archive files, batch size and embedding
+backend are unchanged. The finished index is written in the same layout
+FAISS.save_local uses and moved into place; the running API picks it up
+through POST /retrieval/index/reload. With ARCHIVE_INDEX_SHARDED=1 (or
+--sharded) it is written as one such index per batch year under
+ai/faiss_index_shards/, the layout the API loads in that mode.
+
+    cd Backend-z
+    python -m ai.build_index --workers 4 --batch-size 256
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+
+from ai.archive import (
+    DATA_DIR, FAISS_INDEX_DIR, FAISS_SHARD_DIR, batch_key, fingerprint_index, install_index_dir,
+    iter_archive_records, record_to_document,
+)
+from ai.embeddings import EMBED_BACKEND, EMBEDDING_MODEL_NAME
+from ai.stats_cube import rebuild_stats_cube
+
+ARCHIVE_SHARDED = os.getenv("ARCHIVE_INDEX_SHARDED", "0") == "1"   # same switch the API reads
+
+
+# ============================================================
+# Worker process
+# ============================================================
+
+_model = None
+
+def _init_worker(backend: str, threads: int) -> None:
+    global _model
+    from ai.embeddings import configure_torch_threads, load_base_embeddings
+    _model = load_base_embeddings(backend)
+    configure_torch_threads(threads)
+
+
+def _embed_batch(shard_id: int, texts: list) -> tuple[int, np.ndarray]:
+    return shard_id, np.asarray(_model.embed_documents(texts), dtype=np.float32)
+
+
+# ============================================================
+# Checkpoints
+# ============================================================
+
+def _shard_path(work_dir: Path, shard_id: int) -> Path:
+    return work_dir / "shards" / f"shard_{shard_id:06d}.npy"
+
+
+def _write_shard(work_dir: Path, shard_id: int, vectors: np.ndarray) -> None:
+    path = _shard_path(work_dir, shard_id)
+    tmp  = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, vectors)
+    os.replace(tmp, path)   # a shard is either complete on disk or absent
+
+
+def _load_shard(work_dir: Path, shard_id: int, expected_rows: int) -> np.ndarray | None:
+    path = _shard_path(work_dir, shard_id)
+    if not path.exists():
+        return None
+    try:
+        vectors = np.load(path)
+    except (OSError, ValueError):
+        return None
+    return vectors if vectors.shape[0] == expected_rows else None
+
+
+def _prepare_work_dir(work_dir: Path, manifest: dict, fresh: bool) -> None:
+    manifest_path = work_dir / "manifest.json"
+    if not fresh and manifest_path.exists():
+        with open(manifest_path) as f:
+            if json.load(f) == manifest:
+                return
+        print("System Log: Archive or build settings changed — discarding old shards")
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    (work_dir / "shards").mkdir(parents=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+# ============================================================
+# Build
+# ============================================================
+
+def _iter_batches(data_dir: Path, batch_size: int):
+    batch = []
+    for filename, project in iter_archive_records(data_dir):
+        doc = record_to_document(project, filename)
+        if doc is None:
+            continue
+        batch.append(doc)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_index(out_dir: Path, documents: list, vectors: np.ndarray) -> None:
+    """Same files FAISS.save_local writes, so FAISS.load_local reads them unchanged."""
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+
+    ids = [str(uuid.uuid4()) for _ in documents]
+    docstore = InMemoryDocstore(dict(zip(ids, documents)))
+    index_to_docstore_id = dict(enumerate(ids))
+
+    out_dir.mkdir(parents=True)
+    faiss.write_index(index, str(out_dir / "index.faiss"))
+    with open(out_dir / "index.pkl", "wb") as f:
+        pickle.dump((docstore, index_to_docstore_id), f)
+
+
+def _write_batch_shards(out_dir: Path, documents: list, vectors: np.ndarray) -> list:
+    """One index per batch year (ShardedVectorStore layout); returns the batch keys."""
+    rows: dict = {}
+    for row, doc in enumerate(documents):
+        rows.setdefault(batch_key(doc.metadata.get("batch")), []).append(row)
+    out_dir.mkdir(parents=True)
+    for key, idx in rows.items():
+        _write_index(out_dir / key, [documents[i] for i in idx], vectors[idx])
+    return sorted(rows)
+
+
+def build_index(data_dir: Path = DATA_DIR, out_dir: Path | None = None,
+                workers: int = 2, batch_size: int = 256, backend: str = EMBED_BACKEND,
+                fresh: bool = False, keep_shards: bool = False, sharded: bool = ARCHIVE_SHARDED) -> dict:
+    if out_dir is None:
+        out_dir = FAISS_SHARD_DIR if sharded else FAISS_INDEX_DIR
+    work_dir = out_dir.with_name(out_dir.name + ".build")
+    _prepare_work_dir(work_dir, {
+        "input":      fingerprint_index(data_dir),
+        "batch_size": batch_size,
+        "model":      EMBEDDING_MODEL_NAME,
+        "backend":    backend,
+    }, fresh)
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    documents: list = []
+    shards:    dict = {}
+    resumed = embedded = 0
+    start   = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend, threads)) as pool:
+        pending: set = set()
+
+        def collect(done):
+            nonlocal embedded
+            for future in done:
+                shard_id, vectors = future.result()
+                _write_shard(work_dir, shard_id, vectors)
+                shards[shard_id] = vectors
+                embedded += vectors.shape[0]
+            rate = embedded / max(time.perf_counter() - start, 1e-9)
+            print(f"System Log: {len(shards)} shards done, {embedded} docs embedded "
+                  f"({rate:.1f} docs/sec)")
+
+        for shard_id, batch in enumerate(_iter_batches(data_dir, batch_size)):
+            documents.extend(batch)
+            cached = _load_shard(work_dir, shard_id, len(batch))
+            if cached is not None:
+                shards[shard_id] = cached
+                resumed += 1
+                continue
+
+            pending.add(pool.submit(_embed_batch, shard_id, [d.page_content for d in batch]))
+            if len(pending) >= workers * 2:   # bounded read-ahead: at most two queued batches per worker
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        if pending:
+            collect(wait(pending)[0])
+
+    if not documents:
+        raise RuntimeError("Critical Error: No valid project records found.")
+
+    embed_seconds = time.perf_counter() - start
+    vectors = np.vstack([shards[i] for i in range(len(shards))])
+
+    staging = out_dir.with_name(out_dir.name + ".staging")
+    shutil.rmtree(staging, ignore_errors=True)
+    if sharded:
+        batches = _write_batch_shards(staging, documents, vectors)
+    else:
+        _write_index(staging, documents, vectors)
+    install_index_dir(staging, out_dir)
+    rebuild_stats_cube(documents)
+    if not keep_shards:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "documents":      len(documents),
+        "shards":         len(shards),
+        "resumed_shards": resumed,
+        "batch_shards":   batches if sharded else None,
+        "embedded":       embedded,
+        "seconds":        round(time.perf_counter() - start, 2),
+        "docs_per_sec":   round(embedded / embed_seconds, 1) if embedded else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel, resumable archive index build")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--out-dir", type=Path, default=None,
+                        help="default: ai/faiss_index_shards/ when sharded, else ai/faiss_index_cache/")
+    parser.add_argument("--sharded", action=argparse.BooleanOptionalAction, default=ARCHIVE_SHARDED,
+                        help="one index per batch year (default: ARCHIVE_INDEX_SHARDED)")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--backend", default=EMBED_BACKEND)
+    parser.add_argument("--fresh", action="store_true", help="ignore existing shards")
+    parser.add_argument("--keep-shards", action="store_true")
+    args = parser.parse_args()
+
+    report = build_index(args.data_dir, args.out_dir, args.workers, args.batch_size,
+                         args.backend, args.fresh, args.keep_shards, args.sharded)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,151 @@
+"""
+Embedding model loading and the micro-batching executor in front of it.
+
+Concurrent chat requests, retrieval API calls and semantic-cache lookups
+each need one or two single-sentence embeddings. Run separately, every call
+pays the full per-forward-pass overhead and their torch threads fight over
+the same cores. BatchingEmbeddings queues those calls, waits a few
+milliseconds (or until EMBED_BATCH_MAX texts are queued), runs a single
+batched forward pass and hands each caller its rows back.
+
+EMBED_BACKEND selects the inference runtime: "torch" (fp32, default),
+"int8" (torch dynamic quantization of every Linear layer) or "onnx"
+(ONNX Runtime through sentence-transformers; needs optimum[onnxruntime]).
+The saved index stays fp32 whichever backend embeds the queries — run
+benchmarks.quantized_backends to check recall@k before switching.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from langchain_core.embeddings import Embeddings
+from langchain_huggingface import HuggingFaceEmbeddings
+
+EMBEDDING_MODEL_NAME = "BAAI/bge-base-en-v1.5"
+
+EMBED_BATCH_MAX     = int(os.getenv("EMBED_BATCH_MAX", "32"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "4"))
+EMBED_TORCH_THREADS = int(os.getenv("EMBED_TORCH_THREADS", str(min(4, os.cpu_count() or 1))))
+EMBED_BACKEND       = os.getenv("EMBED_BACKEND", "torch").lower()
+
+EMBED_BACKENDS = ("torch", "int8", "onnx")
+
+
+def configure_torch_threads(n: int = EMBED_TORCH_THREADS) -> None:
+    """Pin intra-op threads; one batched pass at a time needs no inter-op pool."""
+    import torch
+    torch.set_num_threads(n)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass   # already set once parallel work started — intra-op is what matters
+
+
+def _quantize_int8(embeddings: HuggingFaceEmbeddings) -> None:
+    import torch
+    torch.ao.quantization.quantize_dynamic(
+        embeddings._client, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+def load_base_embeddings(backend: str = EMBED_BACKEND) -> HuggingFaceEmbeddings:
+    if backend not in EMBED_BACKENDS:
+        raise ValueError(f"EMBED_BACKEND must be one of {EMBED_BACKENDS}, got {backend!r}")
+
+    configure_torch_threads()
+    embeddings = HuggingFaceEmbeddings(
+        model_name=EMBEDDING_MODEL_NAME,
+        model_kwargs={"backend": "onnx"} if backend == "onnx" else {},
+        encode_kwargs={"normalize_embeddings": True}
+    )
+    if backend == "int8":
+        _quantize_int8(embeddings)
+    print(f"System Log: Embedding model loaded ({backend})")
+    return embeddings
+
+
+class BatchingEmbeddings(Embeddings):
+    """
+    LangChain Embeddings that coalesces concurrent calls into batched
+    forward passes on one worker thread. Large document lists (index
+    builds) bypass the queue and go straight to the base model.
+
+    bge with normalize_embeddings and no query instruction encodes queries
+    and documents identically, so both can share a batch.
+    """
+
+    def __init__(self, base: Embeddings, max_batch: int = EMBED_BATCH_MAX,
+                 max_wait_ms: float = EMBED_BATCH_WAIT_MS):
+        self.base        = base
+        self.max_batch   = max_batch
+        self.max_wait    = max_wait_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "texts": 0, "batches": 0, "max_batch": 0}
+
+        self._worker = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+        self._worker.start()
+
+    # ── LangChain interface ─────────────────────────────────
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._submit([text]).result()[0]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if len(texts) >= self.max_batch:
+            return self.base.embed_documents(texts)
+        return self._submit(list(texts)).result()
+
+    # ── batching ────────────────────────────────────────────
+
+    def _submit(self, texts: list) -> Future:
+        future: Future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            pending = [self._queue.get()]
+            count   = len(pending[0][0])
+            deadline = time.perf_counter() + self.max_wait
+
+            while count < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                count += len(item[0])
+
+            texts = [t for item_texts, _ in pending for t in item_texts]
+            try:
+                vectors = self.base.embed_documents(texts)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_texts, future in pending:
+                future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+            with self._stats_lock:
+                self.stats["requests"]  += len(pending)
+                self.stats["texts"]     += len(texts)
+                self.stats["batches"]   += 1
+                self.stats["max_batch"]  = max(self.stats["max_batch"], len(texts))
+
+    def snapshot(self) -> dict:
+        with self._stats_lock:
+            batches = self.stats["batches"]
+            return {
+                **self.stats,
+                "mean_batch": round(self.stats["texts"] / batches, 2) if batches else 0.0,
+            }
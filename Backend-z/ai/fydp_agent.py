@@ -1,20 +1,42 @@
 import os
 import re
-import json
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 from collections import defaultdict
 from dotenv import load_dotenv
 
+import numpy as np
+
 from langchain_core.documents import Document
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_groq import ChatGroq
 from langchain_core.tools import tool
 from langchain_tavily import TavilySearch
 
+from ai.advisor_resolver import AdvisorResolver
+from ai.agent_trace import stage_timings, submit_trace
+from ai.archive import (
+    DATA_DIR, FAISS_INDEX_DIR, FAISS_SHARD_DIR, args_share_term, extract_technical_patterns, fingerprint_index,
+    install_index_dir, load_archive_documents, normalize_advisor,
+)
+from ai.embeddings import BatchingEmbeddings, load_base_embeddings
+from ai.metadata_filter import filtered_search
+from ai.sharded_store import ShardedVectorStore
+from ai.stats_cube import rebuild_stats_cube, update_stats_cube
+from ai.tokens import clip_to_tokens, count_tokens
+from ai.tool_render import clip_words, render_budgeted, start_level
+from ai.topic_clusters import CLUSTER_INLINE_MAX, TopicClusters, store_vectors
+from ai.vector_sidecar import SidecarClient, SidecarEmbeddings, SidecarVectorStore
+
 
 # ============================================================
 # Component 1: Environment & Path Initialization
@@ -40,112 +62,103 @@ if not _groq_keys:
         "Add GROQ_API_KEY_1, GROQ_API_KEY_2, etc. to your .env file."
     )
 
-SCRIPT_DIR      = Path(__file__).parent
-DATA_DIR        = SCRIPT_DIR / "data"
-FAISS_INDEX_DIR = SCRIPT_DIR / "faiss_index_cache"
+SIDECAR_SOCKET  = os.getenv("VECTOR_SIDECAR_SOCKET")   # optional shared model/index process
+ARCHIVE_SHARDED = os.getenv("ARCHIVE_INDEX_SHARDED", "0") == "1"   # one sub-index per batch year
 
 
 # ============================================================
 # Component 2: Technical Pattern Extraction
 # ============================================================
 
-TECHNICAL_KEYWORDS = [
-    "machine learning", "deep learning", "neural network", "classification",
-    "object detection", "nlp", "natural language processing", "computer vision",
-    "transformer", "fine-tun", "training", "dataset", "model", "pipeline",
-    "iot", "embedded", "raspberry", "arduino", "sensor", "hardware",
-    "distributed", "microservices", "concurrency", "fault tolerance",
-    "recommendation", "clustering", "regression", "reinforcement",
-    "optimization", "algorithm", "graph neural", "simulation",
-    "real-time", "edge computing", "federated", "generative",
-    "api", "crud", "database", "portal", "management system"
-]
-
-COMPLEXITY_NEGATIVE_SIGNALS = [
-    "crud", "management system", "portal", "simple api", "basic website",
-    "information system", "booking system", "inventory system"
-]
-
-def extract_technical_patterns(text: str) -> dict:
-    text_lower = text.lower()
-    positive = [kw for kw in TECHNICAL_KEYWORDS
-                if kw in text_lower and kw not in COMPLEXITY_NEGATIVE_SIGNALS]
-    negative = [kw for kw in COMPLEXITY_NEGATIVE_SIGNALS if kw in text_lower]
-    return {"positive": positive, "negative": negative}
+# TECHNICAL_KEYWORDS, COMPLEXITY_NEGATIVE_SIGNALS and extract_technical_patterns
+# live in ai/archive.py, shared with the offline stats cube.
 
 
 # ============================================================
 # Component 3: Vector Store
 # ============================================================
 
-embedding_model = HuggingFaceEmbeddings(
-    model_name="BAAI/bge-base-en-v1.5",
-    encode_kwargs={"normalize_embeddings": True}
-)
+if SIDECAR_SOCKET:
+    # Model and FAISS index live in the sidecar; this process keeps only the docstore
+    _sidecar        = SidecarClient(SIDECAR_SOCKET)
+    embedding_model = SidecarEmbeddings(_sidecar)
+else:
+    # Every caller in this process shares one micro-batching executor
+    embedding_model = BatchingEmbeddings(load_base_embeddings())
+
+# The sidecar serves the single-index layout; sharding applies to in-process indexes
+USE_SHARDS       = ARCHIVE_SHARDED and not SIDECAR_SOCKET
+ACTIVE_INDEX_DIR = FAISS_SHARD_DIR if USE_SHARDS else FAISS_INDEX_DIR
 
 
 def initialize_persistent_vectorstore() -> FAISS:
-    if FAISS_INDEX_DIR.exists():
+    if SIDECAR_SOCKET:
+        print(f"System Log: Using vector sidecar at {SIDECAR_SOCKET}")
+        return SidecarVectorStore(_sidecar, FAISS_INDEX_DIR)
+
+    if ACTIVE_INDEX_DIR.exists():
         print("System Log: Persistent FAISS index found. Loading...")
+        return load_vectorstore()
+
+    print("System Log: No index found. Building from documents...")
+    return build_vectorstore(ACTIVE_INDEX_DIR)
+
+
+def _update_cube(fn, documents: list) -> None:
+    # Analytics only: a failed cube write must never fail an index load
+    try:
+        fn(documents)
+    except Exception as e:
+        print(f"System Log: Stats cube update failed — {e}")
+
+
+def load_vectorstore():
+    if not USE_SHARDS:
         return FAISS.load_local(
             str(FAISS_INDEX_DIR),
             embedding_model,
             allow_dangerous_deserialization=True
         )
 
-    print("System Log: No index found. Building from documents...")
-    if not DATA_DIR.exists():
-        raise FileNotFoundError(f"Critical Error: Data directory not found at {DATA_DIR}")
+    # Batch years present in the data but not on disk get a shard of their
+    # own; existing shards are loaded as they are. Workers reloading together
+    # race to install a new shard; build_shard keeps exactly one.
+    store   = ShardedVectorStore.load(FAISS_SHARD_DIR, embedding_model)
+    missing = store.missing_batches(load_archive_documents(DATA_DIR))
+    if not missing:
+        return store
 
-    documents: List[Document] = []
-    for filename in sorted(os.listdir(DATA_DIR)):
-        if not filename.endswith(".json"):
-            continue
-        filepath = DATA_DIR / filename
-        try:
-            with open(filepath, encoding="utf-8") as f:
-                projects = json.load(f)
-        except (json.JSONDecodeError, OSError) as e:
-            print(f"System Log: Skipping {filename} — {e}")
-            continue
+    shards = dict(store.shards)
+    for key, docs in missing.items():
+        print(f"System Log: New batch {key} — building its shard ({len(docs)} documents)")
+        shards[key] = ShardedVectorStore.build_shard(FAISS_SHARD_DIR, key, docs, embedding_model)
+        _update_cube(update_stats_cube, docs)
+    store.close()   # superseded by the store below, which reuses its shards
+    return ShardedVectorStore(shards, FAISS_SHARD_DIR)
 
-        if not isinstance(projects, list):
-            continue
 
-        for project in projects:
-            title       = project.get("title", "").strip()
-            description = project.get("description", "").strip()
-            if not title or not description:
-                continue
+def build_vectorstore(index_dir: Path) -> FAISS:
+    if not DATA_DIR.exists():
+        raise FileNotFoundError(f"Critical Error: Data directory not found at {DATA_DIR}")
 
-            semantic_content = (
-                f"Project Title: {title}\n"
-                f"Advisor: {project.get('advisor', 'Unknown')}\n"
-                f"Batch: {project.get('batch', 'N/A')}\n"
-                f"Students: {', '.join(project.get('team_members', []))}\n"
-                f"Description: {description}"
-            )
-            structured_metadata = {
-                "title":        title,
-                "advisor":      project.get("advisor", "Unknown"),
-                "team_members": project.get("team_members", []),
-                "batch":        project.get("batch", "N/A"),
-                "source_file":  filename
-            }
-            documents.append(Document(
-                page_content=semantic_content,
-                metadata=structured_metadata
-            ))
+    documents: List[Document] = load_archive_documents(DATA_DIR)
 
     if not documents:
         raise RuntimeError("Critical Error: No valid project records found.")
+    _update_cube(rebuild_stats_cube, documents)
+
+    if USE_SHARDS:
+        print(f"System Log: Building per-batch FAISS shards from {len(documents)} documents...")
+        vectorstore = ShardedVectorStore.build(index_dir, documents, embedding_model)
+        print(f"System Log: Shards saved: {', '.join(vectorstore.shards)}")
+        return vectorstore
 
     print(f"System Log: Building FAISS index from {len(documents)} documents...")
     vectorstore = FAISS.from_documents(
         documents, embedding_model,
         distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
     )
-    vectorstore.save_local(str(FAISS_INDEX_DIR))
+    vectorstore.save_local(str(index_dir))
     print(f"System Log: Index saved. {len(documents)} documents indexed.")
     return vectorstore
 
@@ -153,6 +166,139 @@ def initialize_persistent_vectorstore() -> FAISS:
 persistent_vectorstore = initialize_persistent_vectorstore()
 
 
+index_version = fingerprint_index(ACTIVE_INDEX_DIR)
+
+def get_index_version() -> str:
+    """Anything derived from archive search results must be keyed on this."""
+    if SIDECAR_SOCKET:
+        return persistent_vectorstore.version   # follows sidecar reloads
+    return index_version
+
+
+# ── Hot reload ──────────────────────────────────────────────
+# The new index is built or loaded on a background thread, then swapped in
+# with one reference assignment: searches already running keep the store
+# they started with and finish on it. Everything derived from results is
+# keyed on index_version (archive facts, semantic answer cache), so bumping
+# it invalidates those on the next request. Each worker process holds its
+# own index: the worker that ran a requested reload publishes the new
+# version to Mongo, and the others poll it every INDEX_SYNC_SECONDS and load
+# the index from disk when it moves. With the sidecar every worker already
+# follows the sidecar's version, so nothing is published.
+
+INDEX_SYNC_SECONDS = int(os.getenv("INDEX_SYNC_SECONDS", "15"))
+INDEX_STATE_ID     = "archive_index"
+
+_reload_lock     = threading.Lock()
+_reload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="index-reload")
+reload_state: dict = {
+    "status":       "idle",
+    "version":      index_version,
+    "documents":    len(persistent_vectorstore.docstore._dict),
+    "rebuild":      None,
+    "requested_at": None,
+    "finished_at":  None,
+    "error":        None,
+}
+
+
+def _index_state_col():
+    from db.db import db
+    return db["index_state"]
+
+
+def _publish_index_version(version: str) -> None:
+    try:
+        _index_state_col().update_one(
+            {"_id": INDEX_STATE_ID},
+            {"$set": {"version": version, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+    except Exception as e:
+        print(f"System Log: Could not publish index version {version} — {e}")
+
+
+def _reload_index(rebuild: bool, publish: bool) -> None:
+    global persistent_vectorstore, index_version
+    try:
+        store = None
+        if rebuild:
+            staging = ACTIVE_INDEX_DIR.with_name(ACTIVE_INDEX_DIR.name + ".staging")
+            shutil.rmtree(staging, ignore_errors=True)
+            store = build_vectorstore(staging)
+            install_index_dir(staging, ACTIVE_INDEX_DIR)
+
+        if SIDECAR_SOCKET:
+            _sidecar.reload()
+            store = SidecarVectorStore(_sidecar, FAISS_INDEX_DIR)
+        elif store is None:
+            store = load_vectorstore()   # sharded: also builds shards for new batch years
+        version = fingerprint_index(ACTIVE_INDEX_DIR)
+
+        with _reload_lock:
+            previous               = persistent_vectorstore
+            persistent_vectorstore = store
+            index_version          = version
+            reload_state.update(
+                status="idle", version=version, documents=len(store.docstore._dict),
+                finished_at=time.time(),
+            )
+        print(f"System Log: Index reloaded — version {version}, "
+              f"{reload_state['documents']} documents")
+        schedule_topic_clusters()
+        if isinstance(previous, ShardedVectorStore) and previous is not store:
+            previous.close()   # searches still running on it finish inline
+        if publish and not SIDECAR_SOCKET:
+            _publish_index_version(version)
+    except Exception as e:
+        with _reload_lock:
+            reload_state.update(status="failed", error=str(e), finished_at=time.time())
+        print(f"System Log: Index reload failed — {e}")
+
+
+def request_index_reload(rebuild: bool = False, publish: bool = True) -> dict:
+    """
+    Start a background reload (rebuild=True re-embeds the archive JSON first).
+    A reload already in progress is not started twice. publish=True announces
+    the resulting version so the other workers load it too.
+    """
+    with _reload_lock:
+        if reload_state["status"] != "running":
+            reload_state.update(
+                status="running", rebuild=rebuild, requested_at=time.time(),
+                finished_at=None, error=None,
+            )
+            _reload_executor.submit(_reload_index, rebuild, publish)
+        return {**reload_state, "other_workers_within_s": None if SIDECAR_SOCKET or INDEX_SYNC_SECONDS <= 0 else INDEX_SYNC_SECONDS}
+
+
+def _follow_published_index() -> None:
+    """Poll the published index version and reload this worker when it moves."""
+    followed = None   # last published version acted on; never chase one twice
+    while True:
+        time.sleep(INDEX_SYNC_SECONDS)
+        try:
+            doc = _index_state_col().find_one({"_id": INDEX_STATE_ID}, {"version": 1})
+        except Exception as e:
+            print(f"System Log: Index version poll failed — {e}")
+            continue
+        published = (doc or {}).get("version")
+        if not published or published in (index_version, followed):
+            continue
+        followed = published
+        print(f"System Log: Index version {published} published by another worker — reloading")
+        request_index_reload(rebuild=False, publish=False)
+
+
+if not SIDECAR_SOCKET and INDEX_SYNC_SECONDS > 0:
+    threading.Thread(target=_follow_published_index, name="index-follow", daemon=True).start()
+
+
+def index_status() -> dict:
+    with _reload_lock:
+        return dict(reload_state)
+
+
 # ============================================================
 # Component 4: Helpers
 # ============================================================
@@ -179,6 +325,14 @@ def batch_sort_key(doc: Document) -> int:
     m = re.search(r"\d{4}", str(batch))
     return int(m.group()) if m else 0
 
+# Shared by search, the intent router and keyphrase extraction
+@lru_cache(maxsize=1024)
+def _query_vector(text: str) -> np.ndarray:
+    vec = np.asarray(embedding_model.embed_query(text), dtype=np.float32)
+    vec.flags.writeable = False
+    return vec
+
+
 def extract_description(content: str) -> str:
     lines = content.split("\n")
     desc_lines = []
@@ -198,45 +352,213 @@ def extract_description(content: str) -> str:
 # Component 5: Tools
 # ============================================================
 
-@tool
-def archive_search(query: str) -> str:
-    """
-    Search the university FYDP archive for past projects.
+# ── Structured retrieval core ───────────────────────────────
+# The tools below only format these results as text for the LLM; the same
+# dicts are served as JSON by routers/retrieval.py. Per-document facts and
+# archive-wide totals are derived once per index version, and query vectors
+# come from the shared _query_vector cache.
+
+ARCHIVE_SCORE_CUTOFF  = 0.45
+ADVISOR_SCORE_CUTOFF  = 0.35
+PORTFOLIO_STOPWORDS   = {
+    "a","an","the","and","or","of","in","to","for","with","on","at","by","from",
+    "this","that","is","are","was","were","be","been","being","have","has","had",
+    "do","does","did","will","would","could","should","may","might","shall",
+    "project","title","advisor","batch","students","description","using","based",
+    "system","which","their","into","also","such","these","those","its","our",
+    "can","been","about","more","than","through","after","during","between",
+    "also","first","second","third","well","then","when","where","while"
+}
+
+_archive_facts: dict = {}   # index_version -> {"docs", "facts", "advisor_totals"}
+_archive_facts_lock = threading.Lock()
+
+
+def _doc_facts(doc: Document) -> dict:
+    members = doc.metadata.get("team_members", [])
+    pat     = extract_technical_patterns(doc.page_content)
+    words: dict = {}
+    for w in doc.page_content.lower().split():
+        w = w.strip(".,()[]:")
+        if len(w) > 4 and w not in PORTFOLIO_STOPWORDS:
+            words[w] = words.get(w, 0) + 1
+    return {
+        "title":         doc.metadata.get("title", "N/A"),
+        "advisor":       doc.metadata.get("advisor", "Unknown"),
+        "batch":         doc.metadata.get("batch", "N/A"),
+        "team_members":  members if isinstance(members, list) else [str(members)],
+        "tech_positive": pat["positive"],
+        "tech_negative": pat["negative"],
+        "description":   extract_description(doc.page_content),
+        "word_freq":     words,
+        "batch_year":    batch_sort_key(doc),
+    }
 
-    Use for ALL internal queries: project lookups, novelty checks,
-    domain saturation analysis, and related-work identification.
 
-    CRITICAL RULES for calling this tool:
-    - query must be 2–5 keywords ONLY. Never a full sentence.
-      CORRECT:   "drowsiness detection eye blink"
-      INCORRECT: "Are there any past projects on drowsiness detection?"
-    - Never call this tool for advisor lookups — use advisor_portfolio instead.
-    - If zero results: report HIGHLY_NOVEL, then call web_search next.
+def archive_facts() -> dict:
+    """Per-document facts and advisor totals for the current index version."""
+    version = get_index_version()
+    facts   = _archive_facts.get(version)
+    if facts is None:
+        with _archive_facts_lock:
+            facts = _archive_facts.get(version)
+            if facts is None:
+                docs = list(persistent_vectorstore.docstore._dict.values())
+                advisor_totals: dict = {}
+                for doc in docs:
+                    a = doc.metadata.get("advisor", "Unknown")
+                    advisor_totals[a] = advisor_totals.get(a, 0) + 1
+                facts = {
+                    "docs":           docs,
+                    "facts":          {id(doc): _doc_facts(doc) for doc in docs},
+                    "advisor_totals": advisor_totals,
+                }
+                _archive_facts.clear()
+                _archive_facts[version] = facts
+    return facts
 
-    Args:
-        query: 2–5 keywords. E.g., "sign language recognition CNN".
+
+_topic_clusters: dict = {}   # index_version -> TopicClusters | None
+_topic_clusters_lock     = threading.Lock()
+_topic_clusters_pending: set = set()
+_topic_clusters_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="topic-clusters")
+
+
+def _load_topic_clusters(version: str, store) -> None:
+    try:
+        clusters = TopicClusters.load(version)
+        docs = len(store.docstore._dict)
+        if clusters is None and not SIDECAR_SOCKET and docs <= CLUSTER_INLINE_MAX:
+            clusters = TopicClusters.build(*store_vectors(store), version)
+            print(f"System Log: Built {len(clusters.clusters)} topic clusters in-process")
+    except Exception as e:
+        clusters = None
+        print(f"System Log: Topic clusters unavailable for {version} — {e}")
+    with _topic_clusters_lock:
+        _topic_clusters_pending.discard(version)
+        if version == get_index_version():
+            _topic_clusters.clear()
+            _topic_clusters[version] = clusters
+
+
+def schedule_topic_clusters() -> None:
+    """Load or build the current version's clusters on a background thread (once)."""
+    version = get_index_version()
+    with _topic_clusters_lock:
+        if version in _topic_clusters or version in _topic_clusters_pending:
+            return
+        _topic_clusters_pending.add(version)
+    _topic_clusters_executor.submit(_load_topic_clusters, version, persistent_vectorstore)
+
+
+def topic_clusters() -> TopicClusters | None:
     """
-    HARD_SCORE_CUTOFF = 0.45
-    seen_titles: set  = set()
-    all_matches: list = []
+    Clusters saved by `python -m ai.topic_clusters` for the current index
+    version; small archives get them computed in-process instead. Both
+    happen off the request path (at startup and after each reload), so
+    until they are ready this returns None and searches go without.
+    """
+    clusters = _topic_clusters.get(get_index_version())
+    if clusters is None:
+        schedule_topic_clusters()   # no-op once loaded or in progress
+    return clusters
 
+
+def topic_summary(query: str) -> list:
+    """Nearest topic cluster(s) of a query with their size, saturation and trend."""
+    clusters = topic_clusters()
+    return clusters.nearest(_query_vector(query)) if clusters else []
+
+
+schedule_topic_clusters()
+
+
+def facts_for(doc: Document) -> dict:
+    return archive_facts()["facts"].get(id(doc)) or _doc_facts(doc)
+
+
+# ── Advisor name resolution ─────────────────────────────────
+# Archive spellings are grouped per index version; names from the live
+# advisors collection are re-read every ADVISOR_DIRECTORY_TTL seconds so
+# newly registered faculty resolve to their own spelling.
+
+ADVISOR_DIRECTORY_TTL = 300
+
+_advisor_resolver: dict = {}   # (index_version, ttl bucket) -> AdvisorResolver
+_advisor_resolver_lock = threading.Lock()
+
+
+def _directory_advisor_names() -> list[str]:
     try:
-        primary = persistent_vectorstore.similarity_search_with_score(query, k=6)
-        for doc, score in primary:
-            if score < HARD_SCORE_CUTOFF:
-                continue
-            title = doc.metadata.get("title", "N/A")
-            if title not in seen_titles:
-                seen_titles.add(title)
-                all_matches.append((doc, score))
+        from db.db import db
+        return [a["name"] for a in db["advisors"].find({}, {"name": 1}) if a.get("name")]
     except Exception as e:
-        return f"ARCHIVE ERROR: {e}"
+        print(f"System Log: Advisor directory unavailable, resolving against archive only ({e})")
+        return []
+
+
+def advisor_resolver() -> AdvisorResolver:
+    key = (get_index_version(), int(time.time() // ADVISOR_DIRECTORY_TTL))
+    resolver = _advisor_resolver.get(key)
+    if resolver is None:
+        with _advisor_resolver_lock:
+            resolver = _advisor_resolver.get(key)
+            if resolver is None:
+                resolver = AdvisorResolver(
+                    archive_facts()["advisor_totals"].keys(), _directory_advisor_names()
+                )
+                _advisor_resolver.clear()
+                _advisor_resolver[key] = resolver
+    return resolver
+
+
+def resolve_advisor(name: str) -> dict | None:
+    """Canonical advisor for a free-form (misspelt, partial, titled) name."""
+    return advisor_resolver().resolve(name)
+
+
+def _match_record(doc: Document, score: float) -> dict:
+    f = facts_for(doc)
+    return {
+        "title":         f["title"],
+        "advisor":       f["advisor"],
+        "batch":         f["batch"],
+        "team_members":  f["team_members"],
+        "score":         round(float(score), 4),
+        "label":         score_to_label(score),
+        "tech_positive": f["tech_positive"],
+        "tech_negative": f["tech_negative"],
+        "description":   f["description"],
+    }
+
+
+def _vector_search(query: str, k: int, store=None, filters: dict | None = None) -> list:
+    store  = store or persistent_vectorstore
+    vector = list(_query_vector(query))
+    if not filters:
+        return store.similarity_search_with_score_by_vector(vector, k=k)
+    return filtered_search(store, vector, k, filters)   # one FAISS search per index
+
+
+def search_archive(query: str, filters: dict | None = None) -> dict:
+    """Novelty/saturation check of a keyword query against the archive, or a filtered slice of it."""
+    store = persistent_vectorstore   # one index for every variant, even across a reload
+    seen_titles: set  = set()
+    all_matches: list = []
+
+    for doc, score in _vector_search(query, 6, store, filters):
+        if score < ARCHIVE_SCORE_CUTOFF:
+            continue
+        title = doc.metadata.get("title", "N/A")
+        if title not in seen_titles:
+            seen_titles.add(title)
+            all_matches.append((doc, score))
 
     if not all_matches:
         for variant in [f"{query} system", f"{query} detection", f"{query} model"]:
             try:
-                for doc, score in persistent_vectorstore.similarity_search_with_score(variant, k=3):
-                    if score < HARD_SCORE_CUTOFF:
+                for doc, score in _vector_search(variant, 3, store, filters):
+                    if score < ARCHIVE_SCORE_CUTOFF:
                         continue
                     title = doc.metadata.get("title", "N/A")
                     if title not in seen_titles:
@@ -246,12 +568,18 @@ def archive_search(query: str) -> str:
                 continue
 
     if not all_matches:
-        return (
-            "ARCHIVE RESULT: HIGHLY_NOVEL\n"
-            "Zero overlapping projects found in the university database.\n"
-            "This topic appears completely unexplored here.\n"
-            "ACTION REQUIRED: call web_search next for global novelty check."
-        )
+        return {
+            "query":            query,
+            "novelty":          "HIGHLY_NOVEL",
+            "saturation_level": "NONE",
+            "saturation":       "NONE — zero overlapping projects in the archive",
+            "total":            0,
+            "strong":           0,
+            "advisors":         {},
+            "batch_spread":     {},
+            "topics":           topic_summary(query),
+            "matches":          [],
+        }
 
     all_matches.sort(key=lambda x: x[1], reverse=True)
 
@@ -267,53 +595,210 @@ def archive_search(query: str) -> str:
     strong  = sum(1 for _, s in all_matches if s >= 0.75)
 
     if total >= 6 or strong >= 3:
+        level       = "HIGH"
         saturation  = "HIGH — domain heavily explored, strong differentiator mandatory"
         novelty     = "LOW_NOVELTY"
     elif total >= 3:
+        level       = "MODERATE"
         saturation  = "MODERATE — related work exists, clear novelty angle needed"
         novelty     = "MODERATE_NOVELTY"
     else:
+        level       = "LOW"
         saturation  = "LOW — relatively unexplored, good opportunity"
         novelty     = "GOOD_NOVELTY"
 
+    return {
+        "query":            query,
+        "novelty":          novelty,
+        "saturation_level": level,
+        "saturation":       saturation,
+        "total":            total,
+        "strong":           strong,
+        "advisors":         advisor_counts,
+        "batch_spread":     dict(sorted(batch_dist.items())),
+        "topics":           topic_summary(query),
+        "matches":          [_match_record(doc, score) for doc, score in all_matches],
+    }
+
+
+def portfolio_for(advisor_name: str) -> dict:
+    """
+    Every archived project of one advisor, newest first, with themes. The
+    name is resolved fuzzily first, so spelling variants and co-supervised
+    projects are all included.
+    """
+    resolved = resolve_advisor(advisor_name)
+    if resolved:
+        resolver = advisor_resolver()
+        matched  = [
+            doc for doc in archive_facts()["docs"]
+            if resolver.matches_field(resolved, doc.metadata.get("advisor", ""))
+        ]
+    else:
+        search_name = normalize_advisor(advisor_name)
+        matched = [
+            doc for doc in archive_facts()["docs"]
+            if search_name and search_name in normalize_advisor(doc.metadata.get("advisor", ""))
+        ]
+    matched.sort(key=batch_sort_key, reverse=True)
+
+    pattern_freq: dict = {}
+    for doc in matched:
+        for p in facts_for(doc)["tech_positive"]:
+            pattern_freq[p] = pattern_freq.get(p, 0) + 1
+    top_patterns = sorted(pattern_freq, key=pattern_freq.get, reverse=True)[:8]
+
+    return {
+        "advisor":  resolved["name"] if resolved else advisor_name,
+        "resolved": resolved,
+        "total":    len(matched),
+        "themes":   top_patterns,
+        "projects": [
+            {k: v for k, v in facts_for(doc).items() if k not in ("word_freq", "batch_year")}
+            for doc in matched
+        ],
+    }
+
+
+def rank_advisors_for(project_idea: str, top_n: int = 3, filters: dict | None = None) -> dict:
+    """Advisors ranked by mean similarity of their projects to an idea."""
+    docs_scores = [
+        (d, s) for d, s in _vector_search(project_idea, 12, filters=filters)
+        if s >= ADVISOR_SCORE_CUTOFF
+    ]
+    advisor_totals = archive_facts()["advisor_totals"]
+
+    advisor_data: dict = defaultdict(lambda: {
+        "scores": [], "evidence": [], "word_freq": {}
+    })
+
+    for doc, score in docs_scores:
+        f   = facts_for(doc)
+        adv = f["advisor"]
+
+        advisor_data[adv]["scores"].append(score)
+        advisor_data[adv]["evidence"].append({
+            "title": f["title"],
+            "batch": f["batch"],
+            "score": round(float(score), 4),
+            "desc":  f["description"][:350]
+        })
+        for w, n in f["word_freq"].items():
+            advisor_data[adv]["word_freq"][w] = advisor_data[adv]["word_freq"].get(w, 0) + n
+
+    ranked = []
+    for adv, data in advisor_data.items():
+        mean_score = sum(data["scores"]) / len(data["scores"])
+        top_themes = sorted(
+            data["word_freq"], key=data["word_freq"].get, reverse=True
+        )[:6]
+        ranked.append({
+            "advisor":     adv,
+            "mean_score":  round(float(mean_score), 4),
+            "match_count": len(data["scores"]),
+            "total":       advisor_totals.get(adv, 1),
+            "evidence":    data["evidence"],
+            "themes":      top_themes
+        })
+
+    ranked.sort(key=lambda x: (x["mean_score"], x["match_count"]), reverse=True)
+    return {"project_idea": project_idea, "advisors": ranked[:top_n]}
+
+
+# ── LLM tools ───────────────────────────────────────────────
+# Outputs go through render_budgeted: strong results in full, weak ones
+# compact, the lowest-ranked shortened or dropped first to fit the budget.
+
+TOOL_OUTPUT_TOKENS = int(os.getenv("TOOL_OUTPUT_TOKENS", "1500"))
+COMPACT_DESC_TOKENS = 60
+
+@tool
+def archive_search(query: str) -> str:
+    """
+    Search the university FYDP archive for past projects.
+
+    Use for ALL internal queries: project lookups, novelty checks,
+    domain saturation analysis, and related-work identification.
+
+    CRITICAL RULES for calling this tool:
+    - query must be 2–5 keywords ONLY. Never a full sentence.
+      CORRECT:   "drowsiness detection eye blink"
+      INCORRECT: "Are there any past projects on drowsiness detection?"
+    - Never call this tool for advisor lookups — use advisor_portfolio instead.
+    - If zero results: report HIGHLY_NOVEL, then call web_search next.
+
+    Args:
+        query: 2–5 keywords. E.g., "sign language recognition CNN".
+    """
+    try:
+        result = search_archive(query)
+    except Exception as e:
+        return f"ARCHIVE ERROR: {e}"
+
+    if not result["matches"]:
+        return (
+            "ARCHIVE RESULT: HIGHLY_NOVEL\n"
+            "Zero overlapping projects found in the university database.\n"
+            "This topic appears completely unexplored here.\n"
+            "ACTION REQUIRED: call web_search next for global novelty check."
+        )
+
     lines = [
         "UNIVERSITY ARCHIVE SEARCH RESULTS",
         f'Query: "{query}"',
-        f"NOVELTY_STATUS    : {novelty}",
-        f"TOTAL_MATCHES     : {total}",
-        f"STRONG_MATCHES    : {strong}  (score >= 0.75)",
-        f"SATURATION        : {saturation}",
-        f"ACTIVE_ADVISORS   : {', '.join(advisor_counts.keys())}",
-        f"BATCH_SPREAD      : {dict(sorted(batch_dist.items()))}",
+        f"NOVELTY_STATUS    : {result['novelty']}",
+        f"TOTAL_MATCHES     : {result['total']}",
+        f"STRONG_MATCHES    : {result['strong']}  (score >= 0.75)",
+        f"SATURATION        : {result['saturation']}",
+        f"ACTIVE_ADVISORS   : {', '.join(result['advisors'].keys())}",
+        f"BATCH_SPREAD      : {result['batch_spread']}",
+    ]
+
+    # Archive-wide context for the topic, from the nearest k-means cluster(s)
+    for t in result["topics"]:
+        top_advisors = ", ".join(f"{a} ({n})" for a, n in list(t["advisors"].items())[:3])
+        lines += [
+            f"TOPIC_CLUSTER     : {t['size']} archived projects ({score_to_pct(t['share'])} of archive) | "
+            f"saturation {t['saturation_level']} | trend {t['trend']} | {score_to_pct(t['similarity'])} fit",
+            f"                    batches {t['batch_spread']} | advisors {top_advisors}",
+        ]
+
+    lines += [
         "",
         "MATCHED PROJECTS (read every description carefully)",
         ""
     ]
 
-    for i, (doc, score) in enumerate(all_matches, start=1):
-        label    = score_to_label(score)
-        stars    = score_to_stars(score)
-        pct      = score_to_pct(score)
-        members  = doc.metadata.get("team_members", [])
-        team_str = ", ".join(members) if isinstance(members, list) else str(members)
-        pat      = extract_technical_patterns(doc.page_content)
-        pos_str  = ", ".join(pat["positive"])  if pat["positive"]  else "none"
-        neg_str  = ", ".join(pat["negative"])  if pat["negative"]  else "none"
-        desc     = extract_description(doc.page_content)
-
-        lines += [
-            f"MATCH #{i} | {stars} {pct} similarity | {label}",
-            f"  Title   : {doc.metadata.get('title', 'N/A')}",
-            f"  Advisor : {doc.metadata.get('advisor', 'N/A')}",
-            f"  Batch   : {doc.metadata.get('batch', 'N/A')}",
-            f"  Team    : {team_str}",
-            f"  Tech+   : {pos_str}",
-            f"  Tech-   : {neg_str}",
-            f"  Description: {desc}",
-            ""
+    entries = []
+    for i, m in enumerate(result["matches"], start=1):
+        score   = m["score"]
+        heading = f"MATCH #{i} | {score_to_stars(score)} {score_to_pct(score)} similarity | {m['label']}"
+        tech    = ", ".join(m["tech_positive"])
+
+        full = [
+            heading,
+            f"  Title   : {m['title']}",
+            f"  Advisor : {m['advisor']}",
+            f"  Batch   : {m['batch']}",
+            f"  Team    : {', '.join(m['team_members'])}",
         ]
+        if m["tech_positive"]:
+            full.append(f"  Tech+   : {tech}")
+        if m["tech_negative"]:
+            full.append(f"  Tech-   : {', '.join(m['tech_negative'])}")
+        full.append(f"  Description: {m['description']}\n")
+
+        compact = (
+            f"{heading}\n"
+            f"  {m['title']} | {m['advisor']} | Batch {m['batch']}" + (f" | Tech+: {tech}" if tech else "") + "\n"
+            f"  {clip_words(m['description'], COMPACT_DESC_TOKENS)}\n"
+        )
+        one_line = f"MATCH #{i} | {score_to_pct(score)} | {m['title']} | {m['advisor']} | Batch {m['batch']}"
+        entries.append(["\n".join(full), compact, one_line])
 
-    return "\n".join(lines)
+    return render_budgeted(
+        lines, entries, [start_level(m["score"]) for m in result["matches"]], TOOL_OUTPUT_TOKENS
+    )
 
 
 @tool
@@ -329,77 +814,63 @@ def advisor_portfolio(advisor_name: str) -> str:
     Args:
         advisor_name: Name with title. E.g., "Dr. Majida Kazmi".
     """
-    all_docs = list(persistent_vectorstore.docstore._dict.values())
+    result = portfolio_for(advisor_name)
 
-    search_name = (
-        advisor_name
-        .replace("Dr.", "").replace("Mr.", "").replace("Ms.", "").replace("Prof.", "")
-        .strip().lower()
-    )
-
-    matched = [
-        doc for doc in all_docs
-        if search_name in doc.metadata.get("advisor", "").lower()
-    ]
-
-    if not matched:
+    if not result["projects"]:
         return (
             f"PORTFOLIO RESULT: No records found for '{advisor_name}'.\n"
             "Check spelling or try a shorter name fragment."
         )
 
-    matched.sort(key=batch_sort_key, reverse=True)
-    total = len(matched)
-
-    all_patterns: list = []
-    for doc in matched:
-        pat = extract_technical_patterns(doc.page_content)
-        all_patterns.extend(pat["positive"])
-
-    pattern_freq: dict = {}
-    for p in all_patterns:
-        pattern_freq[p] = pattern_freq.get(p, 0) + 1
-    top_patterns = sorted(pattern_freq, key=pattern_freq.get, reverse=True)[:8]
+    total        = result["total"]
+    top_patterns = result["themes"]
 
     SHOW_CAP     = 6
     DESC_CAP     = 450
-    show_docs    = matched[:SHOW_CAP]
-    hidden_count = total - SHOW_CAP
 
-    lines = [
-        f"ADVISOR PORTFOLIO: {advisor_name}",
+    lines = [f"ADVISOR PORTFOLIO: {result['advisor']}"]
+    resolved = result["resolved"]
+    if resolved and normalize_advisor(advisor_name) != normalize_advisor(resolved["name"]):
+        lines.append(
+            f"Resolved '{advisor_name}' to {resolved['name']} "
+            f"({score_to_pct(resolved['confidence'])} name match"
+            + (f"; also close: {', '.join(resolved['alternatives'])}" if resolved["ambiguous"] else "")
+            + ")"
+        )
+    lines += [
         f"Total projects in archive: {total}",
         f"RECURRING RESEARCH THEMES (across all {total} projects):",
         f"  {', '.join(top_patterns) if top_patterns else 'none identified'}",
         "",
-        f"MOST RECENT {min(SHOW_CAP, total)} PROJECTS (detailed)",
+        f"MOST RECENT {min(SHOW_CAP, total)} PROJECTS (detailed)"
+        + (", older ones by title" if total > SHOW_CAP else ""),
         ""
     ]
 
-    for doc in show_docs:
-        title    = doc.metadata.get("title", "N/A")
-        batch    = doc.metadata.get("batch", "N/A")
-        members  = doc.metadata.get("team_members", [])
-        team_str = ", ".join(members) if isinstance(members, list) else str(members)
-        desc     = extract_description(doc.page_content)[:DESC_CAP]
-        pat      = extract_technical_patterns(doc.page_content)
-        pos_str  = ", ".join(pat["positive"]) if pat["positive"] else "none"
-
-        lines += [
-            f"[{batch}] {title}",
-            f"  Team    : {team_str}",
-            f"  Tech+   : {pos_str}",
-            f"  Summary : {desc}",
-            ""
-        ]
-
-    if hidden_count > 0:
-        lines.append(
-            f"Note: {hidden_count} older project(s) exist in archive but are not "
-            f"shown here. The recurring themes above reflect ALL {total} projects."
+    entries = []
+    for p in result["projects"]:
+        tech = ", ".join(p["tech_positive"])
+        full = (
+            f"[{p['batch']}] {p['title']}\n"
+            f"  Team    : {', '.join(p['team_members'])}\n"
+            + (f"  Tech+   : {tech}\n" if tech else "")
+            + f"  Summary : {p['description'][:DESC_CAP]}\n"
+        )
+        compact = (
+            f"[{p['batch']}] {p['title']}\n"
+            f"  {(tech + ' | ') if tech else ''}{clip_words(p['description'], COMPACT_DESC_TOKENS)}\n"
         )
+        entries.append([full, compact, f"[{p['batch']}] {p['title']}"])
 
-    return "\n".join(lines)
+    footer = [
+        "",
+        f"The recurring themes above reflect ALL {total} projects."
+    ] if total > SHOW_CAP else []
+    return render_budgeted(
+        lines, entries, [0 if i < SHOW_CAP else 2 for i in range(total)], TOOL_OUTPUT_TOKENS, footer,
+        baseline_entries=SHOW_CAP,
+        baseline_note=[f"Note: {total - SHOW_CAP} older project(s) exist in archive but are not shown here."],
+    )
 
 
 @tool
@@ -416,78 +887,18 @@ def rank_advisors(project_idea: str) -> str:
     Args:
         project_idea: Max 15 words. E.g., "federated learning edge IoT privacy".
     """
-    SIMILARITY_CUTOFF = 0.35
-
     try:
-        docs_scores = persistent_vectorstore.similarity_search_with_score(project_idea, k=12)
+        result = rank_advisors_for(project_idea)
     except Exception as e:
         return f"ADVISOR SEARCH ERROR: {e}"
 
-    docs_scores = [(d, s) for d, s in docs_scores if s >= SIMILARITY_CUTOFF]
-
-    if not docs_scores:
+    if not result["advisors"]:
         return (
             "ADVISOR SEARCH: No relevant projects found above threshold.\n"
             "Cannot make a data-grounded recommendation.\n"
             "Try broadening the project description."
         )
 
-    all_docs = list(persistent_vectorstore.docstore._dict.values())
-    advisor_totals: dict = {}
-    for doc in all_docs:
-        a = doc.metadata.get("advisor", "Unknown")
-        advisor_totals[a] = advisor_totals.get(a, 0) + 1
-
-    STOPWORDS = {
-        "a","an","the","and","or","of","in","to","for","with","on","at","by","from",
-        "this","that","is","are","was","were","be","been","being","have","has","had",
-        "do","does","did","will","would","could","should","may","might","shall",
-        "project","title","advisor","batch","students","description","using","based",
-        "system","which","their","into","also","such","these","those","its","our",
-        "can","been","about","more","than","through","after","during","between",
-        "also","first","second","third","well","then","when","where","while"
-    }
-
-    advisor_data: dict = defaultdict(lambda: {
-        "scores": [], "evidence": [], "word_freq": {}
-    })
-
-    for doc, score in docs_scores:
-        adv   = doc.metadata.get("advisor", "Unknown")
-        title = doc.metadata.get("title", "N/A")
-        batch = doc.metadata.get("batch", "N/A")
-        desc  = extract_description(doc.page_content)[:350]
-
-        advisor_data[adv]["scores"].append(score)
-        advisor_data[adv]["evidence"].append({
-            "title": title,
-            "batch": batch,
-            "score": score,   # keep raw for formatting in system prompt
-            "desc":  desc
-        })
-        for w in doc.page_content.lower().split():
-            w = w.strip(".,()[]:")
-            if len(w) > 4 and w not in STOPWORDS:
-                advisor_data[adv]["word_freq"][w] = \
-                    advisor_data[adv]["word_freq"].get(w, 0) + 1
-
-    ranked = []
-    for adv, data in advisor_data.items():
-        mean_score = sum(data["scores"]) / len(data["scores"])
-        top_themes = sorted(
-            data["word_freq"], key=data["word_freq"].get, reverse=True
-        )[:6]
-        ranked.append((adv, {
-            "mean_score":  mean_score,   # raw float — LLM will format via prompt
-            "match_count": len(data["scores"]),
-            "total":       advisor_totals.get(adv, 1),
-            "evidence":    data["evidence"],
-            "themes":      top_themes
-        }))
-
-    ranked.sort(key=lambda x: (x[1]["mean_score"], x[1]["match_count"]), reverse=True)
-    ranked = ranked[:3]
-
     lines = [
         "ADVISOR RECOMMENDATIONS",
         f'For project idea: "{project_idea}"',
@@ -496,33 +907,44 @@ def rank_advisors(project_idea: str) -> str:
     ]
 
     medals = ["#1 BEST MATCH", "#2 STRONG FIT", "#3 GOOD FIT"]
-    for rank, (adv, data) in enumerate(ranked):
+    entries = []
+    for rank, data in enumerate(result["advisors"]):
         mean_pct   = score_to_pct(data["mean_score"])
         mean_stars = score_to_stars(data["mean_score"])
-        lines += [
-            f"RANK {medals[rank]}: {adv}",
+        heading = [
+            f"RANK {medals[rank]}: {data['advisor']}",
             f"  Overall Match      : {mean_stars} {mean_pct}",
             f"  Matched Projects   : {data['match_count']} of {data['total']} supervised",
             f"  Domain Keywords    : {', '.join(data['themes'])}",
             f"  Supporting Evidence:"
         ]
+        full, compact = list(heading), list(heading)
         for ev in data["evidence"]:
             ev_pct   = score_to_pct(ev["score"])
             ev_stars = score_to_stars(ev["score"])
             ev_label = score_to_label(ev["score"])
-            lines += [
+            full += [
                 f"    [{ev['batch']}] {ev['title']}",
                 f"    Similarity: {ev_stars} {ev_pct} | {ev_label}",
                 f"    → {ev['desc']}",
                 ""
             ]
-        lines.append("")
+            compact.append(f"    [{ev['batch']}] {ev['title']} | {ev_pct}")
+        compact.append("")
+        one_line = (
+            f"RANK {medals[rank]}: {data['advisor']} | {mean_pct} | "
+            f"{data['match_count']} of {data['total']} supervised\n"
+        )
+        entries.append(["\n".join(full) + "\n", "\n".join(compact), one_line])
 
-    lines.append(
+    footer = [
         "DISCLAIMER: Rankings are based on archived project data only. "
         "Confirm advisor availability directly before approaching."
+    ]
+    return render_budgeted(
+        lines, entries, [start_level(a["mean_score"]) for a in result["advisors"]],
+        TOOL_OUTPUT_TOKENS, footer
     )
-    return "\n".join(lines)
 
 
 _tavily_search = TavilySearch(max_results=4)
@@ -550,7 +972,7 @@ def web_search(query: str) -> str:
         if not isinstance(results, list) or not results:
             return "GLOBAL SEARCH: No results returned."
 
-        formatted = []
+        entries = []
         for r in results:
             url = (
                 r.get("url") or
@@ -562,19 +984,19 @@ def web_search(query: str) -> str:
                 continue
 
             content = (r.get("content") or r.get("snippet") or "").strip()[:600]
-            formatted.append(
-                f"TITLE  : {r.get('title', 'N/A')}\n"
-                f"URL    : {url}\n"
-                f"CONTENT: {content}\n"
-                f"CITE AS: [Source: {url}]"
-            )
-
-        if not formatted:
+            title   = r.get("title", "N/A")
+            entries.append([
+                f"TITLE  : {title}\nURL    : {url}\nCONTENT: {content}\nCITE AS: [Source: {url}]\n\n---\n",
+                f"TITLE  : {title}\nCONTENT: {clip_words(content, COMPACT_DESC_TOKENS)}\n"
+                f"CITE AS: [Source: {url}]\n\n---\n",
+                f"{title} — [Source: {url}]",
+            ])
+
+        if not entries:
             return "GLOBAL SEARCH: Results returned but none had a valid URL. Try a different query."
 
-        return (
-            "GLOBAL WEB SEARCH RESULTS\n\n"
-            + "\n\n---\n\n".join(formatted)
+        return render_budgeted(
+            ["GLOBAL WEB SEARCH RESULTS", ""], entries, [0] * len(entries), TOOL_OUTPUT_TOKENS
         )
 
     except Exception as e:
@@ -815,7 +1237,6 @@ No sentence found → write: "Description insufficient to confirm gap — verify
 # ============================================================
 
 MAX_TOOL_ROUNDS       = 6
-MAX_TOOL_OUTPUT_CHARS = 8000
 
 _RATE_LIMIT_SIGNALS = (
     "rate_limit_exceeded", "rate limit", "429",
@@ -862,28 +1283,499 @@ def preprocess_query(raw: str) -> tuple[str, bool]:
 
 
 # ============================================================
-# Component 9: Agent Loop
+# Component 9: Local Intent Router
 # ============================================================
 
+# Round 0 exists only to pick a tool. When the intent is unambiguous, pick it
+# here from embeddings of example queries and call the tool directly, so the
+# first Groq call is already the answer round.
+
+INTENT_EXAMPLES = {
+    "advisor_portfolio": [
+        "tell me about Dr. Ali Ismail's projects",
+        "what projects has Dr. Majida Kazmi supervised",
+        "show me the portfolio of Dr. Syed Zaffar Qasim",
+        "list all projects under Ms. Fauzia",
+        "what kind of work does Prof. Ahmed supervise",
+    ],
+    "rank_advisors": [
+        "which advisor should I approach for my drowsiness detection project",
+        "who is the best supervisor for a federated learning idea",
+        "recommend an advisor for IoT air quality monitoring",
+        "which faculty member fits a sign language recognition project",
+        "suggest supervisors for my blockchain voting system",
+    ],
+    "archive_search": [
+        "has anyone done a project on sign language recognition",
+        "is a drowsiness detection project novel",
+        "show me past projects on crop disease detection",
+        "are there similar projects to a smart parking system",
+        "previous FYDPs about urdu handwriting recognition",
+    ],
+    "web_search": [
+        "what is the state of the art in text to speech",
+        "latest research on federated learning",
+        "search the web for commercial drowsiness detection products",
+        "recent papers on vision transformers for medical imaging",
+        "what existing apps do real-time translation",
+    ],
+    # Matching these means "no tool": leave the turn to the LLM
+    "chat": [
+        "hi",
+        "thanks, that was helpful",
+        "what can you do",
+        "explain what the MCT criteria mean",
+        "how should I structure my proposal document",
+    ],
+}
+
+# Pick these from `python -m benchmarks.intent_routing` (labelled queries in
+# benchmarks/intent_queries.json) and re-run it whenever INTENT_EXAMPLES or
+# the embedding model change.
+INTENT_MIN_SIM = 0.80   # best example must be at least this close...
+INTENT_MARGIN  = 0.03   # ...and beat the runner-up intent by this much
+
+_ADVISOR_NAME_RE = re.compile(
+    r"\b(?:Dr|Mr|Ms|Mrs|Miss|Prof|Sir|Engr)\.?\s+[A-Z][A-Za-z\-]+(?:\s+[A-Z][A-Za-z\-]+){0,3}"
+)
+
+QUERY_STOPWORDS = {
+    "a","an","the","and","or","of","in","to","for","with","on","at","by","from",
+    "this","that","is","are","was","were","be","been","it","its","my","our","we",
+    "i","me","you","your","can","could","would","should","will","do","does","did",
+    "has","have","had","any","there","anyone","someone","what","which","who","how",
+    "about","please","tell","show","give","find","search","want","build","make",
+    "like","project","projects","idea","past","previous","similar","done","novel",
+    "advisor","advisors","supervisor","approach","recommend","suggest","best","fydp",
+    "fydps","run","full","analysis","analyse","analyze","feasibility","complexity",
+    "check","web","internet","latest","recent","research","state","art","system",
+    "using","based","via","into","through","some","also","then","than","more",
+}
+
+
+# ── Keyphrase extraction ────────────────────────────────────
+# Candidate n-grams (runs of non-stopwords) are ranked by embedding
+# similarity to the whole query, with an MMR penalty so the picks cover
+# different aspects. Candidate embeddings are cached across requests since
+# the same domain phrases ("object detection", "iot") recur constantly.
+
+KEYPHRASE_MAX_NGRAM   = 3
+KEYPHRASE_MMR_LAMBDA  = 0.7     # 1.0 = pure relevance, lower = more diverse
+KEYPHRASE_CACHE_SIZE  = 4096
+
+_phrase_cache: OrderedDict = OrderedDict()
+_phrase_cache_lock = threading.Lock()
+
+
+def _phrase_vectors(phrases: list) -> np.ndarray:
+    with _phrase_cache_lock:
+        found = {p: _phrase_cache[p] for p in phrases if p in _phrase_cache}
+        for p in found:
+            _phrase_cache.move_to_end(p)
+
+    missing = [p for p in phrases if p not in found]
+    if missing:
+        for p, v in zip(missing, embedding_model.embed_documents(missing)):
+            found[p] = np.asarray(v, dtype=np.float32)
+        with _phrase_cache_lock:
+            for p in missing:
+                _phrase_cache[p] = found[p]
+            while len(_phrase_cache) > KEYPHRASE_CACHE_SIZE:
+                _phrase_cache.popitem(last=False)
+
+    return np.stack([found[p] for p in phrases])
+
+
+def _candidate_phrases(text: str) -> tuple[list, dict]:
+    """N-grams over runs of content words, plus each word's first position."""
+    runs, run, position = [], [], {}
+    for idx, w in enumerate(re.findall(r"[A-Za-z0-9][A-Za-z0-9+#\-]*", text)):
+        lw = w.lower()
+        if len(lw) < 3 or lw in QUERY_STOPWORDS:
+            if run:
+                runs.append(run)
+            run = []
+            continue
+        position.setdefault(lw, idx)
+        run.append(lw)
+    if run:
+        runs.append(run)
+
+    candidates = []
+    for run in runs:
+        for n in range(1, KEYPHRASE_MAX_NGRAM + 1):
+            for start in range(len(run) - n + 1):
+                phrase = " ".join(run[start:start + n])
+                if phrase not in candidates:
+                    candidates.append(phrase)
+    return candidates, position
+
+
+def extract_query_keywords(text: str, max_words: int = 5) -> str:
+    """
+    Compress a student sentence into at most max_words keywords for
+    archive_search / rank_advisors / web_search, without an LLM round.
+    """
+    candidates, position = _candidate_phrases(text)
+    if len(position) <= max_words:
+        return " ".join(sorted(position, key=position.get))
+
+    vectors   = _phrase_vectors(candidates)
+    relevance = vectors @ _query_vector(text)
+
+    chosen_words: set = set()
+    chosen_idx:  list = []    # emitted phrases; the only ones that count as redundancy
+    skipped_idx: set  = set() # too long to fit, never emitted
+    while len(chosen_words) < max_words:
+        best, best_score = None, -np.inf
+        for i, phrase in enumerate(candidates):
+            if i in chosen_idx or i in skipped_idx or set(phrase.split()) <= chosen_words:
+                continue
+            redundancy = max((float(vectors[i] @ vectors[j]) for j in chosen_idx), default=0.0)
+            score = KEYPHRASE_MMR_LAMBDA * relevance[i] - (1 - KEYPHRASE_MMR_LAMBDA) * redundancy
+            if score > best_score:
+                best, best_score = i, score
+        if best is None:
+            break
+        new_words = [w for w in candidates[best].split() if w not in chosen_words]
+        if len(chosen_words) + len(new_words) > max_words:
+            skipped_idx.add(best)   # too long to fit — skip it, keep looking
+            continue
+        chosen_idx.append(best)
+        chosen_words.update(new_words)
+
+    return " ".join(sorted(chosen_words, key=position.get))
+
+
+_intent_matrix = None   # (n_examples, dim) unit vectors, built on first use
+_intent_labels: list = []
+
+def _intent_vectors():
+    global _intent_matrix, _intent_labels
+    if _intent_matrix is None:
+        labels, texts = [], []
+        for intent, examples in INTENT_EXAMPLES.items():
+            labels += [intent] * len(examples)
+            texts  += examples
+        _intent_matrix = np.asarray(embedding_model.embed_documents(texts), dtype=np.float32)
+        _intent_labels = labels
+    return _intent_matrix, _intent_labels
+
+
+def classify_intent(text: str) -> tuple[str, float, float]:
+    """Return (intent, best similarity, margin over the runner-up intent)."""
+    matrix, labels = _intent_vectors()
+    sims = matrix @ _query_vector(text)
+
+    best_per_intent: dict = {}
+    for label, sim in zip(labels, sims):
+        best_per_intent[label] = max(best_per_intent.get(label, -1.0), float(sim))
+    ranked = sorted(best_per_intent.items(), key=lambda kv: kv[1], reverse=True)
+    margin = ranked[0][1] - ranked[1][1] if len(ranked) > 1 else ranked[0][1]
+    return ranked[0][0], ranked[0][1], margin
+
+
+def route_intent(raw: str) -> tuple[str, dict] | None:
+    """
+    Decide the round-0 tool call locally. Returns (tool_name, args) on a
+    confident match, or None to let the LLM choose.
+    """
+    raw = raw.split("\n\n[SYSTEM NOTE", 1)[0].strip()
+    if not raw:
+        return None
+
+    _, needs_analysis = preprocess_query(raw)
+    if needs_analysis:
+        keywords = extract_query_keywords(raw)
+        return ("archive_search", {"query": keywords}) if keywords else None
+
+    intent, sim, margin = classify_intent(raw)
+    if sim < INTENT_MIN_SIM or margin < INTENT_MARGIN or intent == "chat":
+        return None
+
+    if intent == "advisor_portfolio":
+        m = _ADVISOR_NAME_RE.search(raw)
+        return ("advisor_portfolio", {"advisor_name": m.group().strip()}) if m else None
+
+    if _ADVISOR_NAME_RE.search(raw):
+        # A named advisor in a non-portfolio query is ambiguous — defer to the LLM
+        return None
+
+    keywords = extract_query_keywords(raw, max_words=15 if intent == "rank_advisors" else 5)
+    if not keywords:
+        return None
+    arg = {"rank_advisors": "project_idea"}.get(intent, "query")
+    return intent, {arg: keywords}
+
+
+# ── Speculative retrieval ───────────────────────────────────
+# A feasibility request always ends up calling archive_search and then
+# web_search. Start both from local keywords as soon as the request arrives
+# so they run while Groq is thinking; a later tool call is served from the
+# speculation when its query overlaps the speculative one enough.
+
+SPECULATION_MIN_OVERLAP = 0.6   # |A ∩ B| / min(|A|, |B|) over query words
+
+_speculation_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculate")
+
+
+def _query_overlap(a: str, b: str) -> float:
+    wa, wb = set(a.lower().split()), set(b.lower().split())
+    if not wa or not wb:
+        return 0.0
+    return len(wa & wb) / min(len(wa), len(wb))
+
+
+class Speculation:
+    """In-flight speculative tool calls for one run_agent invocation."""
+
+    def __init__(self):
+        self._pending: dict = {}   # tool name -> (query, Future)
+        self.hits   = 0
+        self.misses = 0
+
+    def start(self, tool_name: str, query: str) -> None:
+        if query and tool_name in TOOL_MAP:
+            future = _speculation_pool.submit(TOOL_MAP[tool_name].invoke, {"query": query})
+            self._pending[tool_name] = (query, future)
+
+    def take(self, tool_name: str, tool_args: dict):
+        """Return the speculative Future if it answers this call, else None."""
+        entry = self._pending.get(tool_name)
+        if entry is None:
+            return None
+        spec_query, future = entry
+        if _query_overlap(spec_query, str(tool_args.get("query", ""))) < SPECULATION_MIN_OVERLAP:
+            self.misses += 1
+            return None
+        del self._pending[tool_name]
+        self.hits += 1
+        return future
+
+    def cancel(self) -> None:
+        for _, future in self._pending.values():
+            future.cancel()   # no-op if already running; the result is simply dropped
+        self._pending.clear()
+
+
+def start_speculation(raw: str) -> Speculation | None:
+    raw = raw.split("\n\n[SYSTEM NOTE", 1)[0].strip()
+    _, needs_analysis = preprocess_query(raw)
+    if not needs_analysis:
+        return None
+    speculation = Speculation()
+    speculation.start("web_search",     extract_query_keywords(raw, max_words=6))
+    speculation.start("archive_search", extract_query_keywords(raw))
+    return speculation
+
+
 # ============================================================
-# Component 9: Agent Loop (with forensic debug)
+# Component 10: Agent Loop
 # ============================================================
 
-def run_agent(user_messages: list) -> str:
+# ============================================================
+# Component 10: Agent Loop (with forensic debug)
+# ============================================================
+
+def _execute_tool_call(tool_name: str, tool_args: dict,
+                       speculation: Speculation | None = None) -> tuple[str, dict]:
+    """Run one tool call, returning the (budgeted) output and its trace record."""
+    tool_fn    = TOOL_MAP.get(tool_name)
+    call_record = {
+        "tool":      tool_name,
+        "args":      tool_args,
+        "error":     None,
+        "output_len": 0,
+        "truncated": False,
+    }
+    speculative = speculation.take(tool_name, tool_args) if speculation else None
+    start       = time.perf_counter()
+
+    if tool_fn is None:
+        result_str          = f"ERROR: Unknown tool '{tool_name}'."
+        call_record["error"] = "unknown_tool"
+    else:
+        try:
+            if speculative is not None:
+                raw_result                = speculative.result()
+                call_record["speculative"] = True
+            else:
+                raw_result           = tool_fn.invoke(tool_args)
+            result_str           = str(raw_result)
+            call_record["output_len"] = len(result_str)
+            render = getattr(raw_result, "render", None)
+            if render:   # token-budgeted tool output
+                call_record.update(render)
+                call_record["truncated"] = render["clipped"]
+
+            # Check for HIGHLY_NOVEL (zero archive hits)
+            if "HIGHLY_NOVEL" in result_str:
+                call_record["archive_result"] = "HIGHLY_NOVEL"
+            elif "NOVELTY_STATUS" in result_str:
+                # Extract the status line for the trace
+                for line in result_str.splitlines():
+                    if "NOVELTY_STATUS" in line:
+                        call_record["archive_result"] = line.strip()
+                        break
+
+        except Exception as e:
+            result_str           = f"TOOL ERROR [{tool_name}]: {type(e).__name__}: {e}"
+            call_record["error"] = f"{type(e).__name__}: {e}"
+
+    if "tokens" not in call_record:   # error text or an unbudgeted tool
+        call_record["tokens"] = count_tokens(result_str)
+        if call_record["tokens"] > TOOL_OUTPUT_TOKENS:
+            result_str               = clip_to_tokens(result_str, TOOL_OUTPUT_TOKENS, "\n...[output truncated at budget]")
+            call_record["tokens"]    = count_tokens(result_str)
+            call_record["truncated"] = True
+
+    call_record["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result_str, call_record
+
+
+def _token_usage(response) -> dict:
+    """Prompt / completion tokens Groq reported for one LLM round."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    return {
+        "prompt_tokens":     usage.get("input_tokens"),
+        "completion_tokens": usage.get("output_tokens"),
+    }
+
+
+def _invoke_llm(engine, messages: list):
+    start    = time.perf_counter()
+    response = engine.invoke(messages)
+    return response, {
+        "llm_ms": round((time.perf_counter() - start) * 1000, 2),
+        **_token_usage(response),
+    }
+
+
+def _replay_covers(user_messages: list, last_human) -> bool:
+    """
+    True when replayed tool results in the history were called with
+    arguments that share a term with the new message. Only then may round 0
+    skip the forced retrieval call; anything else keeps the router and the
+    forced engine (answering from unrelated results is how hallucinations
+    get in).
+    """
+    if last_human is None or not any(isinstance(m, ToolMessage) for m in user_messages):
+        return False
+    return any(
+        args_share_term(tc["args"], last_human.content)
+        for m in user_messages
+        for tc in getattr(m, "tool_calls", None) or []
+    )
+
+
+def run_agent(user_messages: list, tool_log: list | None = None) -> str:
+    """
+    Run the tool-calling loop over user_messages and return the final reply.
+
+    If tool_log is given, every executed tool call is appended to it as
+    {"tool", "args", "output"} so callers can persist results for follow-ups.
+    When the history already carries replayed tool results whose arguments
+    share a term with the new message, round 0 is not forced to call a tool,
+    so follow-ups can be answered from them directly. Otherwise a confident local intent match runs the round-0
+    tool call without the LLM and the loop starts at the answer round.
+    Feasibility requests also start archive_search and web_search
+    speculatively so their latency overlaps the LLM calls.
+
+    The request's structured trace is handed to ai/agent_trace.py, which
+    persists it on a background thread.
+    """
+    started_at = datetime.now(timezone.utc)
+    start      = time.perf_counter()
+    last_human = next((m for m in reversed(user_messages) if isinstance(m, HumanMessage)), None)
+    rehydrated = _replay_covers(user_messages, last_human)
+    speculation = start_speculation(last_human.content) if last_human else None
+
+    run = {
+        "started_at":        started_at,
+        "rehydrated":        rehydrated,
+        "routed":            False,
+        "router_ms":         None,
+        "groq_key":          None,   # 1-based index into GROQ_API_KEY_*, never the key
+        "rate_limited_keys": [],
+        "rounds":            [],
+        "outcome":           "error",
+        "error":             None,
+    }
+    try:
+        reply = _run_agent_loop(user_messages, tool_log, rehydrated, last_human, speculation, run)
+        run["outcome"] = "round_limit" if any(
+            r.get("exit_reason") == "ROUND_LIMIT_EXHAUSTED" for r in run["rounds"]
+        ) else "answered"
+        return reply
+    except Exception as e:
+        run["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if speculation:
+            speculation.cancel()
+            run["speculation"] = {"hits": speculation.hits, "misses": speculation.misses}
+        run["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        run["rounds_used"]       = len(run["rounds"])
+        run["tool_calls"]        = sum(len(r["tool_calls"]) for r in run["rounds"])
+        run["truncations"]       = sum(tc["truncated"] for r in run["rounds"] for tc in r["tool_calls"])
+        run["tool_tokens"]       = sum(tc.get("tokens") or 0 for r in run["rounds"] for tc in r["tool_calls"])
+        run["tool_tokens_saved"] = sum(tc.get("tokens_saved") or 0 for r in run["rounds"] for tc in r["tool_calls"])
+        run["prompt_tokens"]     = sum(r.get("prompt_tokens") or 0 for r in run["rounds"])
+        run["completion_tokens"] = sum(r.get("completion_tokens") or 0 for r in run["rounds"])
+        run["timings"]           = stage_timings(run)
+        submit_trace(run)
+
+
+def _run_agent_loop(user_messages: list, tool_log: list | None, rehydrated: bool,
+                    last_human, speculation: Speculation | None, run: dict) -> str:
     last_error = None
 
+    # ── Local round 0 (once, shared by every key attempt) ───────
+    routed_msgs:   list = []
+    routed_record: dict | None = None
+    routed_log:    list = []
+    if last_human and not rehydrated:
+        route_start      = time.perf_counter()
+        routed           = route_intent(last_human.content)
+        run["router_ms"] = round((time.perf_counter() - route_start) * 1000, 2)
+    else:
+        routed = None
+
+    if routed:
+        tool_name, tool_args    = routed
+        result_str, call_record = _execute_tool_call(tool_name, tool_args, speculation)
+        routed_msgs = [
+            AIMessage(content="", tool_calls=[{"name": tool_name, "args": tool_args, "id": "routed_0"}]),
+            ToolMessage(content=result_str, tool_call_id="routed_0"),
+        ]
+        routed_record = {
+            "round":       0,
+            "tool_calls":  [call_record],
+            "free_text":   False,
+            "content_len": 0,
+            "routed":      True,
+        }
+        run["routed"] = True
+        if call_record["error"] is None:
+            routed_log.append({"tool": tool_name, "args": tool_args, "output": result_str})
+
     for key_idx, api_key in enumerate(_groq_keys):
         engine_forced = _make_engine_forced(api_key)
         engine_free   = _make_engine_free(api_key)
-        messages      = [SystemMessage(content=SYSTEM_STATE_MODIFIER)] + user_messages
+        messages      = [SystemMessage(content=SYSTEM_STATE_MODIFIER)] + user_messages + routed_msgs
+        if tool_log is not None:
+            tool_log[:] = routed_log   # a retry on the next key starts a fresh log
 
-        # ── Forensic trace ──────────────────────────────────────
-        trace = []   # one dict per round
+        # ── Forensic trace (persisted by run_agent) ─────────────
+        trace = [routed_record] if routed_record else []   # one dict per round
+        run["rounds"]   = trace
+        run["groq_key"] = key_idx + 1
 
         try:
-            for round_num in range(MAX_TOOL_ROUNDS):
-                engine   = engine_forced if round_num == 0 else engine_free
-                response = engine.invoke(messages)
+            for round_num in range(1 if routed else 0, MAX_TOOL_ROUNDS):
+                forced   = round_num == 0 and not rehydrated
+                engine   = engine_forced if forced else engine_free
+                response, llm_stats = _invoke_llm(engine, messages)
                 messages.append(response)
 
                 round_record = {
@@ -891,12 +1783,13 @@ def run_agent(user_messages: list) -> str:
                     "tool_calls":  [],
                     "free_text":   not bool(response.tool_calls),
                     "content_len": len(response.content or ""),
+                    "rehydrated":  rehydrated,
+                    **llm_stats,
                 }
 
                 if not response.tool_calls:
                     round_record["exit_reason"] = "no_tool_calls — LLM chose to respond"
                     trace.append(round_record)
-                    _print_trace(trace)          # ← forensic dump
 
                     if response.content and response.content.strip().startswith("<function"):
                         return (
@@ -910,44 +1803,12 @@ def run_agent(user_messages: list) -> str:
                     tool_args = tc["args"]
                     tool_id   = tc["id"]
 
-                    tool_fn    = TOOL_MAP.get(tool_name)
-                    call_record = {
-                        "tool":      tool_name,
-                        "args":      tool_args,
-                        "error":     None,
-                        "output_len": 0,
-                        "truncated": False,
-                    }
-
-                    if tool_fn is None:
-                        result_str          = f"ERROR: Unknown tool '{tool_name}'."
-                        call_record["error"] = "unknown_tool"
-                    else:
-                        try:
-                            raw_result           = tool_fn.invoke(tool_args)
-                            result_str           = str(raw_result)
-                            call_record["output_len"] = len(result_str)
-
-                            # Check for HIGHLY_NOVEL (zero archive hits)
-                            if "HIGHLY_NOVEL" in result_str:
-                                call_record["archive_result"] = "HIGHLY_NOVEL"
-                            elif "NOVELTY_STATUS" in result_str:
-                                # Extract the status line for the trace
-                                for line in result_str.splitlines():
-                                    if "NOVELTY_STATUS" in line:
-                                        call_record["archive_result"] = line.strip()
-                                        break
-
-                        except Exception as e:
-                            result_str           = f"TOOL ERROR [{tool_name}]: {type(e).__name__}: {e}"
-                            call_record["error"] = f"{type(e).__name__}: {e}"
-
-                    if len(result_str) > MAX_TOOL_OUTPUT_CHARS:
-                        result_str             = result_str[:MAX_TOOL_OUTPUT_CHARS] + "\n...[output truncated at budget]"
-                        call_record["truncated"] = True
+                    result_str, call_record = _execute_tool_call(tool_name, tool_args, speculation)
 
                     round_record["tool_calls"].append(call_record)
                     messages.append(ToolMessage(content=result_str, tool_call_id=tool_id))
+                    if tool_log is not None and call_record["error"] is None:
+                        tool_log.append({"tool": tool_name, "args": tool_args, "output": result_str})
 
                 trace.append(round_record)
 
@@ -956,7 +1817,7 @@ def run_agent(user_messages: list) -> str:
                 "Tool call limit reached. Summarise all retrieved results "
                 "and give the best analysis possible from what was collected."
             )))
-            final = engine_free.invoke(messages)
+            final, llm_stats = _invoke_llm(engine_free, messages)
 
             # Mark trace as exhausted
             trace.append({
@@ -965,14 +1826,15 @@ def run_agent(user_messages: list) -> str:
                 "tool_calls":  [],
                 "free_text":   True,
                 "content_len": len(final.content or ""),
+                **llm_stats,
             })
-            _print_trace(trace)
 
             return final.content or "(Round limit reached — no final response)"
 
         except Exception as e:
             if _is_rate_limit(e):
                 print(f"[System] Key {key_idx + 1} rate-limited — trying next key...")
+                run["rate_limited_keys"].append(key_idx + 1)
                 last_error = e
                 continue
             raise
@@ -982,117 +1844,70 @@ def run_agent(user_messages: list) -> str:
     )
 
 
-def _print_trace(trace: list) -> None:
-    """Print a structured post-mortem of the agent's reasoning trace."""
-
-    print("\n" + "╔" + "═" * 68 + "╗")
-    print("║  AGENT FORENSIC TRACE" + " " * 46 + "║")
-    print("╠" + "═" * 68 + "╣")
-
-    tools_called   = []
-    truncations    = []
-    errors         = []
-    skipped_round0 = False
-
-    for record in trace:
-        rn = record["round"]
-
-        if record["free_text"] and rn == 0:
-            skipped_round0 = True
-
-        prefix = f"║  Round {rn}"
-
-        if record.get("exit_reason") == "ROUND_LIMIT_EXHAUSTED":
-            print(f"{prefix}  ⚠  ROUND LIMIT EXHAUSTED — LLM summarised from memory")
-
-        elif record["free_text"]:
-            reason = record.get("exit_reason", "free text response")
-            print(f"{prefix}  →  No tool call. {reason}  (content: {record['content_len']} chars)")
-
-        else:
-            for tc in record["tool_calls"]:
-                tools_called.append(tc["tool"])
-
-                # Format the args cleanly
-                args_str = ", ".join(
-                    f'{k}="{v}"' if isinstance(v, str) else f"{k}={v}"
-                    for k, v in tc["args"].items()
-                )
-
-                status = "✓"
-                detail = f"{tc['output_len']} chars"
-
-                if tc["error"]:
-                    status = "✗"
-                    detail = f"ERROR: {tc['error']}"
-                    errors.append((rn, tc["tool"], tc["error"]))
-
-                if tc["truncated"]:
-                    detail += "  ⚠ TRUNCATED"
-                    truncations.append((rn, tc["tool"]))
-
-                archive_note = ""
-                if "archive_result" in tc:
-                    archive_note = f"  [{tc['archive_result']}]"
-
-                print(f"{prefix}  {status}  {tc['tool']}({args_str})")
-                print(f"║       └─ {detail}{archive_note}")
-
-    print("╠" + "═" * 68 + "╣")
-    print("║  SUMMARY" + " " * 59 + "║")
-    print("╠" + "═" * 68 + "╣")
-
-    # Tool call sequence
-    seq = " → ".join(tools_called) if tools_called else "NONE"
-    print(f"║  Tool sequence    : {seq[:50]}")
-
-    # Hallucination risk flags
-    print("║  Hallucination flags:")
-
-    if skipped_round0:
-        print("║    🔴  Round 0 had NO tool call — LLM responded from memory")
-        print("║        This is the primary hallucination vector.")
-    else:
-        print("║    🟢  Round 0 called a tool (retrieval-first confirmed)")
+# ============================================================
+# Component 11: Conversation Summarizer
+# ============================================================
 
-    if "archive_search" not in tools_called:
-        print("║    🔴  archive_search was NEVER called — any project names")
-        print("║        in the response are hallucinated")
-    else:
-        print("║    🟢  archive_search was called")
+SUMMARY_MODEL          = "llama-3.1-8b-instant"
+SUMMARY_MAX_TOKENS     = 400
+SUMMARY_INPUT_MSG_CAP  = 2500   # chars per message fed to the summarizer
+
+SUMMARY_INSTRUCTIONS = """
+You maintain a running summary of a conversation between a student and an
+FYDP research advisor bot. Merge the PREVIOUS SUMMARY with the NEW TURNS into
+one updated summary of at most 12 bullet points.
+
+Keep: the student's project idea and constraints, every project title, batch,
+advisor and converted score (stars + %) that was cited, advisor rankings,
+novelty/saturation verdicts, feasibility verdicts, URLs cited, and open
+questions the student asked.
+Drop: formatting, headers, tables, greetings, filler, repeated facts.
+Output the bullet list only.
+"""
 
-    if "web_search" not in tools_called:
-        print("║    🟡  web_search not called — no global novelty context")
-    else:
-        print("║    🟢  web_search was called")
 
-    if truncations:
-        for rn, tname in truncations:
-            print(f"║    🟡  Round {rn} {tname} output truncated — LLM saw partial data")
-    else:
-        print("║    🟢  No truncations")
-
-    if errors:
-        for rn, tname, err in errors:
-            print(f"║    🔴  Round {rn} {tname} errored: {err}")
+def summarize_conversation(previous_summary: str, messages: list) -> str:
+    """
+    Fold stored chat messages ({"role", "content"} dicts) into the running
+    session summary. Uses the small Groq model with the same key rotation
+    as run_agent.
+    """
+    transcript = []
+    for msg in messages:
+        speaker = "Student" if msg["role"] == "user" else "Advisor bot"
+        transcript.append(f"{speaker}: {msg['content'][:SUMMARY_INPUT_MSG_CAP]}")
+
+    prompt = [
+        SystemMessage(content=SUMMARY_INSTRUCTIONS),
+        HumanMessage(content=(
+            f"PREVIOUS SUMMARY:\n{previous_summary or '(none)'}\n\n"
+            f"NEW TURNS:\n" + "\n\n".join(transcript)
+        )),
+    ]
 
-    # Keyword quality check on archive_search args
-    for record in trace:
-        for tc in record["tool_calls"]:
-            if tc["tool"] == "archive_search":
-                q = tc["args"].get("query", "")
-                word_count = len(q.split())
-                if word_count > 6:
-                    print(f"║    🟡  archive_search query has {word_count} words: \"{q}\"")
-                    print("║        Expected 2–5 keywords. Retrieval quality may be degraded.")
-                else:
-                    print(f"║    🟢  archive_search query looks clean: \"{q}\"")
+    last_error = None
+    for api_key in _groq_keys:
+        try:
+            llm = ChatGroq(
+                temperature=0.0,
+                model=SUMMARY_MODEL,
+                max_tokens=SUMMARY_MAX_TOKENS,
+                api_key=api_key
+            )
+            return (llm.invoke(prompt).content or "").strip()
+        except Exception as e:
+            if _is_rate_limit(e):
+                last_error = e
+                continue
+            raise
 
-    print("╚" + "═" * 68 + "╝\n")
+    raise RuntimeError(
+        f"All {len(_groq_keys)} Groq keys are rate-limited. Last error: {last_error}"
+    )
 
 
 # ============================================================
-# Component 10: Execution Loop
+# Component 12: Execution Loop
 # ============================================================
 
 if __name__ == "__main__":
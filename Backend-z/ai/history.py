@@ -0,0 +1,41 @@
+"""
+Which past turns of a chat session go back to the agent with a new message.
+
+Every embedded turn of the session is a candidate, including turns already
+folded into the rolling summary: a turn that matches the new message is
+sent verbatim, and the summary only stands in for the turns retrieval did
+not bring back. Kept free of Mongo and the embedding model so the ranking
+can be checked offline (benchmarks/history_recall.py).
+"""
+
+import numpy as np
+
+HISTORY_TOP_K   = 2      # relevant past turns retrieved besides the latest one
+HISTORY_MIN_SIM = 0.55   # cosine floor for a past turn to count as relevant
+
+
+def rank_turns(turn_times: list, vectors, query, k: int = HISTORY_TOP_K,
+               min_sim: float = HISTORY_MIN_SIM) -> list:
+    """
+    created_at of the k past turns most similar to the query, best first.
+    Row i of vectors is one embedded message of turn turn_times[i]; a turn
+    scores as its best message and only counts from min_sim up.
+    """
+    if not turn_times:
+        return []
+    sims = np.asarray(vectors, dtype=np.float32) @ np.asarray(query, dtype=np.float32)
+
+    best: dict = {}
+    for t, sim in zip(turn_times, sims):
+        if sim >= min_sim and sim > best.get(t, -1.0):
+            best[t] = float(sim)
+    ranked = sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+    return [t for t, _ in ranked[:k]]
+
+
+def needs_summary(turn_times, sent_times, summary_until) -> bool:
+    """Whether any turn folded into the summary is missing from what is sent."""
+    if summary_until is None:
+        return False
+    sent = set(sent_times)
+    return any(t <= summary_until and t not in sent for t in turn_times)
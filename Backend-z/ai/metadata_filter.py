@@ -0,0 +1,141 @@
+"""
+Metadata filters evaluated inside the FAISS search.
+
+Each index gets per-row metadata columns (advisor code, batch year, source
+file code) built once from its docstore. A filter is turned into a row
+bitmap with a few vectorized comparisons and handed to FAISS as an
+IDSelectorBitmap, so a filtered query is still a single search that
+returns exactly the best k allowed rows — no over-fetching and
+post-filtering.
+
+Filter spec (all keys optional, combined with AND):
+
+    {"advisor": "Dr. Ali", "batches": ["2019"], "batch_from": 2018,
+     "batch_to": 2020, "source_file": "2019.json"}
+"""
+
+import weakref
+
+import faiss
+import numpy as np
+
+from ai.archive import batch_key, normalize_advisor
+
+FILTER_KEYS = ("advisor", "batches", "batch_from", "batch_to", "source_file")
+
+
+def make_filter(advisor: str | None = None, batches: list | None = None,
+                batch_from: int | None = None, batch_to: int | None = None,
+                source_file: str | None = None) -> dict | None:
+    """Filter spec with unset keys dropped; None when nothing is filtered."""
+    spec = {
+        "advisor":     advisor or None,
+        "batches":     [batch_key(b) for b in batches] if batches else None,
+        "batch_from":  batch_from,
+        "batch_to":    batch_to,
+        "source_file": source_file or None,
+    }
+    spec = {k: v for k, v in spec.items() if v is not None}
+    return spec or None
+
+
+def batch_range_allows(spec: dict | None, key: str) -> bool:
+    """Whether a batch-year shard can hold any row the filter allows."""
+    if not spec:
+        return True
+    if "batches" in spec and key not in spec["batches"]:
+        return False
+    if not key.isdigit():
+        return "batch_from" not in spec and "batch_to" not in spec
+    year = int(key)
+    return spec.get("batch_from", year) <= year <= spec.get("batch_to", year)
+
+
+class MetadataColumns:
+    """Row-aligned metadata of one FAISS index."""
+
+    def __init__(self, docstore, index_to_docstore_id: dict):
+        n = len(index_to_docstore_id)
+        advisor_codes: dict = {}
+        source_codes:  dict = {}
+        self.advisor = np.empty(n, dtype=np.int32)
+        self.source  = np.empty(n, dtype=np.int32)
+        self.year    = np.zeros(n, dtype=np.int32)   # 0 = unknown batch
+
+        for row in range(n):
+            md = docstore.search(index_to_docstore_id[row]).metadata
+            advisor = normalize_advisor(md.get("advisor", "Unknown"))
+            self.advisor[row] = advisor_codes.setdefault(advisor, len(advisor_codes))
+            self.source[row]  = source_codes.setdefault(md.get("source_file", ""), len(source_codes))
+            key = batch_key(md.get("batch"))
+            self.year[row] = int(key) if key.isdigit() else 0
+
+        self.advisor_names = list(advisor_codes)
+        self.source_codes  = source_codes
+        self.n = n
+
+    def mask(self, spec: dict) -> np.ndarray:
+        allowed = np.ones(self.n, dtype=bool)
+
+        if "advisor" in spec:
+            wanted = normalize_advisor(spec["advisor"])
+            codes  = [i for i, name in enumerate(self.advisor_names) if wanted in name]
+            allowed &= np.isin(self.advisor, codes)
+        if "batches" in spec:
+            years = [int(b) for b in spec["batches"] if b.isdigit()]
+            allowed &= np.isin(self.year, years)
+        if "batch_from" in spec:
+            allowed &= self.year >= int(spec["batch_from"])
+        if "batch_to" in spec:
+            allowed &= (self.year <= int(spec["batch_to"])) & (self.year > 0)
+        if "source_file" in spec:
+            code = self.source_codes.get(spec["source_file"], -1)
+            allowed &= self.source == code
+
+        return allowed
+
+
+def search_rows(index, columns: MetadataColumns, vector, k: int,
+                spec: dict | None) -> tuple[np.ndarray, np.ndarray]:
+    """(scores, rows) of the best k rows the filter allows, from one FAISS search."""
+    query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+    if not spec:
+        scores, rows = index.search(query, k)
+    else:
+        allowed = columns.mask(spec)
+        count   = int(allowed.sum())
+        if count == 0:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+        bitmap   = np.packbits(allowed, bitorder="little")
+        selector = faiss.IDSelectorBitmap(columns.n, faiss.swig_ptr(bitmap))
+        scores, rows = index.search(
+            query, min(k, count), params=faiss.SearchParameters(sel=selector)
+        )
+
+    keep = rows[0] >= 0
+    return scores[0][keep], rows[0][keep]
+
+
+# Columns per LangChain FAISS store, dropped with the store on index reload
+_columns: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def columns_for(store) -> MetadataColumns:
+    columns = _columns.get(store)
+    if columns is None:
+        columns = MetadataColumns(store.docstore, store.index_to_docstore_id)
+        _columns[store] = columns
+    return columns
+
+
+def filtered_search(store, vector, k: int, spec: dict | None) -> list:
+    """[(Document, score)] for any vector store the agent uses."""
+    if hasattr(store, "filtered_search"):   # sharded / sidecar stores
+        return store.filtered_search(vector, k, spec)
+
+    scores, rows = search_rows(store.index, columns_for(store), vector, k, spec)
+    return [
+        (store.docstore.search(store.index_to_docstore_id[int(row)]), float(score))
+        for row, score in zip(rows, scores)
+    ]
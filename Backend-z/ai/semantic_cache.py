@@ -0,0 +1,130 @@
+"""
+Semantic answer cache for first-turn chat questions.
+
+Questions are stored as normalized bge embeddings in a flat inner-product
+FAISS index; a lookup returns the cached answer of the nearest stored
+question when its cosine similarity clears the threshold, the entry is
+younger than the TTL, and it was produced against the current archive
+index version. The index is compacted whenever a lookup sees a new index
+version (entries of other versions are dropped) and on every revoke, so the
+rows a lookup searches are almost all live; expired rows are skipped and
+dropped at the next compaction.
+"""
+
+import threading
+import time
+
+import faiss
+import numpy as np
+
+SEARCH_K = 32   # nearest rows checked per lookup; expired rows among them are skipped
+
+
+class SemanticCache:
+    def __init__(self, threshold: float = 0.93, ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 2000):
+        self.threshold   = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock    = threading.Lock()
+        self._index   = None      # built on first store, once the dimension is known
+        self._entries: list = []  # row i of the FAISS index -> entry dict
+        self._ids:     set  = set()
+        self._version = None      # index version of the last lookup
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "stores": 0, "compactions": 0}
+
+    # ── internals ───────────────────────────────────────────
+
+    def _alive(self, entry: dict, index_version: str, now: float) -> bool:
+        return (
+            entry["index_version"] == index_version
+            and now - entry["created_at"] <= self.ttl_seconds
+        )
+
+    def _rebuild(self, entries: list) -> None:
+        dim = self._index.d
+        self._index = faiss.IndexFlatIP(dim)
+        if entries:
+            self._index.add(np.stack([e["vector"] for e in entries]))
+        self._entries = entries
+        self._ids     = {e["id"] for e in entries}
+        self.stats["compactions"] += 1
+
+    # ── public API ──────────────────────────────────────────
+
+    def lookup(self, vector, index_version: str) -> dict | None:
+        """Return the best live entry above threshold, or None."""
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        now   = time.time()
+
+        with self._lock:
+            self.stats["lookups"] += 1
+            if self._index is None or self._index.ntotal == 0:
+                self.stats["misses"] += 1
+                return None
+
+            if index_version != self._version:
+                self._version = index_version
+                self._rebuild([e for e in self._entries if e["index_version"] == index_version])
+                if self._index.ntotal == 0:
+                    self.stats["misses"] += 1
+                    return None
+
+            scores, rows = self._index.search(query, min(SEARCH_K, self._index.ntotal))
+            for score, row in zip(scores[0], rows[0]):
+                if row < 0 or score < self.threshold:
+                    break
+                entry = self._entries[row]
+                if self._alive(entry, index_version, now):
+                    entry["hits"] += 1
+                    self.stats["hits"] += 1
+                    return {**entry, "similarity": float(score)}
+
+            self.stats["misses"] += 1
+            return None
+
+    def store(self, entry_id: str, question: str, vector, answer: str,
+              response_type: str, index_version: str,
+              created_at: float | None = None) -> None:
+        vec = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            if entry_id in self._ids:
+                return   # already loaded (own store seen again by a sync)
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(vec.shape[0])
+
+            self._entries.append({
+                "id":            entry_id,
+                "question":      question,
+                "vector":        vec,
+                "answer":        answer,
+                "type":          response_type,
+                "index_version": index_version,
+                "created_at":    created_at or time.time(),
+                "hits":          0,
+            })
+            self._ids.add(entry_id)
+            self._index.add(vec.reshape(1, -1))
+            self.stats["stores"] += 1
+
+            if len(self._entries) > self.max_entries:
+                now  = time.time()
+                live = [e for e in self._entries if self._alive(e, index_version, now)]
+                self._rebuild(live[-(self.max_entries // 2):])
+
+    def revoke(self, entry_id: str) -> bool:
+        with self._lock:
+            if entry_id not in self._ids:
+                return False
+            self._rebuild([e for e in self._entries if e["id"] != entry_id])
+            return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["lookups"]
+            return {
+                **self.stats,
+                "entries":  len(self._entries),
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,151 @@
+"""
+Archive index split into one FAISS sub-index per batch year.
+
+Every shard is an exact inner-product index, so merging the per-shard
+top-k lists gives the same top-k as one index over all documents. A batch
+filter skips whole shards instead of filtering results, and a new batch
+year is added by building only its shard — existing shard directories are
+never rewritten. Metadata filters skip shards outside the batch range and
+run inside each remaining shard's FAISS search (ai.metadata_filter).
+
+    faiss_index_shards/
+        2016/index.faiss, index.pkl
+        2018/...
+"""
+
+import heapq
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from ai.archive import batch_key
+from ai.metadata_filter import batch_range_allows, filtered_search
+
+SHARD_SEARCH_WORKERS = 8
+
+
+class ShardedVectorStore:
+    """
+    The slice of the LangChain FAISS interface the agent uses, fanned out
+    over per-year shards. `docstore` is a merged view holding the shards'
+    own Document objects.
+    """
+
+    def __init__(self, shards: dict, root: Path):
+        self.root   = root
+        self.shards = dict(sorted(shards.items()))
+        self.docstore = InMemoryDocstore({
+            doc_id: doc
+            for store in self.shards.values()
+            for doc_id, doc in store.docstore._dict.items()
+        })
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, min(SHARD_SEARCH_WORKERS, len(self.shards))),
+            thread_name_prefix="shard-search",
+        )
+
+    # ── construction ────────────────────────────────────────
+
+    @classmethod
+    def load(cls, root: Path, embeddings: Embeddings) -> "ShardedVectorStore":
+        shards = {
+            d.name: FAISS.load_local(str(d), embeddings, allow_dangerous_deserialization=True)
+            for d in sorted(root.iterdir())
+            if not d.name.startswith(".") and (d / "index.faiss").exists()   # skip staging dirs
+        }
+        return cls(shards, root)
+
+    @staticmethod
+    def group_by_batch(documents: list[Document]) -> dict:
+        groups: dict = {}
+        for doc in documents:
+            groups.setdefault(batch_key(doc.metadata.get("batch")), []).append(doc)
+        return groups
+
+    @staticmethod
+    def build_shard(root: Path, key: str, documents: list[Document],
+                    embeddings: Embeddings) -> FAISS:
+        """
+        Build one batch year's shard in a private staging directory and rename
+        it into place, so a shard directory is either complete or absent. Every
+        worker may reach this for the same new year at once: whoever renames
+        first wins and the others load the winner's shard.
+        """
+        target = root / key
+        if (target / "index.faiss").exists():
+            return FAISS.load_local(str(target), embeddings, allow_dangerous_deserialization=True)
+
+        store = FAISS.from_documents(
+            documents, embeddings, distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+        staging = root / f".{key}.staging-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        store.save_local(str(staging))
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another process installed this shard first
+            shutil.rmtree(staging, ignore_errors=True)
+            return FAISS.load_local(str(target), embeddings, allow_dangerous_deserialization=True)
+        return store
+
+    @classmethod
+    def build(cls, root: Path, documents: list[Document],
+              embeddings: Embeddings) -> "ShardedVectorStore":
+        root.mkdir(parents=True, exist_ok=True)
+        shards = {
+            key: cls.build_shard(root, key, docs, embeddings)
+            for key, docs in cls.group_by_batch(documents).items()
+        }
+        return cls(shards, root)
+
+    def missing_batches(self, documents: list[Document]) -> dict:
+        """Documents of batch years that have no shard yet, grouped by year."""
+        return {
+            key: docs for key, docs in self.group_by_batch(documents).items()
+            if key not in self.shards
+        }
+
+    # ── search ──────────────────────────────────────────────
+
+    def _fan_out(self, selected: list, k: int, search) -> list:
+        if not selected:
+            return []
+        if len(selected) == 1:
+            return heapq.nlargest(k, search(selected[0]), key=lambda hit: hit[1])
+        try:
+            futures = [self._pool.submit(search, store) for store in selected]
+        except RuntimeError:
+            # Closed by a reload while this search was starting: finish it inline
+            futures = None
+        if futures is None:
+            hits = [hit for store in selected for hit in search(store)]
+        else:
+            hits = [hit for future in futures for hit in future.result()]
+        return heapq.nlargest(k, hits, key=lambda hit: hit[1])
+
+    def close(self) -> None:
+        """Release the search threads once this store has been swapped out."""
+        self._pool.shutdown(wait=False)
+
+    def similarity_search_with_score_by_vector(self, embedding, k: int = 4, **kwargs):
+        return self._fan_out(
+            list(self.shards.values()), k,
+            lambda store: store.similarity_search_with_score_by_vector(embedding, k=k, **kwargs),
+        )
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs):
+        embedding = next(iter(self.shards.values())).embedding_function.embed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k, **kwargs)
+
+    def filtered_search(self, vector, k: int, spec: dict | None) -> list:
+        selected = [store for key, store in self.shards.items() if batch_range_allows(spec, key)]
+        return self._fan_out(selected, k, lambda store: filtered_search(store, vector, k, spec))
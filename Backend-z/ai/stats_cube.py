@@ -0,0 +1,196 @@
+"""
+Materialized (batch, advisor, technical pattern) counts over the archive.
+
+Committee analytics ("how many computer-vision projects per batch", "which
+advisors supervise IoT work since 2018") are answered from pre-aggregated
+cells instead of scanning documents. Each archived project contributes one
+to its (batch, advisor) project count and one per technical pattern
+extract_technical_patterns finds in it.
+
+The cube is rebuilt whenever the index is built from scratch and updated
+incrementally otherwise (e.g. a new batch year's shard): adding a project
+that is already counted is a no-op, so updates can simply be replayed.
+
+    cd Backend-z
+    python -m ai.stats_cube          # rebuild from the archive JSON
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from ai.archive import SCRIPT_DIR, batch_key, extract_technical_patterns, load_archive_documents
+
+STATS_CUBE_PATH = SCRIPT_DIR / "stats_cube.json"
+
+DIMENSIONS = ("batch", "advisor", "pattern")
+
+
+def _doc_key(doc: Document) -> str:
+    return f"{doc.metadata.get('source_file', '')}::{doc.metadata.get('title', '')}"
+
+
+class StatsCube:
+    def __init__(self):
+        self._lock     = threading.Lock()
+        self.cells:    dict = {}   # (batch, advisor, pattern) -> count
+        self.projects: dict = {}   # (batch, advisor) -> count
+        self.documents: dict = {}  # doc key -> [batch, advisor, patterns]
+
+    # ── maintenance ─────────────────────────────────────────
+
+    def add(self, documents: list[Document]) -> int:
+        """Count projects not yet in the cube; returns how many were new."""
+        added = 0
+        with self._lock:
+            for doc in documents:
+                key = _doc_key(doc)
+                if key in self.documents:
+                    continue
+                batch   = batch_key(doc.metadata.get("batch"))
+                advisor = doc.metadata.get("advisor", "Unknown")
+                pat     = extract_technical_patterns(doc.page_content)
+                patterns = pat["positive"] + pat["negative"]
+
+                self.documents[key] = [batch, advisor, patterns]
+                self.projects[(batch, advisor)] = self.projects.get((batch, advisor), 0) + 1
+                for p in patterns:
+                    cell = (batch, advisor, p)
+                    self.cells[cell] = self.cells.get(cell, 0) + 1
+                added += 1
+        return added
+
+    def remove(self, documents: list[Document]) -> int:
+        removed = 0
+        with self._lock:
+            for doc in documents:
+                entry = self.documents.pop(_doc_key(doc), None)
+                if entry is None:
+                    continue
+                batch, advisor, patterns = entry
+                self._decrement(self.projects, (batch, advisor))
+                for p in patterns:
+                    self._decrement(self.cells, (batch, advisor, p))
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _decrement(counts: dict, key: tuple) -> None:
+        counts[key] -= 1
+        if counts[key] <= 0:
+            del counts[key]
+
+    @classmethod
+    def from_documents(cls, documents: list[Document]) -> "StatsCube":
+        cube = cls()
+        cube.add(documents)
+        return cube
+
+    # ── persistence ─────────────────────────────────────────
+
+    def save(self, path: Path = STATS_CUBE_PATH) -> None:
+        with self._lock:
+            payload = {
+                "cells":     [[*k, v] for k, v in sorted(self.cells.items())],
+                "projects":  [[*k, v] for k, v in sorted(self.projects.items())],
+                "documents": self.documents,
+            }
+        # Unique temp file: several workers may save the cube at once on a reload
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent,
+                                         prefix=path.stem + ".", suffix=".tmp", delete=False) as f:
+            json.dump(payload, f)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+    @classmethod
+    def load(cls, path: Path = STATS_CUBE_PATH) -> "StatsCube | None":
+        try:
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        cube = cls()
+        cube.cells     = {(b, a, p): n for b, a, p, n in payload["cells"]}
+        cube.projects  = {(b, a): n for b, a, n in payload["projects"]}
+        cube.documents = payload["documents"]
+        return cube
+
+    # ── queries ─────────────────────────────────────────────
+
+    def query(self, group_by: list[str], batch_from: int | None = None,
+              batch_to: int | None = None, advisor: str | None = None,
+              pattern: str | None = None) -> list[dict]:
+        """
+        Roll the cube up to `group_by` (any of batch/advisor/pattern). Without
+        "pattern" in group_by or a pattern filter, counts are projects;
+        otherwise they are project-pattern occurrences.
+        """
+        def keep(batch: str, adv: str) -> bool:
+            if advisor and advisor.lower() not in adv.lower():
+                return False
+            if batch_from is not None or batch_to is not None:
+                if not batch.isdigit():
+                    return False
+                year = int(batch)
+                if batch_from is not None and year < batch_from:
+                    return False
+                if batch_to is not None and year > batch_to:
+                    return False
+            return True
+
+        use_patterns = "pattern" in group_by or pattern is not None
+        rows: dict = {}
+        with self._lock:
+            if use_patterns:
+                source = ((dict(batch=b, advisor=a, pattern=p), n)
+                          for (b, a, p), n in self.cells.items()
+                          if keep(b, a) and (pattern is None or p == pattern))
+            else:
+                source = ((dict(batch=b, advisor=a), n)
+                          for (b, a), n in self.projects.items() if keep(b, a))
+            for coords, n in source:
+                key = tuple(coords[d] for d in group_by)
+                rows[key] = rows.get(key, 0) + n
+
+        return [
+            {**dict(zip(group_by, key)), "count": n}
+            for key, n in sorted(rows.items(), key=lambda kv: (-kv[1], kv[0]))
+        ]
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "projects": sum(self.projects.values()),
+                "batches":  sorted({b for b, _ in self.projects}),
+                "advisors": len({a for _, a in self.projects}),
+                "patterns": sorted({p for _, _, p in self.cells}),
+                "cells":    len(self.cells),
+            }
+
+
+# ── index-time hooks ────────────────────────────────────────
+
+def rebuild_stats_cube(documents: list[Document], path: Path = STATS_CUBE_PATH) -> StatsCube:
+    cube = StatsCube.from_documents(documents)
+    cube.save(path)
+    return cube
+
+
+def update_stats_cube(documents: list[Document], path: Path = STATS_CUBE_PATH) -> StatsCube:
+    """Add documents to the saved cube (building it if it does not exist yet)."""
+    cube = StatsCube.load(path) or StatsCube()
+    if cube.add(documents):
+        cube.save(path)
+    return cube
+
+
+if __name__ == "__main__":
+    cube = rebuild_stats_cube(load_archive_documents())
+    print(json.dumps(cube.summary(), indent=2))
@@ -0,0 +1,75 @@
+"""
+Token accounting for prompt budgets.
+
+Tokens are counted with the chat model's own tokenizer (LLM_TOKENIZER, a
+Hub repo or a local tokenizer.json) once it has loaded. Loading happens on
+a background thread the first time anything is counted; until then, and
+whenever the tokenizer is unavailable (gated repo, offline host), counts
+fall back to a character-based estimate (~4 characters per Llama-3 token
+on English prose). Budgets only have to be consistent within a request,
+and the same counter is used for the budget check and the savings report.
+"""
+
+import os
+import threading
+
+CHARS_PER_TOKEN = 4
+LLM_TOKENIZER   = os.getenv("LLM_TOKENIZER", "meta-llama/Llama-3.3-70B-Instruct")
+
+_tokenizer       = None
+_tokenizer_state = "unloaded"   # unloaded -> loading -> ready | unavailable
+_tokenizer_lock  = threading.Lock()
+
+
+def _load_tokenizer() -> None:
+    global _tokenizer, _tokenizer_state
+    try:
+        from tokenizers import Tokenizer
+        if os.path.isfile(LLM_TOKENIZER):
+            tok = Tokenizer.from_file(LLM_TOKENIZER)
+        else:
+            tok = Tokenizer.from_pretrained(LLM_TOKENIZER, token=os.getenv("HF_TOKEN"))
+        _tokenizer, _tokenizer_state = tok, "ready"
+        print(f"System Log: Token counts use the {LLM_TOKENIZER} tokenizer")
+    except Exception as e:
+        _tokenizer_state = "unavailable"
+        print(f"System Log: Tokenizer {LLM_TOKENIZER} unavailable, estimating tokens from characters ({e})")
+
+
+def _get_tokenizer():
+    global _tokenizer_state
+    if _tokenizer_state == "unloaded" and LLM_TOKENIZER:
+        with _tokenizer_lock:
+            if _tokenizer_state == "unloaded":
+                _tokenizer_state = "loading"
+                threading.Thread(target=_load_tokenizer, name="tokenizer-load", daemon=True).start()
+    return _tokenizer
+
+
+def tokenizer_name() -> str:
+    """What count_tokens is measuring with right now (reported in traces)."""
+    return LLM_TOKENIZER if _get_tokenizer() is not None else "chars/4"
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    tok = _get_tokenizer()
+    if tok is not None:
+        return len(tok.encode(text, add_special_tokens=False).ids)
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def clip_to_tokens(text: str, max_tokens: int, marker: str = "\n...[clipped for history budget]") -> str:
+    """Cut text down to roughly max_tokens, marking the cut."""
+    if max_tokens <= 0:
+        return ""
+    tok = _get_tokenizer()
+    if tok is not None:
+        enc = tok.encode(text, add_special_tokens=False)
+        if len(enc.ids) <= max_tokens:
+            return text
+        return text[:enc.offsets[max_tokens - 1][1]].rstrip() + marker
+    if count_tokens(text) <= max_tokens:
+        return text
+    return text[:max_tokens * CHARS_PER_TOKEN].rstrip() + marker
@@ -0,0 +1,123 @@
+"""
+Token-budgeted rendering of tool outputs for the LLM.
+
+A tool hands over its fixed header lines and one entry per result, best
+first; each entry comes as a list of renderings from most to least
+detailed (full → compact → one line). Entries start at the detail their
+strength earns — strong matches in full, weak ones compact — and while the
+output is over budget the lowest-ranked entries are stepped down first:
+everything below the top one goes to compact, then to one line, then is
+dropped, each pass working from the bottom up. Only then is the top-ranked
+entry compacted, and after that the text clipped; it is never dropped.
+
+The result is a str (what the tool returns to the LLM) carrying a
+`render` dict with the token counts. `tokens_saved` is measured against
+what the previous formatter sent (every entry in full, or only the first
+`baseline_entries` of them, cut at BASELINE_CHARS), so it never credits
+savings on results the old output did not include; `tokens_full` is the
+render of every entry in full, for reference.
+"""
+
+from ai.tokens import clip_to_tokens, count_tokens, tokenizer_name
+
+STRONG_SCORE   = 0.75   # same cut-off as STRONG MATCH / STRONG_MATCHES
+BASELINE_CHARS = 8000   # the character cut tool outputs had before token budgets
+
+
+class Rendered(str):
+    """Tool output text with its render stats attached."""
+
+    render: dict = {}
+
+
+def _join(parts: list) -> str:
+    return "\n".join(p for p in parts if p)
+
+
+def render_budgeted(header: list, entries: list, start_levels: list, budget: int,
+                    footer: list | None = None, baseline_entries: int | None = None,
+                    baseline_note: list | None = None) -> Rendered:
+    """
+    header/footer: lines always kept. entries: [[full, compact, ..., one_line], ...]
+    best first. start_levels: index into each entry's renderings to start from.
+    baseline_entries / baseline_note: how many entries the previous formatter
+    showed in full and the note it printed instead of the rest.
+    """
+    footer = footer or []
+    levels = [min(lvl, len(e) - 1) for lvl, e in zip(start_levels, entries)]
+    cost   = {}   # (entry, level) -> tokens, each rendering counted once
+
+    def tokens_of(i: int, lvl: int) -> int:
+        if lvl >= len(entries[i]):      # dropped
+            return 0
+        if (i, lvl) not in cost:
+            cost[(i, lvl)] = count_tokens(entries[i][lvl]) + 1
+        return cost[(i, lvl)]
+
+    fixed = count_tokens(_join(header)) + count_tokens(_join(footer)) + 2
+    total = fixed + sum(tokens_of(i, lvl) for i, lvl in enumerate(levels))
+
+    # 1) lower-ranked entries one detail level at a time, bottom first
+    for target in range(1, max((len(e) for e in entries), default=1)):
+        for i in range(len(entries) - 1, 0, -1):
+            if total <= budget:
+                break
+            lvl = min(target, len(entries[i]) - 1)
+            if levels[i] < lvl:
+                total    += tokens_of(i, lvl) - tokens_of(i, levels[i])
+                levels[i] = lvl
+    # 2) then drop them, bottom first
+    for i in range(len(entries) - 1, 0, -1):
+        if total <= budget:
+            break
+        total    -= tokens_of(i, levels[i])
+        levels[i] = len(entries[i])
+    # 3) last resort: the top entry itself, short of its one-line form; the
+    #    room that frees goes back to the best dropped entries as one-liners
+    while entries and total > budget and levels[0] < len(entries[0]) - 2:
+        total    += tokens_of(0, levels[0] + 1) - tokens_of(0, levels[0])
+        levels[0] += 1
+        for i in range(1, len(entries)):
+            one_line = len(entries[i]) - 1
+            if levels[i] > one_line and total + tokens_of(i, one_line) <= budget:
+                total    += tokens_of(i, one_line)
+                levels[i] = one_line
+
+    kept    = [entries[i][lvl] for i, lvl in enumerate(levels) if lvl < len(entries[i])]
+    dropped = sum(lvl >= len(e) for lvl, e in zip(levels, entries))
+    note    = [f"[{dropped} lower-ranked result(s) omitted for length]"] if dropped else []
+    text    = _join(header + kept + note + footer)
+
+    clipped = count_tokens(text) > budget
+    if clipped:   # header + top entry alone exceed the budget
+        text = clip_to_tokens(text, budget, marker="\n...[output clipped at token budget]")
+
+    full_text     = _join(header + [e[0] for e in entries] + footer)
+    baseline_text = full_text
+    if baseline_entries is not None and baseline_entries < len(entries):
+        baseline_text = _join(header + [e[0] for e in entries[:baseline_entries]] + (baseline_note or []) + footer)
+    out = Rendered(text)
+    out.render = {
+        "tokens":          count_tokens(text),
+        "tokens_baseline": count_tokens(baseline_text[:BASELINE_CHARS]),
+        "tokens_full":     count_tokens(full_text),
+        "compressed":      sum(0 < lvl < len(e) for lvl, e in zip(levels, entries)),
+        "dropped":         dropped,
+        "clipped":         clipped,
+        "tokenizer":       tokenizer_name(),
+    }
+    out.render["tokens_saved"] = max(0, out.render["tokens_baseline"] - out.render["tokens"])
+    return out
+
+
+def start_level(score: float) -> int:
+    """Strong matches start in full detail, everything else compact."""
+    return 0 if score >= STRONG_SCORE else 1
+
+
+def clip_words(text: str, max_tokens: int) -> str:
+    """Shorten prose for a compact rendering, at a word boundary."""
+    clipped = clip_to_tokens(text, max_tokens, marker="")
+    if clipped == text:
+        return text
+    return clipped.rsplit(" ", 1)[0].rstrip(",;:") + " …"
@@ -0,0 +1,187 @@
+"""
+Topic clusters over the archive embeddings.
+
+Spherical k-means (FAISS) groups every archived project into a topic
+cluster; for each cluster we keep its size, share of the archive, batch
+spread, advisor distribution, a saturation level relative to the mean
+cluster size and a trend (recent batches' share vs. earlier ones). At
+query time the nearest centroid(s) answer "how crowded is this area and
+is it growing" without scanning any documents.
+
+Clusters are built offline and stamped with the index version they were
+computed from; the agent ignores stale files and, for small archives,
+computes them in-process instead.
+
+    cd Backend-z
+    python -m ai.topic_clusters --clusters 12
+"""
+
+import argparse
+import json
+import math
+import os
+import pickle
+from pathlib import Path
+from types import SimpleNamespace
+
+import faiss
+import numpy as np
+
+from ai.archive import FAISS_INDEX_DIR, FAISS_SHARD_DIR, SCRIPT_DIR, batch_key, fingerprint_index
+
+TOPIC_CLUSTER_DIR  = SCRIPT_DIR / "topic_cluster_cache"
+CLUSTER_INLINE_MAX = int(os.getenv("TOPIC_CLUSTER_INLINE_MAX", "20000"))
+CLUSTER_MIN_SIM    = 0.55   # below this the query is not "in" any cluster
+CLUSTER_SAMPLES    = 3
+
+
+def default_cluster_count(n: int) -> int:
+    return max(2, min(64, round(math.sqrt(n / 2))))
+
+
+def store_vectors(store) -> tuple[np.ndarray, list]:
+    """All vectors of a (sharded) FAISS store with their documents, row-aligned."""
+    parts = store.shards.values() if hasattr(store, "shards") else [store]
+    vectors, docs = [], []
+    for part in parts:
+        n = part.index.ntotal
+        vectors.append(part.index.reconstruct_n(0, n))
+        docs.extend(part.docstore.search(part.index_to_docstore_id[i]) for i in range(n))
+    return np.vstack(vectors).astype(np.float32), docs
+
+
+def _trend(per_year: dict, year_totals: dict) -> str:
+    years = sorted(y for y in year_totals if y != "unknown")
+    if len(years) < 2:
+        return "STABLE"
+    shares  = [per_year.get(y, 0) / year_totals[y] for y in years]
+    split   = max(1, len(years) - 2)
+    earlier = sum(shares[:split]) / split
+    recent  = sum(shares[split:]) / len(shares[split:])
+    if earlier == 0:
+        return "RISING" if recent > 0 else "STABLE"
+    ratio = recent / earlier
+    if ratio >= 1.25:
+        return "RISING"
+    if ratio <= 0.8:
+        return "DECLINING"
+    return "STABLE"
+
+
+def _saturation(size: int, mean_size: float) -> str:
+    if size >= 1.5 * mean_size:
+        return "HIGH"
+    if size <= 0.5 * mean_size:
+        return "LOW"
+    return "MODERATE"
+
+
+class TopicClusters:
+    def __init__(self, centroids: np.ndarray, clusters: list, index_version: str):
+        self.centroids     = np.asarray(centroids, dtype=np.float32)
+        self.clusters      = clusters
+        self.index_version = index_version
+
+    # ── build / persist ─────────────────────────────────────
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, docs: list, index_version: str,
+              n_clusters: int | None = None, seed: int = 7) -> "TopicClusters":
+        n = len(docs)
+        k = min(n_clusters or default_cluster_count(n), n)
+        kmeans = faiss.Kmeans(vectors.shape[1], k, niter=25, spherical=True, seed=seed, verbose=False)
+        kmeans.train(vectors)
+        sims, assign = kmeans.index.search(vectors, 1)
+        sims, assign = sims[:, 0], assign[:, 0]
+
+        year_totals: dict = {}
+        for doc in docs:
+            y = batch_key(doc.metadata.get("batch"))
+            year_totals[y] = year_totals.get(y, 0) + 1
+
+        mean_size = n / k
+        clusters  = []
+        for c in range(k):
+            members = np.flatnonzero(assign == c)
+            per_year: dict = {}
+            advisors: dict = {}
+            for row in members:
+                md = docs[row].metadata
+                y  = batch_key(md.get("batch"))
+                per_year[y] = per_year.get(y, 0) + 1
+                a = md.get("advisor", "Unknown")
+                advisors[a] = advisors.get(a, 0) + 1
+
+            closest = members[np.argsort(-sims[members])][:CLUSTER_SAMPLES]
+            clusters.append({
+                "id":               c,
+                "size":             int(len(members)),
+                "share":            round(len(members) / n, 4),
+                "saturation_level": _saturation(len(members), mean_size),
+                "trend":            _trend(per_year, year_totals),
+                "batch_spread":     dict(sorted(per_year.items())),
+                "advisors":         dict(sorted(advisors.items(), key=lambda kv: -kv[1])),
+                "sample_titles":    [docs[row].metadata.get("title", "N/A") for row in closest],
+            })
+
+        return cls(kmeans.centroids, clusters, index_version)
+
+    def save(self, out_dir: Path = TOPIC_CLUSTER_DIR) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        np.save(out_dir / "centroids.npy", self.centroids)
+        with open(out_dir / "clusters.json", "w", encoding="utf-8") as f:
+            json.dump({"index_version": self.index_version, "clusters": self.clusters}, f, indent=2)
+
+    @classmethod
+    def load(cls, index_version: str, out_dir: Path = TOPIC_CLUSTER_DIR) -> "TopicClusters | None":
+        """Saved clusters, or None if missing or computed from another index version."""
+        try:
+            with open(out_dir / "clusters.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["index_version"] != index_version:
+                return None
+            return cls(np.load(out_dir / "centroids.npy"), meta["clusters"], index_version)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    # ── query ───────────────────────────────────────────────
+
+    def nearest(self, vector, top: int = 2, min_sim: float = CLUSTER_MIN_SIM) -> list:
+        sims  = self.centroids @ np.asarray(vector, dtype=np.float32)
+        order = np.argsort(-sims)[:top]
+        return [
+            {**self.clusters[c], "similarity": round(float(sims[c]), 4)}
+            for c in order if sims[c] >= min_sim
+        ]
+
+
+def _load_index_files(index_dir: Path):
+    """FAISS index + docstore straight from disk — no embedding model needed."""
+    def one(d: Path):
+        with open(d / "index.pkl", "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        return SimpleNamespace(index=faiss.read_index(str(d / "index.faiss")),
+                               docstore=docstore, index_to_docstore_id=index_to_docstore_id)
+
+    if (index_dir / "index.faiss").exists():
+        return one(index_dir)
+    return SimpleNamespace(shards={
+        d.name: one(d) for d in sorted(index_dir.iterdir()) if (d / "index.faiss").exists()
+    })
+
+
+if __name__ == "__main__":
+    sharded = os.getenv("ARCHIVE_INDEX_SHARDED", "0") == "1"
+    parser = argparse.ArgumentParser(description="Offline topic clusters for the archive index")
+    parser.add_argument("--index-dir", type=Path, default=FAISS_SHARD_DIR if sharded else FAISS_INDEX_DIR)
+    parser.add_argument("--clusters", type=int, default=None)
+    args = parser.parse_args()
+
+    vectors, docs = store_vectors(_load_index_files(args.index_dir))
+    topics = TopicClusters.build(vectors, docs, fingerprint_index(args.index_dir), args.clusters)
+    topics.save()
+
+    print(f"{len(docs)} documents -> {len(topics.clusters)} clusters (index {topics.index_version})")
+    for c in sorted(topics.clusters, key=lambda c: -c["size"]):
+        print(f"  #{c['id']:<3} {c['size']:>5} docs  {c['saturation_level']:<8} {c['trend']:<9} "
+              f"{c['sample_titles'][0] if c['sample_titles'] else ''}")
@@ -0,0 +1,348 @@
+"""
+Shared embedding + vector-search sidecar.
+
+Every API worker that imports the agent otherwise loads its own copy of
+bge-base and the FAISS index. With VECTOR_SIDECAR_SOCKET set, one sidecar
+process owns both and workers become thin clients: they keep only the
+pickled docstore (for metadata) and send embed / search requests over a
+Unix domain socket.
+
+    python -m ai.vector_sidecar --socket /tmp/inspire-vectors.sock
+
+Wire format (network byte order headers, little-endian arrays):
+
+    frame     = op/status:u8  length:u32  payload
+    EMBED     → count:u32 (len:u32 utf8)*       ← count:u32 dim:u32 f32[count*dim]
+    SEARCH    → k:u32 dim:u32 f32[dim] [filter] ← vlen:u8 version n:u32 i64[n] f32[n]
+    INFO      → (empty)                         ← JSON
+    RELOAD    → (empty)                         ← JSON
+
+The optional filter is a JSON metadata filter spec (ai.metadata_filter),
+applied inside the sidecar's FAISS search.
+
+SEARCH returns FAISS row positions; the client maps them to documents with
+its own index_to_docstore_id and reloads its docstore when the version the
+sidecar reports differs from the one it holds. Restarting the sidecar (or
+sending RELOAD) picks up a rebuilt index without touching the API workers.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ai.archive import FAISS_INDEX_DIR, fingerprint_index
+from ai.metadata_filter import columns_for, search_rows
+
+OP_EMBED, OP_SEARCH, OP_INFO, OP_RELOAD = 1, 2, 3, 4
+STATUS_OK, STATUS_ERROR = 0, 1
+
+_HEADER = struct.Struct("!BI")
+_U32    = struct.Struct("!I")
+_PAIR   = struct.Struct("!II")
+
+SIDECAR_TIMEOUT = float(os.getenv("VECTOR_SIDECAR_TIMEOUT", "10"))
+
+
+# ============================================================
+# Framing
+# ============================================================
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("sidecar connection closed")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _send_frame(sock: socket.socket, code: int, payload: bytes = b"") -> None:
+    sock.sendall(_HEADER.pack(code, len(payload)) + payload)
+
+
+def _recv_frame(sock: socket.socket) -> tuple[int, bytes]:
+    code, length = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return code, _recv_exact(sock, length) if length else b""
+
+
+def _encode_texts(texts: list[str]) -> bytes:
+    parts = [_U32.pack(len(texts))]
+    for text in texts:
+        raw = text.encode("utf-8")
+        parts.append(_U32.pack(len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+def _decode_texts(payload: bytes) -> list[str]:
+    (count,) = _U32.unpack_from(payload, 0)
+    offset, texts = _U32.size, []
+    for _ in range(count):
+        (length,) = _U32.unpack_from(payload, offset)
+        offset += _U32.size
+        texts.append(payload[offset:offset + length].decode("utf-8"))
+        offset += length
+    return texts
+
+
+# ============================================================
+# Server
+# ============================================================
+
+class VectorSidecar:
+    """Owns the embedding model and the FAISS index for every worker on the host."""
+
+    def __init__(self, index_dir: Path = FAISS_INDEX_DIR):
+        from ai.embeddings import BatchingEmbeddings, load_base_embeddings
+
+        self.index_dir  = index_dir
+        self.embeddings = BatchingEmbeddings(load_base_embeddings())
+        self._reload_lock = threading.Lock()
+        self.store, self.version = self._load()
+
+    def _load(self):
+        from langchain_community.vectorstores import FAISS
+
+        if not (self.index_dir / "index.faiss").exists():
+            raise FileNotFoundError(
+                f"No FAISS index at {self.index_dir}. Build it first by starting the "
+                f"agent once without VECTOR_SIDECAR_SOCKET."
+            )
+        store = FAISS.load_local(
+            str(self.index_dir), self.embeddings, allow_dangerous_deserialization=True
+        )
+        version = fingerprint_index(self.index_dir)
+        print(f"System Log: Sidecar loaded index {version} ({store.index.ntotal} vectors)")
+        return store, version
+
+    def reload(self) -> dict:
+        with self._reload_lock:
+            store, version = self._load()
+            # Single reference swap — searches already running keep the old store
+            self.store, self.version = store, version
+        return self.info()
+
+    def info(self) -> dict:
+        return {
+            "version":  self.version,
+            "ntotal":   int(self.store.index.ntotal),
+            "dim":      int(self.store.index.d),
+            "batching": self.embeddings.snapshot(),
+        }
+
+    # ── ops ─────────────────────────────────────────────────
+
+    def _embed(self, payload: bytes) -> bytes:
+        texts   = _decode_texts(payload)
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype="<f4")
+        dim     = vectors.shape[1] if vectors.size else 0
+        return _PAIR.pack(len(texts), dim) + vectors.tobytes()
+
+    def _search(self, payload: bytes) -> bytes:
+        k, dim = _PAIR.unpack_from(payload, 0)
+        query  = np.frombuffer(payload, dtype="<f4", count=dim, offset=_PAIR.size)
+        tail   = payload[_PAIR.size + 4 * dim:]
+        spec   = json.loads(tail) if tail else None
+
+        store, version = self.store, self.version
+        scores, rows = search_rows(store.index, columns_for(store), query, k, spec)
+
+        rows   = rows.astype("<i8")
+        scores = scores.astype("<f4")
+        tag    = version.encode("ascii")
+        return (
+            struct.pack("!B", len(tag)) + tag + _U32.pack(len(rows))
+            + rows.tobytes() + scores.tobytes()
+        )
+
+    def dispatch(self, op: int, payload: bytes) -> bytes:
+        if op == OP_EMBED:
+            return self._embed(payload)
+        if op == OP_SEARCH:
+            return self._search(payload)
+        if op == OP_INFO:
+            return json.dumps(self.info()).encode()
+        if op == OP_RELOAD:
+            return json.dumps(self.reload()).encode()
+        raise ValueError(f"unknown op {op}")
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        sidecar = self.server.sidecar
+        while True:
+            try:
+                op, payload = _recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            try:
+                _send_frame(self.request, STATUS_OK, sidecar.dispatch(op, payload))
+            except Exception as e:
+                _send_frame(self.request, STATUS_ERROR, str(e).encode())
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path: str, index_dir: Path = FAISS_INDEX_DIR) -> None:
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    sidecar = VectorSidecar(index_dir)
+    with _Server(socket_path, _Handler) as server:
+        server.sidecar = sidecar
+        print(f"System Log: Vector sidecar listening on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
+
+# ============================================================
+# Client
+# ============================================================
+
+class SidecarError(RuntimeError):
+    pass
+
+
+class SidecarClient:
+    """One persistent connection per calling thread; reconnects once on a dropped socket."""
+
+    def __init__(self, socket_path: str, timeout: float = SIDECAR_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout     = timeout
+        self._local      = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _drop(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _call(self, op: int, payload: bytes = b"") -> bytes:
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                _send_frame(sock, op, payload)
+                status, body = _recv_frame(sock)
+                break
+            except (ConnectionError, OSError):
+                self._drop()
+                if attempt:
+                    raise
+        if status != STATUS_OK:
+            raise SidecarError(body.decode("utf-8", "replace"))
+        return body
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        body = self._call(OP_EMBED, _encode_texts(texts))
+        count, dim = _PAIR.unpack_from(body, 0)
+        return np.frombuffer(body, dtype="<f4", count=count * dim, offset=_PAIR.size).reshape(count, dim)
+
+    def search(self, vector, k: int, spec: dict | None = None) -> tuple[str, np.ndarray, np.ndarray]:
+        query   = np.asarray(vector, dtype="<f4")
+        payload = _PAIR.pack(k, query.shape[0]) + query.tobytes()
+        if spec:
+            payload += json.dumps(spec).encode()
+        body = self._call(OP_SEARCH, payload)
+
+        vlen    = body[0]
+        version = body[1:1 + vlen].decode("ascii")
+        offset  = 1 + vlen
+        (n,)    = _U32.unpack_from(body, offset)
+        offset += _U32.size
+        rows    = np.frombuffer(body, dtype="<i8", count=n, offset=offset)
+        scores  = np.frombuffer(body, dtype="<f4", count=n, offset=offset + 8 * n)
+        return version, rows, scores
+
+    def info(self) -> dict:
+        return json.loads(self._call(OP_INFO))
+
+    def reload(self) -> dict:
+        return json.loads(self._call(OP_RELOAD))
+
+
+class SidecarEmbeddings(Embeddings):
+    def __init__(self, client: SidecarClient):
+        self.client = client
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.client.embed([text])[0].tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.client.embed(list(texts)).tolist()
+
+
+class SidecarVectorStore:
+    """
+    The slice of the LangChain FAISS interface the agent uses, backed by the
+    sidecar's index and a local copy of the docstore.
+    """
+
+    def __init__(self, client: SidecarClient, index_dir: Path = FAISS_INDEX_DIR):
+        self.client    = client
+        self.index_dir = index_dir
+        self._lock     = threading.Lock()
+        self._load_docstore()
+
+    def _load_docstore(self) -> None:
+        with open(self.index_dir / "index.pkl", "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        self.docstore, self.index_to_docstore_id = docstore, index_to_docstore_id
+        self.version = fingerprint_index(self.index_dir)
+
+    def _sync(self, version: str) -> None:
+        with self._lock:
+            if version == self.version:
+                return
+            self._load_docstore()
+            if version != self.version:
+                raise SidecarError(
+                    f"Sidecar serves index {version} but {self.index_dir} holds {self.version}"
+                )
+            print(f"System Log: Docstore reloaded for sidecar index {version}")
+
+    def similarity_search_with_score_by_vector(self, embedding, k: int = 4, **kwargs):
+        return self.filtered_search(embedding, k, None)
+
+    def filtered_search(self, vector, k: int, spec: dict | None) -> list:
+        version, rows, scores = self.client.search(vector, k, spec)
+        if version != self.version:
+            self._sync(version)
+        return [
+            (self.docstore.search(self.index_to_docstore_id[int(row)]), float(score))
+            for row, score in zip(rows, scores)
+        ]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs):
+        vector = self.client.embed([query])[0]
+        return self.similarity_search_with_score_by_vector(vector, k)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared embedding + FAISS search sidecar")
+    parser.add_argument("--socket", default=os.getenv("VECTOR_SIDECAR_SOCKET", "/tmp/inspire-vectors.sock"))
+    parser.add_argument("--index-dir", type=Path, default=FAISS_INDEX_DIR)
+    args = parser.parse_args()
+    serve(args.socket, args.index_dir)
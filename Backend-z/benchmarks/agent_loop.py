@@ -0,0 +1,228 @@
+"""
+Offline agent-loop benchmark: run_agent end to end with no Groq or Tavily.
+
+ChatGroq is replaced by a stand-in that replays the recorded tool-call /
+answer steps of each query in benchmarks/agent_corpus.json, sleeping each
+step's recorded latency (scaled by --llm-latency-scale); web_search hits a
+fake Tavily with a fixed latency. The archive tools, local router,
+speculation and trace recording run for real against the local index.
+
+Per query the trace gives rounds, LLM time and tool time; whatever is left
+of the wall time is Python overhead (prompt assembly, routing, formatting,
+bookkeeping) — the part this benchmark guards.
+
+    cd Backend-z
+    python -m benchmarks.agent_loop --repeat 5 --save-baseline agent_baseline.json
+    python -m benchmarks.agent_loop --baseline agent_baseline.json --max-regression 0.25
+
+Exits non-zero when a metric regresses by more than --max-regression
+against the baseline, or overhead p95 exceeds --max-overhead-ms.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ai.tokens import count_tokens
+
+CORPUS_PATH   = Path(__file__).parent / "agent_corpus.json"
+NOISE_FLOOR_MS = 1.0   # ms differences below this are never a regression
+
+
+class FakeChatGroq:
+    """
+    Stands in for ChatGroq(...).bind_tools(...). Every engine of a run
+    replays the same script: the step index is the number of LLM turns
+    already in the conversation, and a leading tool step already answered
+    by the local router is skipped, as the real model would.
+    """
+
+    script: list        = []
+    latency_scale: float = 1.0
+
+    def __init__(self, **kwargs):
+        self.model = kwargs.get("model")
+
+    def bind_tools(self, tools, tool_choice=None):
+        return self
+
+    def invoke(self, messages: list) -> AIMessage:
+        turns  = [m for m in messages if isinstance(m, AIMessage)]
+        routed = [tc["name"] for m in turns for tc in m.tool_calls if tc["id"].startswith("routed_")]
+        steps  = self.script
+        if routed and steps and [tc["name"] for tc in steps[0].get("tool_calls", [])] == routed:
+            steps = steps[1:]
+
+        llm_turns = len(turns) - (1 if routed else 0)
+        step      = steps[llm_turns] if llm_turns < len(steps) else steps[-1]
+        time.sleep(step.get("latency_ms", 0) * self.latency_scale / 1000)
+
+        tool_calls = [
+            {"name": tc["name"], "args": tc["args"], "id": f"call_{llm_turns}_{i}"}
+            for i, tc in enumerate(step.get("tool_calls", []))
+        ] if llm_turns < len(steps) else []
+        content = step.get("content", "") if not tool_calls else ""
+        if llm_turns >= len(steps) and not content:
+            content = "Summary of the retrieved results."
+
+        return AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens":  sum(count_tokens(str(m.content)) for m in messages),
+                "output_tokens": count_tokens(content) + 20 * len(tool_calls),
+                "total_tokens":  0,
+            },
+        )
+
+
+class FakeTavily:
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+
+    def invoke(self, query: str) -> dict:
+        time.sleep(self.latency_ms / 1000)
+        slug = "-".join(query.lower().split()[:6])
+        return {"results": [
+            {
+                "title":   f"{query.title()} — survey {i}",
+                "url":     f"https://example.org/{slug}/{i}",
+                "content": f"Recent work on {query} reports state-of-the-art results on public benchmarks. " * 4,
+            }
+            for i in range(4)
+        ]}
+
+
+def load_agent(tavily_latency_ms: float):
+    """Import the agent with placeholder keys and its network edges swapped out."""
+    os.environ.setdefault("TAVILY_API_KEY", "offline-benchmark")
+    os.environ.setdefault("GROQ_API_KEY_1", "offline-benchmark")
+    os.environ["AGENT_TRACE_PERSIST"] = "0"
+    os.environ["INDEX_SYNC_SECONDS"]  = "0"   # no Mongo to follow reloads from
+
+    from ai import fydp_agent
+    fydp_agent.ChatGroq                 = FakeChatGroq
+    fydp_agent._tavily_search           = FakeTavily(tavily_latency_ms)
+    fydp_agent._directory_advisor_names = lambda: []
+    return fydp_agent
+
+
+def run_query(agent, entry: dict) -> dict:
+    traces: list = []
+    agent.submit_trace  = traces.append
+    FakeChatGroq.script = entry["steps"]
+
+    agent.run_agent([HumanMessage(content=entry["query"])])
+    trace = traces[-1]
+
+    llm_ms  = sum(r.get("llm_ms") or 0 for r in trace["rounds"])
+    tool_ms = sum(tc.get("ms") or 0 for r in trace["rounds"] for tc in r["tool_calls"])
+    return {
+        "rounds":      trace["rounds_used"],
+        "total_ms":    trace["total_ms"],
+        "llm_ms":      llm_ms,
+        "tool_ms":     tool_ms,
+        "overhead_ms": trace["total_ms"] - llm_ms - tool_ms,
+        "routed":      trace["routed"],
+    }
+
+
+def _pct(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(runs: list) -> dict:
+    return {
+        "total_p50_ms":    statistics.median(r["total_ms"] for r in runs),
+        "total_p95_ms":    _pct([r["total_ms"] for r in runs], 95),
+        "overhead_p50_ms": statistics.median(r["overhead_ms"] for r in runs),
+        "overhead_p95_ms": _pct([r["overhead_ms"] for r in runs], 95),
+        "tool_p50_ms":     statistics.median(r["tool_ms"] for r in runs),
+        "rounds_mean":     statistics.mean(r["rounds"] for r in runs),
+    }
+
+
+def regressions(current: dict, baseline: dict, max_regression: float) -> list:
+    found = []
+    for metric, value in current.items():
+        base = baseline.get(metric)
+        if base is None:
+            continue
+        if metric == "rounds_mean":
+            if value > base + 0.01:
+                found.append(f"{metric}: {base:.2f} -> {value:.2f}")
+        elif value > base * (1 + max_regression) and value - base > NOISE_FLOOR_MS:
+            found.append(f"{metric}: {base:.2f} -> {value:.2f} ms (+{(value / base - 1) * 100:.0f}%)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--llm-latency-scale", type=float, default=0.0,
+                        help="Multiplier on recorded LLM step latency (0 = measure overhead only)")
+    parser.add_argument("--tavily-latency-ms", type=float, default=0.0)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--max-overhead-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    corpus = json.loads(args.corpus.read_text(encoding="utf-8"))
+    FakeChatGroq.latency_scale = args.llm_latency_scale
+    agent = load_agent(args.tavily_latency_ms)
+
+    for entry in corpus:   # warm-up: model, index facts, query-vector caches
+        run_query(agent, entry)
+
+    runs: list = []
+    per_query: dict = {}
+    for _ in range(args.repeat):
+        for entry in corpus:
+            r = run_query(agent, entry)
+            runs.append(r)
+            per_query.setdefault(entry["query"], []).append(r)
+
+    print(f"\n{len(corpus)} queries x {args.repeat} runs, LLM latency x{args.llm_latency_scale}\n")
+    print(f"{'query':<58} {'rounds':>6} {'total':>9} {'llm':>9} {'tools':>9} {'python':>9}")
+    for query, rs in per_query.items():
+        med = {k: statistics.median(r[k] for r in rs) for k in ("rounds", "total_ms", "llm_ms", "tool_ms", "overhead_ms")}
+        label = (query[:55] + "...") if len(query) > 58 else query
+        print(f"{label:<58} {med['rounds']:>6.0f} {med['total_ms']:>7.1f}ms {med['llm_ms']:>7.1f}ms "
+              f"{med['tool_ms']:>7.1f}ms {med['overhead_ms']:>7.1f}ms"
+              + ("  (routed)" if rs[0]["routed"] else ""))
+
+    summary = summarize(runs)
+    print()
+    for metric, value in summary.items():
+        print(f"{metric:<16} {value:>9.2f}")
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    failures = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        failures += regressions(summary, baseline, args.max_regression)
+    if args.max_overhead_ms is not None and summary["overhead_p95_ms"] > args.max_overhead_ms:
+        failures.append(f"overhead_p95_ms {summary['overhead_p95_ms']:.2f} > {args.max_overhead_ms} ms")
+
+    if failures:
+        print("\nFAIL: regression over threshold")
+        for f in failures:
+            print(f"  {f}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
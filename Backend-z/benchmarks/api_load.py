@@ -0,0 +1,207 @@
+"""
+API load test: throughput and tail latency at 200 concurrent users
+against a running server.
+
+Each virtual user signs in once (setup, not timed), then loops over a
+weighted mix of requests until --duration runs out:
+
+  --scenario student   the pages a student dashboard loads — stages,
+                       invites, group members, own profile, advisors with
+                       slot counts, past projects
+  --scenario signin    a login burst: every user signs in over and over
+                       (bcrypt verification on each call)
+
+/health is in both mixes as a canary: it does no I/O, so its tail latency
+is pure time spent waiting for the event loop. 503s from the password
+hashing pool shedding load are counted apart from errors.
+
+Run it once on the commit before a change and once after, against the
+same database:
+
+    cd Backend-z
+    uvicorn main:app --port 8000            # in another shell
+    python -m benchmarks.api_load --users 200 --save before.json
+    python -m benchmarks.api_load --users 200 --compare before.json
+    python -m benchmarks.api_load --scenario signin --users 200 --duration 30
+
+Test accounts (loadtest-<i>@load.test) are created through /auth/signup
+on first use; point --base-url at a development database.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+
+PASSWORD = "load-test-password"
+
+# (endpoint label, method, path template, weight); {user_id} is the signed-in user
+SCENARIOS = {
+    "student": [
+        ("my-stages",       "GET",  "/my-stages",                 4),
+        ("invites/me",      "GET",  "/invites/me",                3),
+        ("sent-invites/me", "GET",  "/sent-invites/me",           2),
+        ("group/members",   "GET",  "/group/members",             3),
+        ("profile",         "GET",  "/profiles/{user_id}",        3),
+        ("advisors/all",    "GET",  "/advisors/all",              2),
+        ("projects",        "GET",  "/projects/?page=1&limit=10", 2),
+        ("health",          "GET",  "/health",                    1),
+    ],
+    "signin": [
+        ("signin",          "POST", "/auth/signin/",              9),
+        ("health",          "GET",  "/health",                    1),
+    ],
+}
+
+
+def _user_id(token: str) -> str:
+    """`sub` from the JWT payload (no verification needed client-side)."""
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload))["sub"]
+
+
+async def _sign_in(client: httpx.AsyncClient, i: int, gate: asyncio.Semaphore) -> dict:
+    gsuite_id = f"loadtest-{i}@load.test"
+    async with gate:
+        await client.post("/auth/signup/", json={"gsuite_id": gsuite_id, "password": PASSWORD, "role": "student"})
+        res = await client.post("/auth/signin/", json={"gsuite_id": gsuite_id, "password": PASSWORD})
+    res.raise_for_status()
+    token = res.json()["access_token"]
+    return {"token": token, "user_id": _user_id(token), "gsuite_id": gsuite_id}
+
+
+async def _virtual_user(client: httpx.AsyncClient, account: dict, mix: list, deadline: float,
+                        samples: dict, errors: dict, shed: dict, rng: random.Random):
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    login   = {"gsuite_id": account["gsuite_id"], "password": PASSWORD}
+    labels  = [m[0] for m in mix]
+    routes  = {m[0]: (m[1], m[2]) for m in mix}
+    weights = [m[3] for m in mix]
+    while time.perf_counter() < deadline:
+        label        = rng.choices(labels, weights)[0]
+        method, path = routes[label]
+        start = time.perf_counter()
+        try:
+            if method == "POST":
+                res = await client.post(path, json=login)
+            else:
+                res = await client.get(path.format(user_id=account["user_id"]), headers=headers)
+            failed = res.status_code >= 500 and res.status_code != 503
+            if res.status_code == 503:
+                shed[label] = shed.get(label, 0) + 1
+        except httpx.HTTPError:
+            failed = True
+        samples.setdefault(label, []).append((time.perf_counter() - start) * 1000)
+        if failed:
+            errors[label] = errors.get(label, 0) + 1
+
+
+def _pct(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _stats(latencies: list) -> dict:
+    return {
+        "requests": len(latencies),
+        "p50_ms":   statistics.median(latencies),
+        "p95_ms":   _pct(latencies, 95),
+        "p99_ms":   _pct(latencies, 99),
+        "max_ms":   max(latencies),
+    }
+
+
+async def run_load(base_url: str, scenario: str, users: int, duration: float, warmup: float, seed: int) -> dict:
+    mix    = SCENARIOS[scenario]
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        gate     = asyncio.Semaphore(16)
+        accounts = await asyncio.gather(*(_sign_in(client, i, gate) for i in range(users)))
+        print(f"System Log: {users} users signed in")
+
+        if warmup > 0:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(
+                _virtual_user(client, a, mix, deadline, {}, {}, {}, random.Random(seed + i))
+                for i, a in enumerate(accounts)
+            ))
+
+        samples: dict = {}
+        errors: dict  = {}
+        shed: dict    = {}
+        start    = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            _virtual_user(client, a, mix, deadline, samples, errors, shed, random.Random(seed + i))
+            for i, a in enumerate(accounts)
+        ))
+        wall = time.perf_counter() - start
+
+    everything = [ms for values in samples.values() for ms in values]
+    return {
+        "scenario":   scenario,
+        "users":      users,
+        "duration_s": wall,
+        "rps":        len(everything) / wall,
+        "errors":     sum(errors.values()),
+        "shed":       sum(shed.values()),
+        "overall":    _stats(everything),
+        "endpoints":  {
+            label: {**_stats(v), "errors": errors.get(label, 0), "shed": shed.get(label, 0)}
+            for label, v in sorted(samples.items())
+        },
+    }
+
+
+def _print_result(result: dict):
+    o = result["overall"]
+    print(f"\n{result['scenario']}: {result['users']} users, {result['duration_s']:.0f}s: {result['rps']:.1f} req/s, "
+          f"{o['requests']} requests, {result['errors']} errors (5xx / transport), {result['shed']} shed (503)")
+    print(f"overall  p50 {o['p50_ms']:.1f} ms  p95 {o['p95_ms']:.1f} ms  p99 {o['p99_ms']:.1f} ms  max {o['max_ms']:.1f} ms\n")
+    print(f"{'endpoint':<16} {'requests':>8} {'req/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'shed':>6}")
+    for label, s in result["endpoints"].items():
+        print(f"{label:<16} {s['requests']:>8} {s['requests'] / result['duration_s']:>7.1f} {s['p50_ms']:>9.1f} "
+              f"{s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['errors']:>7} {s['shed']:>6}")
+
+
+def _print_comparison(before: dict, after: dict):
+    print(f"\n{'':<16} {'before':>10} {'after':>10} {'change':>8}")
+    rows = [("req/s", before["rps"], after["rps"])]
+    rows += [(k.replace("_ms", ""), before["overall"][k], after["overall"][k]) for k in ("p50_ms", "p95_ms", "p99_ms")]
+    if "health" in before["endpoints"] and "health" in after["endpoints"]:
+        rows.append(("health p99", before["endpoints"]["health"]["p99_ms"], after["endpoints"]["health"]["p99_ms"]))
+    for name, b, a in rows:
+        print(f"{name:<16} {b:>10.1f} {a:>10.1f} {(a / b - 1) * 100 if b else 0:>+7.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="student")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=60, help="timed seconds")
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", type=Path, default=None, help="write the result JSON here")
+    parser.add_argument("--compare", type=Path, default=None, help="result JSON of an earlier run")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load(args.base_url, args.scenario, args.users, args.duration, args.warmup, args.seed))
+    _print_result(result)
+
+    if args.save:
+        args.save.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"\nResult saved to {args.save}")
+    if args.compare:
+        _print_comparison(json.loads(args.compare.read_text(encoding="utf-8")), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Embedding throughput at 1, 8 and 64 concurrent callers, direct model calls
+vs. the micro-batching executor.
+
+    cd Backend-z
+    python -m benchmarks.embedding_throughput --requests 512
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ai.embeddings import (
+    BatchingEmbeddings, load_base_embeddings,
+    EMBED_BATCH_MAX, EMBED_BATCH_WAIT_MS, EMBED_TORCH_THREADS,
+)
+
+QUERIES = [
+    "drowsiness detection eye blink",
+    "sign language recognition cnn",
+    "iot air quality monitoring",
+    "federated learning edge privacy",
+    "urdu handwriting recognition",
+    "smart parking system sensors",
+    "crop disease detection leaves",
+    "blockchain voting system",
+]
+
+
+def run(embed_fn, concurrency: int, total: int) -> dict:
+    latencies = []
+
+    def one(i: int):
+        start = time.perf_counter()
+        embed_fn(f"{QUERIES[i % len(QUERIES)]} {i}")   # suffix defeats any caching
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "qps":    total / wall,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64])
+    args = parser.parse_args()
+
+    base    = load_base_embeddings()
+    batched = BatchingEmbeddings(base)
+    base.embed_query("warm up")
+
+    print(f"torch threads={EMBED_TORCH_THREADS}  batch max={EMBED_BATCH_MAX}  "
+          f"wait={EMBED_BATCH_WAIT_MS}ms  requests={args.requests}\n")
+    print(f"{'callers':>7} | {'mode':<8} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8}")
+    print("-" * 52)
+
+    for concurrency in args.concurrency:
+        for mode, fn in (("direct", base.embed_query), ("batched", batched.embed_query)):
+            r = run(fn, concurrency, args.requests)
+            print(f"{concurrency:>7} | {mode:<8} | {r['qps']:>8.1f} | "
+                  f"{r['p50_ms']:>8.1f} | {r['p95_ms']:>8.1f}")
+
+    print(f"\nbatcher stats: {batched.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Metadata-filtered search: exactness and cost.
+
+For every advisor, batch year and a batch range, the in-FAISS filtered
+top-k is compared against an exhaustive ranking filtered in Python (the
+ground truth), and its latency against an unfiltered search.
+
+    cd Backend-z
+    python -m benchmarks.filtered_search --k 6
+
+Exits non-zero if any filtered result differs from the ground truth.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+from ai.archive import batch_key, load_archive_documents, normalize_advisor
+from ai.embeddings import load_base_embeddings
+from ai.metadata_filter import filtered_search, make_filter
+from benchmarks.quantized_backends import IDEA_QUERIES
+
+
+def _allowed(doc, spec: dict) -> bool:
+    md   = doc.metadata
+    year = batch_key(md.get("batch"))
+    if "advisor" in spec and normalize_advisor(spec["advisor"]) not in normalize_advisor(md.get("advisor")):
+        return False
+    if "batches" in spec and year not in spec["batches"]:
+        return False
+    if "batch_from" in spec and not (year.isdigit() and int(year) >= spec["batch_from"]):
+        return False
+    if "batch_to" in spec and not (year.isdigit() and int(year) <= spec["batch_to"]):
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--k", type=int, default=6)
+    args = parser.parse_args()
+
+    embeddings = load_base_embeddings()
+    documents  = load_archive_documents()
+    store = FAISS.from_documents(
+        documents, embeddings, distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+    )
+    vectors = np.asarray(embeddings.embed_documents(IDEA_QUERIES), dtype=np.float32)
+
+    years    = sorted({batch_key(d.metadata.get("batch")) for d in documents} - {"unknown"})
+    advisors = sorted({d.metadata.get("advisor", "Unknown") for d in documents})
+    specs  = [make_filter(advisor=a) for a in advisors]
+    specs += [make_filter(batches=[y]) for y in years]
+    specs += [make_filter(batch_from=int(years[1]), batch_to=int(years[-1]))] if len(years) > 1 else []
+
+    mismatches = 0
+    plain_ms, filtered_ms = [], []
+    total = len(store.index_to_docstore_id)
+
+    for vector in vectors:
+        vector = list(vector)
+        start = time.perf_counter()
+        store.similarity_search_with_score_by_vector(vector, k=args.k)
+        plain_ms.append((time.perf_counter() - start) * 1000)
+
+        ranking = store.similarity_search_with_score_by_vector(vector, k=total)
+        for spec in specs:
+            start = time.perf_counter()
+            got = filtered_search(store, vector, args.k, spec)
+            filtered_ms.append((time.perf_counter() - start) * 1000)
+
+            expected = [(d, s) for d, s in ranking if _allowed(d, spec)][:args.k]
+            if [d.page_content for d, _ in got] != [d.page_content for d, _ in expected]:
+                mismatches += 1
+                print(f"MISMATCH: {spec}")
+
+    print(f"\n{len(documents)} documents, {len(IDEA_QUERIES)} queries x {len(specs)} filters, k={args.k}\n")
+    for name, values in (("unfiltered", plain_ms), ("filtered", filtered_ms)):
+        values.sort()
+        print(f"{name:<10} p50 {statistics.median(values):.3f} ms   "
+              f"p99 {values[int(0.99 * (len(values) - 1))]:.3f} ms")
+
+    if mismatches:
+        print(f"\nFAIL: {mismatches} filtered searches differ from the exhaustive ranking")
+        sys.exit(1)
+    print("\nOK: filtered top-k identical to exhaustive filtering")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Chat history retrieval: does an old relevant turn come back in a long session?
+
+Builds a synthetic session of --turns turns (one topic per turn, user and
+assistant message embedded near the topic vector), folds all but the
+newest SUMMARY_KEEP_RECENT + 1 turns into the "summary", and asks a
+follow-up about the topic of turn --relevant-turn. The check passes when
+ai.history.rank_turns puts that turn first, an off-topic follow-up brings
+nothing back, and the summary is still flagged for the folded turns that
+were not retrieved. Also reports the ranking time for a --long-turns
+session at the bge embedding size.
+
+    cd Backend-z
+    python -m benchmarks.history_recall --turns 14 --relevant-turn 2
+
+Runs offline (no Mongo, no embedding model); exits non-zero on a failed check.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ai.history import HISTORY_MIN_SIM, needs_summary, rank_turns
+
+SUMMARY_KEEP_RECENT = 2     # as in routers/chat.py
+EMBED_DIM           = 768   # bge-base
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    return v / np.linalg.norm(v)
+
+
+def make_session(rng, n_turns: int, dim: int, noise: float = 0.35):
+    """(turn times, one time per message, message vectors, topic vector per turn)."""
+    base   = datetime(2026, 1, 1)
+    times  = [base + timedelta(minutes=i) for i in range(n_turns)]
+    topics = [_unit(rng.standard_normal(dim)) for _ in range(n_turns)]
+    msg_times, vectors = [], []
+    for t, topic in zip(times, topics):
+        for _ in ("user", "assistant"):
+            msg_times.append(t)
+            vectors.append(_unit(topic + noise * _unit(rng.standard_normal(dim))))
+    return times, msg_times, np.stack(vectors), topics
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=14)
+    parser.add_argument("--relevant-turn", type=int, default=2, help="1-based turn the follow-up is about")
+    parser.add_argument("--long-turns", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    times, msg_times, vectors, topics = make_session(rng, args.turns, 64)
+    latest  = times[-1]
+    until   = times[-(SUMMARY_KEEP_RECENT + 2)]
+    target  = times[args.relevant_turn - 1]
+    past    = [i for i, t in enumerate(msg_times) if t != latest]
+
+    on_topic  = _unit(topics[args.relevant_turn - 1] + 0.35 * _unit(rng.standard_normal(64)))
+    off_topic = _unit(rng.standard_normal(64))
+
+    ranked    = rank_turns([msg_times[i] for i in past], vectors[past], on_topic)
+    unrelated = rank_turns([msg_times[i] for i in past], vectors[past], off_topic)
+    sent      = [latest] + ranked
+    folded    = sum(1 for t in times if t <= until)
+
+    print(f"\n{args.turns}-turn session, {folded} turns folded into the summary, "
+          f"follow-up about turn {args.relevant_turn}")
+    print(f"  retrieved turns:       {[times.index(t) + 1 for t in ranked]}")
+    print(f"  off-topic retrieval:   {[times.index(t) + 1 for t in unrelated]}")
+    print(f"  summary still needed:  {needs_summary(times, sent, until)}")
+
+    failures = []
+    if not ranked or ranked[0] != target:
+        failures.append(f"turn {args.relevant_turn} was not ranked first")
+    if target <= until and target not in ranked:
+        failures.append("a summarized turn was not retrieved")
+    if unrelated:
+        failures.append(f"an off-topic follow-up retrieved turns above HISTORY_MIN_SIM={HISTORY_MIN_SIM}")
+    if folded > 1 and not needs_summary(times, sent, until):
+        failures.append("the summary was dropped while folded turns are missing")
+
+    _, long_times, long_vectors, _ = make_session(rng, args.long_turns, EMBED_DIM)
+    query = _unit(rng.standard_normal(EMBED_DIM))
+    runs  = []
+    for _ in range(20):
+        start = time.perf_counter()
+        rank_turns(long_times, long_vectors, query)
+        runs.append((time.perf_counter() - start) * 1000)
+    print(f"\nranking a {args.long_turns}-turn session ({2 * args.long_turns} messages, dim {EMBED_DIM}): "
+          f"p50 {statistics.median(runs):.2f} ms")
+
+    if failures:
+        print("\nFAIL")
+        for f in failures:
+            print(f"  {f}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Local intent router: routing precision and coverage per threshold pair.
+
+Every query in benchmarks/intent_queries.json carries the intent it should
+route to ("chat" = leave the turn to the LLM). Each query is classified
+once with classify_intent; the sweep then applies every (INTENT_MIN_SIM,
+INTENT_MARGIN) pair to those scores:
+
+    precision  routed queries sent to their labelled tool / all routed queries
+    coverage   routed queries sent to their labelled tool / all tool-labelled queries
+
+A misroute costs a wasted tool round and an answer built on the wrong
+results; an unrouted query only costs the round-0 LLM call, so the
+recommended pair is the one with the highest coverage whose precision
+stays at or above --min-precision (ties go to the stricter pair).
+
+    cd Backend-z
+    python -m benchmarks.intent_routing --min-precision 0.95
+
+Exits non-zero when the configured thresholds route below --min-precision.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.agent_loop import load_agent
+
+QUERIES_PATH = Path(__file__).parent / "intent_queries.json"
+
+MIN_SIM_GRID = [round(x, 2) for x in np.arange(0.70, 0.905, 0.01)]
+MARGIN_GRID  = [round(x, 2) for x in np.arange(0.00, 0.085, 0.01)]
+
+
+def score(classified: list, min_sim: float, margin: float) -> dict:
+    """classified: (label, intent, sim, margin) per query."""
+    routed  = [(label, intent) for label, intent, s, m in classified
+               if intent != "chat" and s >= min_sim and m >= margin]
+    correct = sum(1 for label, intent in routed if label == intent)
+    tools   = sum(1 for label, *_ in classified if label != "chat")
+    return {
+        "min_sim":   min_sim,
+        "margin":    margin,
+        "routed":    len(routed),
+        "precision": correct / len(routed) if routed else 1.0,
+        "coverage":  correct / tools if tools else 0.0,
+    }
+
+
+def _row(r: dict, note: str = "") -> str:
+    return (f"{r['min_sim']:>8.2f} {r['margin']:>7.2f} {r['routed']:>7} "
+            f"{r['precision']:>10.3f} {r['coverage']:>9.3f}  {note}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=Path, default=QUERIES_PATH)
+    parser.add_argument("--min-precision", type=float, default=0.95)
+    args = parser.parse_args()
+
+    queries = json.loads(args.queries.read_text(encoding="utf-8"))
+    agent   = load_agent(tavily_latency_ms=0.0)
+
+    classified = []
+    for q in queries:
+        intent, sim, margin = agent.classify_intent(q["query"])
+        classified.append((q["intent"], intent, sim, margin))
+
+    configured = score(classified, agent.INTENT_MIN_SIM, agent.INTENT_MARGIN)
+    sweep      = [score(classified, s, m) for s in MIN_SIM_GRID for m in MARGIN_GRID]
+    eligible   = [r for r in sweep if r["precision"] >= args.min_precision]
+    best       = max(eligible, key=lambda r: (r["coverage"], r["min_sim"], r["margin"])) if eligible else None
+
+    counts: dict = {}
+    for q in queries:
+        counts[q["intent"]] = counts.get(q["intent"], 0) + 1
+    print(f"\n{len(queries)} labelled queries ({', '.join(f'{k}: {n}' for k, n in sorted(counts.items()))})")
+    print("best margin per min_sim:\n")
+    print(f"{'min_sim':>8} {'margin':>7} {'routed':>7} {'precision':>10} {'coverage':>9}")
+    for s in MIN_SIM_GRID:
+        r = max((r for r in sweep if r["min_sim"] == s),
+                key=lambda r: (r["precision"] >= args.min_precision, r["coverage"], r["margin"]))
+        print(_row(r))
+    print()
+    print(_row(configured, "configured"))
+    if best:
+        print(_row(best, f"recommended (highest coverage at precision >= {args.min_precision})"))
+
+    misroutes = [(q["query"], label, intent, sim, margin)
+                 for q, (label, intent, sim, margin) in zip(queries, classified)
+                 if intent != "chat" and intent != label
+                 and sim >= agent.INTENT_MIN_SIM and margin >= agent.INTENT_MARGIN]
+    if misroutes:
+        print("\nMisrouted at the configured thresholds:")
+        for query, label, intent, sim, margin in misroutes:
+            print(f"  {query[:55]:<55} {label} -> {intent} (sim {sim:.3f}, margin {margin:.3f})")
+
+    if configured["precision"] < args.min_precision:
+        print(f"\nFAIL: configured precision {configured['precision']:.3f} < {args.min_precision}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
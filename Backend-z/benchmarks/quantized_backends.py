@@ -0,0 +1,136 @@
+"""
+Recall@k, latency and memory of each embedding backend against the fp32
+archive index.
+
+Documents are embedded once with the fp32 torch model (that is what the
+saved index holds); each backend then embeds the query set and its top-k
+archive hits are compared with the fp32 query's top-k. Every backend runs
+in its own process so peak RSS is per backend.
+
+    cd Backend-z
+    python -m benchmarks.quantized_backends --k 10 --min-recall 0.95
+
+Exits non-zero if any backend falls below --min-recall.
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from ai.archive import load_archive_documents
+
+IDEA_QUERIES = [
+    "drowsiness detection eye blink",
+    "sign language recognition cnn",
+    "iot air quality monitoring",
+    "federated learning edge privacy",
+    "urdu handwriting recognition",
+    "smart parking system sensors",
+    "crop disease detection leaves",
+    "blockchain voting system",
+    "chatbot for university admissions",
+    "fake news detection transformers",
+]
+
+
+def _worker(backend: str, queries: list, docs: list | None, conn) -> None:
+    from ai.embeddings import load_base_embeddings
+
+    start = time.perf_counter()
+    model = load_base_embeddings(backend)
+    load_s = time.perf_counter() - start
+    model.embed_query("warm up")
+
+    latencies, vectors = [], []
+    for q in queries:
+        t = time.perf_counter()
+        vectors.append(model.embed_query(q))
+        latencies.append((time.perf_counter() - t) * 1000)
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # before bulk doc batches
+    doc_vectors = np.asarray(model.embed_documents(docs), dtype=np.float32) if docs else None
+
+    latencies.sort()
+    conn.send({
+        "load_s":      load_s,
+        "p50_ms":      statistics.median(latencies),
+        "p95_ms":      latencies[int(0.95 * (len(latencies) - 1))],
+        "peak_rss_mb": peak_rss_mb,
+        "queries":     np.asarray(vectors, dtype=np.float32),
+        "docs":        doc_vectors,
+    })
+    conn.close()
+
+
+def _run_backend(backend: str, queries: list, docs: list | None) -> dict:
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_worker, args=(backend, queries, docs, child))
+    proc.start()
+    child.close()   # so a crashed worker surfaces as EOFError instead of a hang
+    result = parent.recv()
+    proc.join()
+    return result
+
+
+def _top_k(query_vectors: np.ndarray, doc_vectors: np.ndarray, k: int) -> np.ndarray:
+    scores = query_vectors @ doc_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["int8", "onnx"])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    args = parser.parse_args()
+
+    documents = load_archive_documents()
+    docs      = [d.page_content for d in documents]
+    queries   = IDEA_QUERIES + [d.metadata["title"] for d in documents]
+    k         = min(args.k, len(docs))
+
+    print(f"{len(docs)} archive documents, {len(queries)} queries, k={k}\n")
+
+    baseline = _run_backend("torch", queries, docs)
+    expected = _top_k(baseline["queries"], baseline["docs"], k)
+
+    print(f"{'backend':<7} | {'recall@k':>8} | {'top-1':>6} | {'p50 ms':>7} | "
+          f"{'p95 ms':>7} | {'load s':>6} | {'peak MB':>8}")
+    print("-" * 66)
+
+    def row(name: str, r: dict, recall: float, top1: float):
+        print(f"{name:<7} | {recall:>8.4f} | {top1:>6.3f} | {r['p50_ms']:>7.2f} | "
+              f"{r['p95_ms']:>7.2f} | {r['load_s']:>6.1f} | {r['peak_rss_mb']:>8.0f}")
+
+    row("torch", baseline, 1.0, 1.0)
+
+    failed = []
+    for backend in args.backends:
+        try:
+            r = _run_backend(backend, queries, None)
+        except Exception as e:
+            print(f"{backend:<7} | unavailable: {e}")
+            failed.append(backend)
+            continue
+
+        got    = _top_k(r["queries"], baseline["docs"], k)
+        recall = float(np.mean([len(set(g) & set(e)) / k for g, e in zip(got, expected)]))
+        top1   = float(np.mean(got[:, 0] == expected[:, 0]))
+        row(backend, r, recall, top1)
+        if recall < args.min_recall:
+            failed.append(backend)
+
+    if failed:
+        print(f"\nFAIL: below recall@{k} {args.min_recall} or not loadable: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\nOK: every backend keeps recall@{k} >= {args.min_recall}")
+
+
+if __name__ == "__main__":
+    main()
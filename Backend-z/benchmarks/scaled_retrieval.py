@@ -0,0 +1,317 @@
+"""
+Retrieval at archive scale: index build time, memory and p50/p99 latency of
+archive_search, rank_advisors and advisor_portfolio over synthetic
+archives of 10k, 100k and 1M projects.
+
+Each size runs in its own process (so peak RSS is per size): the synthetic
+archive is generated (or reused) with benchmarks/synthetic_archive.py,
+embedded and indexed, and swapped in as the agent's vector store. Cold
+costs that grow with the archive — per-document facts, topic clusters,
+the advisor resolver — are reported separately from the steady-state
+latencies.
+
+Embedding 1M documents with the real model takes hours on a CPU, so by
+default documents and queries are embedded with a hashing bag-of-words
+embedder (same 768 dimensions, shared words give high similarity). It
+keeps FAISS, the docstore and everything downstream at true scale;
+--embedder model uses the configured model instead.
+
+Bag-of-words scores are lower than bge's, so with the hashing embedder the
+archive and advisor cutoffs are scaled down until every benchmark query's
+best match clears them; otherwise archive_search would time its zero-hit
+fallback instead of the production path. The top-1 score of each query
+and the cutoffs used are printed per size (--keep-cutoffs disables the
+scaling).
+
+    cd Backend-z
+    python -m benchmarks.scaled_retrieval --sizes 10000 100000 1000000
+
+Memory: documents are embedded and added to FAISS in chunks of
+EMBED_CHUNK, so the float32 vectors (~3 GB at 1M projects) are held once,
+inside the index, plus the docstore.
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import re
+import resource
+import statistics
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from benchmarks.quantized_backends import IDEA_QUERIES
+from benchmarks.synthetic_archive import load_or_generate
+
+EMBED_DIM   = 768
+EMBED_CHUNK = 4096
+_TOKEN      = re.compile(r"[a-z0-9]{3,}")
+
+RANK_IDEAS = [
+    "Driver drowsiness detection from eye blink rate on a Raspberry Pi",
+    "Crop disease detection from leaf images with transfer learning",
+    "IoT air quality monitoring network with pm2.5 sensors",
+    "Urdu handwriting recognition for scanned documents",
+    "Blockchain voting system with smart contracts",
+    "Fake news detection in Urdu news using transformers",
+]
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic bag-of-words embedding: each token hashes to a fixed random unit vector."""
+
+    def __init__(self, dim: int = EMBED_DIM):
+        self.dim     = dim
+        self._vocab: dict = {}
+        self._rows   = np.empty((0, dim), dtype=np.float32)
+
+    def _token_ids(self, text: str) -> list:
+        ids, new = [], []
+        for tok in _TOKEN.findall(text.lower()):
+            idx = self._vocab.get(tok)
+            if idx is None:
+                idx = self._vocab[tok] = len(self._vocab)
+                new.append(tok)
+            ids.append(idx)
+        if new:
+            fresh = np.stack([
+                np.random.default_rng(zlib.crc32(t.encode())).standard_normal(self.dim).astype(np.float32)
+                for t in new
+            ])
+            self._rows = np.vstack([self._rows, fresh / np.linalg.norm(fresh, axis=1, keepdims=True)])
+        return ids
+
+    def _embed(self, text: str) -> np.ndarray:
+        ids = self._token_ids(text)
+        if not ids:
+            return np.zeros(self.dim, dtype=np.float32)
+        vec = self._rows[ids].sum(axis=0)
+        return vec / np.linalg.norm(vec)
+
+    def embed_array(self, texts: list) -> np.ndarray:
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            out[i] = self._embed(t)
+        return out
+
+    def embed_documents(self, texts: list) -> list:
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> list:
+        return self._embed(text).tolist()
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def _latency(fn, inputs: list, calls: int, clear) -> dict:
+    samples = []
+    for i in range(calls):
+        clear()   # measure uncached query embedding + search every time
+        samples.append(_timed(fn, inputs[i % len(inputs)]))
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples),
+        "p99_ms": samples[min(len(samples) - 1, int(round(0.99 * (len(samples) - 1))))],
+    }
+
+
+def _portfolio_names(advisors: list, rng: random.Random) -> list:
+    """Roster names as students type them: titled, bare, surname-only, lower-case."""
+    names = []
+    for full in rng.sample(advisors, min(20, len(advisors))):
+        bare = full.split(". ")[-1]
+        names += [full, bare.lower(), bare.split()[-1]]
+    return names
+
+
+def _embed_chunk(embedder, texts: list) -> np.ndarray:
+    if isinstance(embedder, HashingEmbeddings):
+        return embedder.embed_array(texts)
+    return np.asarray(embedder.embed_documents(texts), dtype=np.float32)
+
+
+def _calibrate_cutoffs(agent, scale_down: bool) -> dict:
+    """Top-1 score per benchmark query; optionally scale the cutoffs so every query clears them."""
+    top1 = {
+        "archive_search": {q: float(agent._vector_search(q, 1)[0][1]) for q in IDEA_QUERIES},
+        "rank_advisors":  {q: float(agent._vector_search(q, 1)[0][1]) for q in RANK_IDEAS},
+    }
+    if scale_down:
+        lowest = min(min(v.values()) for v in top1.values())
+        scale  = min(1.0, 0.95 * lowest / agent.ARCHIVE_SCORE_CUTOFF)
+        agent.ARCHIVE_SCORE_CUTOFF *= scale
+        agent.ADVISOR_SCORE_CUTOFF *= scale
+    cutoffs = {"archive_search": agent.ARCHIVE_SCORE_CUTOFF, "rank_advisors": agent.ADVISOR_SCORE_CUTOFF}
+    return {
+        "cutoffs": cutoffs,
+        "top1":    top1,
+        "cleared": {tool: sum(v >= cutoffs[tool] for v in scores.values()) for tool, scores in top1.items()},
+    }
+
+
+def _worker(size: int, work_dir: Path, embedder_kind: str, calls: int, keep_cutoffs: bool, conn) -> None:
+    os.environ.setdefault("TAVILY_API_KEY", "offline-benchmark")
+    os.environ.setdefault("GROQ_API_KEY_1", "offline-benchmark")
+    os.environ["AGENT_TRACE_PERSIST"] = "0"
+    os.environ["INDEX_SYNC_SECONDS"]  = "0"   # no Mongo to follow reloads from
+
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+    from langchain_community.vectorstores.utils import DistanceStrategy
+
+    from ai import fydp_agent as agent
+    from ai.archive import load_archive_documents
+
+    data_dir = work_dir / f"synthetic_{size}"
+    manifest = load_or_generate(size, data_dir)
+    embedder = HashingEmbeddings() if embedder_kind == "hashing" else agent.embedding_model
+
+    rss_before = _rss_mb()
+    start      = time.perf_counter()
+    documents  = load_archive_documents(data_dir)
+    load_s     = time.perf_counter() - start
+
+    # Chunk by chunk: only one chunk of vectors exists outside the index at a time
+    store = FAISS(
+        embedding_function=embedder, index=faiss.IndexFlatIP(EMBED_DIM),
+        docstore=InMemoryDocstore(), index_to_docstore_id={},
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+    )
+    embed_s = index_s = 0.0
+    for i in range(0, len(documents), EMBED_CHUNK):
+        chunk   = documents[i:i + EMBED_CHUNK]
+        texts   = [d.page_content for d in chunk]
+        start   = time.perf_counter()
+        vectors = _embed_chunk(embedder, texts)
+        embed_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.add_embeddings(zip(texts, vectors), metadatas=[d.metadata for d in chunk])
+        index_s += time.perf_counter() - start
+    del vectors, texts, chunk, documents
+    index_mb = _rss_mb() - rss_before
+
+    # Serve the synthetic archive through the agent's own retrieval core
+    agent.persistent_vectorstore   = store
+    agent.index_version            = f"synthetic-{size}-{embedder_kind}"
+    agent.embedding_model          = embedder
+    agent._directory_advisor_names = lambda: []
+    clear = agent._query_vector.cache_clear
+    calibration = _calibrate_cutoffs(agent, embedder_kind == "hashing" and not keep_cutoffs)
+
+    cold = {
+        "facts_ms":    _timed(agent.archive_facts),
+        "clusters_ms": _timed(agent._load_topic_clusters, agent.index_version, store),   # normally a background job
+        "resolver_ms": _timed(agent.advisor_resolver),
+    }
+    rng = random.Random(size)
+    names = _portfolio_names(manifest["advisors"], rng)
+    for fn, inputs in ((agent.search_archive, IDEA_QUERIES), (agent.rank_advisors_for, RANK_IDEAS),
+                       (agent.portfolio_for, names)):
+        fn(inputs[0])   # warm-up
+
+    conn.send({
+        "size":        size,
+        "load_s":      load_s,
+        "embed_s":     embed_s,
+        "index_s":     index_s,
+        "index_mb":    index_mb,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "cold":        cold,
+        "calibration": calibration,
+        "latency": {
+            "archive_search":    _latency(agent.search_archive, IDEA_QUERIES, calls, clear),
+            "rank_advisors":     _latency(agent.rank_advisors_for, RANK_IDEAS, calls, clear),
+            "advisor_portfolio": _latency(agent.portfolio_for, names, calls, clear),
+        },
+    })
+    conn.close()
+
+
+def _run_size(size: int, work_dir: Path, embedder: str, calls: int, keep_cutoffs: bool) -> dict:
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_worker, args=(size, work_dir, embedder, calls, keep_cutoffs, child))
+    proc.start()
+    child.close()   # so a crashed worker surfaces as EOFError instead of a hang
+    result = parent.recv()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--work-dir", type=Path, default=Path("/tmp/fydp_synthetic"))
+    parser.add_argument("--embedder", choices=["hashing", "model"], default="hashing")
+    parser.add_argument("--calls", type=int, default=200, help="timed calls per tool and size")
+    parser.add_argument("--keep-cutoffs", action="store_true",
+                        help="do not scale the score cutoffs down for the hashing embedder")
+    args = parser.parse_args()
+
+    results = []
+    for size in sorted(args.sizes):
+        print(f"System Log: {size} projects ...")
+        try:
+            results.append(_run_size(size, args.work_dir, args.embedder, args.calls, args.keep_cutoffs))
+        except (EOFError, MemoryError) as e:
+            print(f"System Log: {size} projects failed ({type(e).__name__}: {e}) — stopping here")
+            break
+
+    print(f"\nembedder: {args.embedder}, {args.calls} calls per tool\n")
+    print(f"{'projects':>9} | {'load s':>7} | {'embed s':>8} | {'index s':>7} | {'index MB':>8} | "
+          f"{'peak MB':>8} | {'facts ms':>9} | {'clusters ms':>11} | {'resolver ms':>11}")
+    print("-" * 104)
+    for r in results:
+        c = r["cold"]
+        print(f"{r['size']:>9} | {r['load_s']:>7.1f} | {r['embed_s']:>8.1f} | {r['index_s']:>7.1f} | "
+              f"{r['index_mb']:>8.0f} | {r['peak_rss_mb']:>8.0f} | {c['facts_ms']:>9.0f} | "
+              f"{c['clusters_ms']:>11.0f} | {c['resolver_ms']:>11.0f}")
+
+    print(f"\n{'tool':<18} " + " ".join(f"{r['size']:>22}" for r in results))
+    print(f"{'':<18} " + " ".join(f"{'p50 / p99 ms':>22}" for _ in results))
+    for tool in ("archive_search", "rank_advisors", "advisor_portfolio"):
+        cells = [f"{r['latency'][tool]['p50_ms']:.2f} / {r['latency'][tool]['p99_ms']:.2f}" for r in results]
+        print(f"{tool:<18} " + " ".join(f"{c:>22}" for c in cells))
+
+    # Queries below the cutoff time the zero-hit fallback, not the production path
+    for r in results:
+        cal = r["calibration"]
+        print(f"\n{r['size']} projects — top-1 score per query (cutoff in brackets)")
+        for tool in ("archive_search", "rank_advisors"):
+            scores = cal["top1"][tool]
+            print(f"  {tool} [{cal['cutoffs'][tool]:.3f}]: {cal['cleared'][tool]}/{len(scores)} clear")
+            for q, score in scores.items():
+                mark = "" if score >= cal["cutoffs"][tool] else "  <- below cutoff, times the fallback"
+                print(f"    {score:.3f}  {q[:60]}{mark}")
+
+    # Growth per step in size: ~size ratio means linear scans, well below means sublinear
+    for prev, cur in zip(results, results[1:]):
+        ratio = cur["size"] / prev["size"]
+        growth = ", ".join(
+            f"{tool} x{cur['latency'][tool]['p50_ms'] / max(prev['latency'][tool]['p50_ms'], 1e-6):.1f}"
+            for tool in cur["latency"]
+        )
+        print(f"\n{prev['size']} -> {cur['size']} (x{ratio:.0f} projects): p50 {growth}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Per-batch shards vs. one index: identical top-k, and search latency with
+and without a batch filter.
+
+Both layouts are built from the archive into a temporary directory (the
+served index is not touched), then every query's top-k documents and
+scores are compared.
+
+    cd Backend-z
+    python -m benchmarks.sharded_parity --k 6
+
+Exits non-zero if any query's results differ.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+from ai.archive import load_archive_documents
+from ai.embeddings import load_base_embeddings
+from ai.sharded_store import ShardedVectorStore
+from benchmarks.quantized_backends import IDEA_QUERIES
+
+SCORE_TOLERANCE = 1e-5
+
+
+def _key(doc) -> tuple:
+    return doc.metadata.get("source_file"), doc.metadata.get("title")
+
+
+def _timed_search(store, vector, k) -> tuple[list, float]:
+    start = time.perf_counter()
+    hits  = store.similarity_search_with_score_by_vector(vector, k=k)
+    return hits, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--k", type=int, default=6)
+    args = parser.parse_args()
+
+    embeddings = load_base_embeddings()
+    documents  = load_archive_documents()
+    queries    = IDEA_QUERIES + [d.metadata["title"] for d in documents]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = FAISS.from_documents(
+            documents, embeddings, distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+        sharded = ShardedVectorStore.build(Path(tmp) / "shards", documents, embeddings)
+
+    newest = list(sharded.shards)[-1]
+    vectors = np.asarray(embeddings.embed_documents(queries), dtype=np.float32)
+
+    mismatches = 0
+    timings: dict = {"single": [], "sharded": [], f"sharded batch={newest}": []}
+    for query, vector in zip(queries, vectors):
+        vector = list(vector)
+        a, t_single  = _timed_search(single, vector, args.k)
+        b, t_sharded = _timed_search(sharded, vector, args.k)
+        start = time.perf_counter()
+        sharded.filtered_search(vector, args.k, {"batches": [newest]})
+        t_filter = (time.perf_counter() - start) * 1000
+
+        timings["single"].append(t_single)
+        timings["sharded"].append(t_sharded)
+        timings[f"sharded batch={newest}"].append(t_filter)
+
+        same_docs   = [_key(d) for d, _ in a] == [_key(d) for d, _ in b]
+        same_scores = all(abs(sa - sb) <= SCORE_TOLERANCE for (_, sa), (_, sb) in zip(a, b))
+        if not (same_docs and same_scores):
+            mismatches += 1
+            print(f"MISMATCH: {query!r}")
+
+    print(f"\n{len(documents)} documents in {len(sharded.shards)} shards "
+          f"({', '.join(sharded.shards)}), {len(queries)} queries, k={args.k}\n")
+    print(f"{'layout':<22} | {'p50 ms':>7} | {'p99 ms':>7}")
+    print("-" * 42)
+    for name, values in timings.items():
+        values.sort()
+        print(f"{name:<22} | {statistics.median(values):>7.3f} | "
+              f"{values[int(0.99 * (len(values) - 1))]:>7.3f}")
+
+    if mismatches:
+        print(f"\nFAIL: {mismatches} of {len(queries)} queries differ")
+        sys.exit(1)
+    print("\nOK: sharded top-k identical to the single index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Synthetic FYDP archive generator for scale testing.
+
+Writes one JSON array per batch year in the same record layout as
+ai/data/*.json (title, team_members, description, advisor, batch), so
+load_archive_documents, build_index and the agent read it unchanged.
+Records are generated and written one year at a time, so 1M projects
+never sit in memory at once.
+
+The archive is shaped like the real one, scaled up to a multi-department
+university: advisors each have one to three specialty domains and
+supervise mostly within them, later batches are larger, about one project
+in ten is co-supervised ("A / B"), and a few advisor fields carry the
+title variants and typos seen in the hand-typed data.
+
+    cd Backend-z
+    python -m benchmarks.synthetic_archive --projects 100000 --out /tmp/fydp_100k
+
+A synthetic.manifest file next to the year files records the parameters
+and the advisor roster.
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+FIRST_YEAR, LAST_YEAR = 2004, 2025
+MANIFEST_NAME         = "synthetic.manifest"   # not *.json: the archive loader reads those
+
+FIRST_NAMES = [
+    "Ahmed", "Ali", "Ayesha", "Fatima", "Hassan", "Hira", "Imran", "Kashaf", "Maryam",
+    "Muhammad", "Noor", "Omer", "Rabia", "Saad", "Sana", "Shahzaib", "Sidra", "Talha",
+    "Usman", "Zainab", "Zaid", "Hamza", "Areeba", "Bilal", "Danish", "Eman", "Faraz",
+    "Ghazal", "Huzaifa", "Iqra", "Junaid", "Komal", "Laiba", "Mahnoor", "Nabeel",
+    "Owais", "Parveen", "Qasim", "Rida", "Sameer", "Tooba", "Umair", "Waleed", "Yusra",
+]
+LAST_NAMES = [
+    "Khan", "Ahmed", "Siddiqui", "Qureshi", "Hussain", "Kazmi", "Haider", "Raza", "Shaikh",
+    "Ansari", "Memon", "Baig", "Javed", "Farooqui", "Rizvi", "Zaidi", "Malik", "Iqbal",
+    "Abbasi", "Chaudhry", "Mirza", "Naqvi", "Hashmi", "Usmani", "Jafri", "Arfeen",
+    "Ainuddin", "Ismail", "Bhatti", "Lodhi", "Rehman", "Saleem", "Tariq", "Yousuf",
+]
+TITLES = ["Dr.", "Dr.", "Dr.", "Prof. Dr.", "Mr.", "Ms.", "Engr."]
+
+DOMAINS = {
+    "driver safety": {
+        "problems": ["driver drowsiness detection", "eye blink monitoring", "distracted driving alerts",
+                     "road lane departure warning"],
+        "methods":  ["computer vision", "deep learning", "facial landmark tracking", "cnn classification"],
+        "data":     ["dashcam video", "infrared eye images", "steering sensor logs"],
+        "platform": ["raspberry pi", "android app", "embedded camera module"],
+    },
+    "sign language": {
+        "problems": ["sign language recognition", "gesture to speech translation",
+                     "pakistani sign language interpreter"],
+        "methods":  ["transformer", "lstm sequence model", "mediapipe hand landmarks", "deep learning"],
+        "data":     ["gesture video dataset", "hand keypoint sequences"],
+        "platform": ["mobile app", "web camera", "edge device"],
+    },
+    "environment iot": {
+        "problems": ["air quality monitoring", "smart water metering", "flood early warning",
+                     "noise pollution mapping"],
+        "methods":  ["iot sensor network", "real-time dashboards", "regression forecasting",
+                     "anomaly detection"],
+        "data":     ["pm2.5 sensor readings", "gas sensor data", "weather station feeds"],
+        "platform": ["arduino", "esp32 nodes", "lora gateway", "cloud api"],
+    },
+    "privacy ml": {
+        "problems": ["federated learning for healthcare", "privacy preserving analytics",
+                     "on-device keyboard prediction"],
+        "methods":  ["federated averaging", "differential privacy", "edge computing",
+                     "secure aggregation"],
+        "data":     ["distributed client datasets", "medical records"],
+        "platform": ["edge devices", "mobile clients", "distributed servers"],
+    },
+    "urdu nlp": {
+        "problems": ["urdu handwriting recognition", "urdu text summarization", "roman urdu sentiment analysis",
+                     "nastaliq ocr"],
+        "methods":  ["natural language processing", "transformer fine-tuning", "crnn", "ctc decoding"],
+        "data":     ["scanned urdu documents", "social media comments", "news corpus"],
+        "platform": ["web application", "mobile scanner app"],
+    },
+    "smart city": {
+        "problems": ["smart parking system", "traffic signal optimization", "vehicle number plate recognition",
+                     "public transport tracking"],
+        "methods":  ["object detection", "reinforcement learning", "yolo", "sensor fusion"],
+        "data":     ["cctv footage", "ultrasonic sensors", "gps traces"],
+        "platform": ["raspberry pi", "mobile app", "cloud backend"],
+    },
+    "agriculture": {
+        "problems": ["crop disease detection", "plant health analysis", "soil moisture irrigation control",
+                     "yield prediction"],
+        "methods":  ["cnn classification", "transfer learning", "drone imaging", "machine learning"],
+        "data":     ["leaf images", "multispectral imagery", "soil sensor data"],
+        "platform": ["drone", "android app", "iot sensor nodes"],
+    },
+    "blockchain": {
+        "problems": ["blockchain voting system", "land record verification", "supply chain traceability",
+                     "degree verification"],
+        "methods":  ["smart contracts", "ethereum", "hyperledger fabric", "zero knowledge proofs"],
+        "data":     ["transaction ledgers", "identity records"],
+        "platform": ["web portal", "decentralized app"],
+    },
+    "conversational ai": {
+        "problems": ["chatbot for university admissions", "customer support assistant", "voice assistant for the elderly"],
+        "methods":  ["natural language processing", "retrieval augmented generation", "intent classification",
+                     "speech recognition"],
+        "data":     ["faq corpus", "support transcripts", "voice recordings"],
+        "platform": ["web application", "whatsapp bot", "mobile app"],
+    },
+    "misinformation": {
+        "problems": ["fake news detection", "clickbait classification", "deepfake video detection"],
+        "methods":  ["transformers", "graph neural networks", "ensemble classification", "deep learning"],
+        "data":     ["news articles", "twitter threads", "video frames"],
+        "platform": ["browser extension", "web application"],
+    },
+    "healthcare": {
+        "problems": ["diabetic retinopathy screening", "ecg arrhythmia detection", "patient vitals monitoring",
+                     "medicine reminder system"],
+        "methods":  ["deep learning", "signal processing", "wearable sensors", "classification"],
+        "data":     ["fundus images", "ecg recordings", "hospital records"],
+        "platform": ["wearable device", "mobile app", "hospital management system"],
+    },
+    "robotics": {
+        "problems": ["autonomous line following robot", "warehouse picking robot", "robotic arm control",
+                     "obstacle avoiding rover"],
+        "methods":  ["path planning", "pid control", "slam", "reinforcement learning", "simulation"],
+        "data":     ["lidar scans", "encoder readings", "camera frames"],
+        "platform": ["arduino", "ros", "embedded controller", "hardware prototype"],
+    },
+    "information systems": {
+        "problems": ["hostel management system", "inventory system for pharmacies", "event booking system",
+                     "library portal"],
+        "methods":  ["crud operations", "database design", "role based access", "rest api"],
+        "data":     ["student records", "stock records"],
+        "platform": ["web portal", "desktop application"],
+    },
+    "networks security": {
+        "problems": ["network intrusion detection", "phishing url detection", "malware classification",
+                     "ddos mitigation"],
+        "methods":  ["machine learning", "anomaly detection", "deep packet inspection", "distributed monitoring"],
+        "data":     ["network traffic captures", "url datasets", "malware binaries"],
+        "platform": ["sdn controller", "firewall appliance", "cloud service"],
+    },
+}
+DOMAIN_NAMES = list(DOMAINS)
+
+TITLE_TEMPLATES = [
+    "{problem} using {method}",
+    "Design and Implementation of a {problem} System",
+    "{method} based {problem}",
+    "An Intelligent {problem} Platform on {platform}",
+    "{problem} with {method} on {platform}",
+]
+SENTENCE_TEMPLATES = [
+    "This project develops a {problem} solution that addresses the limitations of manual and existing approaches.",
+    "The system applies {method} to {data} collected and preprocessed by the team.",
+    "A prototype was built on {platform} and evaluated in realistic conditions.",
+    "{method2} is combined with {method} to improve accuracy and robustness.",
+    "The pipeline covers data collection, model training, evaluation and deployment.",
+    "Results show high accuracy, precision and recall compared to baseline methods.",
+    "The work targets local needs in Pakistan, where {problem} remains largely unexplored.",
+    "Future work includes a larger dataset, real-time operation and integration with {platform}.",
+]
+
+
+def _misspell(name: str, rng: random.Random) -> str:
+    i = rng.randrange(1, max(2, len(name) - 2))
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:] if i + 2 <= len(name) else name
+
+
+class AdvisorRoster:
+    def __init__(self, count: int, rng: random.Random):
+        seen: set = set()
+        self.advisors = []
+        while len(self.advisors) < count:
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            if name in seen:
+                name = f"{rng.choice(FIRST_NAMES)} {name}"   # middle name keeps names unique
+                if name in seen:
+                    continue
+            seen.add(name)
+            self.advisors.append({
+                "name":        name,
+                "title":       rng.choice(TITLES),
+                "specialties": rng.sample(DOMAIN_NAMES, rng.randint(1, 3)),
+            })
+        self.by_domain: dict = {}
+        for a in self.advisors:
+            for d in a["specialties"]:
+                self.by_domain.setdefault(d, []).append(a)
+
+    def supervisor_field(self, domain: str, rng: random.Random) -> str:
+        primary = rng.choice(self.by_domain.get(domain) or self.advisors)
+        names   = [self._spelling(primary, rng)]
+        if rng.random() < 0.1:
+            names.append(self._spelling(rng.choice(self.advisors), rng))
+        return " / ".join(names)
+
+    @staticmethod
+    def _spelling(advisor: dict, rng: random.Random) -> str:
+        name, title = advisor["name"], advisor["title"]
+        roll = rng.random()
+        if roll < 0.03:
+            name = _misspell(name, rng)
+        elif roll < 0.08:
+            title = title.rstrip(".")
+        elif roll < 0.10:
+            title = ""
+        return f"{title} {name}".strip()
+
+
+def _project(domain: str, year: int, roster: AdvisorRoster, rng: random.Random) -> dict:
+    d = DOMAINS[domain]
+    slots = {
+        "problem":  rng.choice(d["problems"]),
+        "method":   rng.choice(d["methods"]),
+        "method2":  rng.choice(d["methods"]),
+        "data":     rng.choice(d["data"]),
+        "platform": rng.choice(d["platform"]),
+    }
+    title = rng.choice(TITLE_TEMPLATES).format(**slots)
+    sentences = [SENTENCE_TEMPLATES[0]] + rng.sample(SENTENCE_TEMPLATES[1:], rng.randint(3, 6))
+    return {
+        "title":        title.title(),
+        "team_members": [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                         for _ in range(rng.randint(2, 4))],
+        "description":  " ".join(s.format(**slots) for s in sentences),
+        "advisor":      roster.supervisor_field(domain, rng),
+        "batch":        str(year),
+    }
+
+
+def year_sizes(projects: int, rng: random.Random) -> dict:
+    """Projects per batch year, growing towards recent batches."""
+    years   = list(range(FIRST_YEAR, LAST_YEAR + 1))
+    weights = [1 + 0.08 * i for i in range(len(years))]
+    counts  = dict.fromkeys(years, 0)
+    for year in rng.choices(years, weights=weights, k=projects):
+        counts[year] += 1
+    return counts
+
+
+def generate(projects: int, out_dir: Path, seed: int = 7) -> dict:
+    rng    = random.Random(seed)
+    roster = AdvisorRoster(max(20, projects // 150), rng)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    sizes = year_sizes(projects, rng)
+    for year, count in sizes.items():
+        if not count:
+            continue
+        with open(out_dir / f"{year}.json", "w", encoding="utf-8") as f:
+            f.write("[\n")
+            for i in range(count):
+                advisor = rng.choice(roster.advisors)
+                domain  = rng.choice(advisor["specialties"]) if rng.random() < 0.85 else rng.choice(DOMAIN_NAMES)
+                f.write(("" if i == 0 else ",\n") + json.dumps(_project(domain, year, roster, rng)))
+            f.write("\n]\n")
+
+    manifest = {
+        "projects": projects,
+        "seed":     seed,
+        "years":    {str(y): n for y, n in sizes.items()},
+        "advisors": [f"{a['title']} {a['name']}".strip() for a in roster.advisors],
+    }
+    with open(out_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def load_or_generate(projects: int, out_dir: Path, seed: int = 7) -> dict:
+    """Reuse an archive generated earlier with the same size and seed."""
+    try:
+        with open(out_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["projects"] == projects and manifest["seed"] == seed:
+            return manifest
+    except (OSError, ValueError, KeyError):
+        pass
+    return generate(projects, out_dir, seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic FYDP archive")
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    manifest = generate(args.projects, args.out, args.seed)
+    print(f"{manifest['projects']} projects, {len(manifest['advisors'])} advisors, "
+          f"{len(manifest['years'])} batches -> {args.out}")
@@ -1,4 +1,4 @@
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
 from dotenv import load_dotenv
 import os
 import gridfs
@@ -10,6 +10,8 @@ MONGO_URI = os.getenv("MONGO_URI")
 if not MONGO_URI:
     raise ValueError("No MONGO_URI found in environment variables")
 
+# Sync client: background threads (chat summaries, embeddings, trace writer),
+# startup index creation and offline scripts.
 client = MongoClient(MONGO_URI)
 db = client["project_portal"]
 
@@ -17,4 +19,11 @@ users_col = db["users"]
 profiles_col = db["profiles"]
 
 # GridFS for file storage
-fs = gridfs.GridFS(db)
\ No newline at end of file
+fs = gridfs.GridFS(db)
+
+# Async client: everything awaited from request handlers, so a slow query
+# waits on the event loop instead of blocking it for every other request.
+async_client = AsyncMongoClient(MONGO_URI)
+adb = async_client["project_portal"]
+
+async_fs = gridfs.AsyncGridFS(adb)
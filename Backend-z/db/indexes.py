@@ -15,4 +15,11 @@ def create_indexes():
     interested.create_index(
         [("team_id", 1)]
     )
-    
\ No newline at end of file
+    
+    db["chat_messages"].create_index(
+        [("session_id", 1), ("created_at", -1)]
+    )
+
+    # Polled by every worker's semantic cache sync
+    db["chat_answer_cache"].create_index([("created_at", -1)])
+    db["chat_answer_cache"].create_index([("revoked_at", -1)], sparse=True)
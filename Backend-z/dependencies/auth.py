@@ -2,18 +2,75 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from bson import ObjectId
+from collections import OrderedDict
+import hashlib
 import os
+import time
 
-from db.db import db
+from db.db import adb
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/signin")
 
-users_col = db["users"]
+users_col = adb["users"]
+advisors_col = adb["advisors"]
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+# ============================================================
+# Auth context cache
+# ============================================================
+# Every authenticated request used to look the user up again, and advisor /
+# committee routes looked up the advisor record on top of that. The resolved
+# context is kept per token (by hash, never the token itself) until the token
+# expires or AUTH_CACHE_TTL passes, whichever is sooner. Writes to a user or
+# advisor record call invalidate_auth_context(); other workers see the change
+# within AUTH_CACHE_TTL.
+
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "300"))    # seconds; 0 disables the cache
+AUTH_CACHE_MAX = int(os.getenv("AUTH_CACHE_MAX", "10000"))  # tokens kept, least recently used dropped first
+
+_auth_cache: OrderedDict = OrderedDict()   # token hash -> (expires_at, context)
+_tokens_by_user: dict = {}                 # user id -> {token hash}
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _forget(key: str):
+    entry = _auth_cache.pop(key, None)
+    if entry is None:
+        return
+    user_key = str(entry[1]["user"]["_id"])
+    keys = _tokens_by_user.get(user_key)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del _tokens_by_user[user_key]
+
+
+def invalidate_auth_context(user_id):
+    """Drop every cached context of a user after their user or advisor record changed."""
+    for key in list(_tokens_by_user.get(str(user_id), ())):
+        _forget(key)
+
+
+async def _load_auth_context(user_id: str) -> dict | None:
+    user = await users_col.find_one({"_id": ObjectId(user_id)}, {"hashed_password": 0})
+    if user is None:
+        return None
+    advisor = await advisors_col.find_one({"advisor_id": user["_id"]})
+    return {
+        "user":             user,
+        "advisor":          advisor,
+        "is_advisor":       advisor is not None,
+        "committee_member": bool(advisor and advisor.get("committee_member")),
+    }
+
+
+async def get_auth_context(token: str = Depends(oauth2_scheme)) -> dict:
+    """The signed-in user's document plus their advisor record and role flags."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid or expired token",
@@ -22,16 +79,42 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")   
+        user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
 
     except JWTError:
         raise credentials_exception
 
-    user = users_col.find_one({"_id": ObjectId(user_id)})
+    key = _token_key(token)
+    now = time.time()
+    entry = _auth_cache.get(key)
+    if entry is not None:
+        if entry[0] > now:
+            _auth_cache.move_to_end(key)
+            return entry[1]
+        _forget(key)
 
-    if user is None:
+    context = await _load_auth_context(user_id)
+    if context is None:
         raise credentials_exception
 
-    return user
+    expires_at = min(payload.get("exp", now), now + AUTH_CACHE_TTL)
+    if expires_at > now:
+        _forget(key)   # a concurrent miss on the same token may have stored it already
+        _auth_cache[key] = (expires_at, context)
+        _tokens_by_user.setdefault(str(context["user"]["_id"]), set()).add(key)
+        while len(_auth_cache) > AUTH_CACHE_MAX:
+            _forget(next(iter(_auth_cache)))
+
+    return context
+
+
+async def get_current_user(context: dict = Depends(get_auth_context)):
+    return context["user"]
+
+
+async def require_committee_member(context: dict = Depends(get_auth_context)):
+    if not context["committee_member"]:
+        raise HTTPException(status_code=403, detail="Access denied.")
+    return context["user"]
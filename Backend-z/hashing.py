@@ -1,7 +1,143 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow (~100-300 ms of CPU per hash or check at the
+usual work factors), so the async endpoints hand it to a bounded pool
+instead of running it inline: HASH_WORKERS calls run at once and at most
+HASH_QUEUE_MAX more wait; past that the pool refuses with PoolBusy, which
+the auth routes turn into a 503 rather than letting a login burst queue
+without bound. bcrypt releases the GIL while hashing, so the default
+thread pool uses every worker core; HASH_POOL=process is there for builds
+that do not.
+
+BCRYPT_ROUNDS sets the work factor for new hashes. Existing hashes keep
+verifying at whatever cost they were made with; needs_rehash() tells the
+signin route when to upgrade one.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import bcrypt
 
+BCRYPT_ROUNDS  = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS   = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_QUEUE_MAX = int(os.getenv("HASH_QUEUE_MAX", "64"))
+HASH_POOL      = os.getenv("HASH_POOL", "thread")   # thread | process
+
+METRICS_WINDOW = 1000   # most recent calls kept for the wait/run percentiles
+
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
\ No newline at end of file
+    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash was made with a different work factor ($2b$<cost>$...)."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+def _timed_call(fn, args: tuple) -> tuple:
+    # Runs in the worker: report when it started so queueing can be told apart from work
+    started = time.time()
+    return fn(*args), started, time.time()
+
+
+class PoolBusy(Exception):
+    """Every worker is busy and the queue is full."""
+
+
+class HashPool:
+    """Bounded executor for bcrypt calls, with queue-depth and wait-time metrics."""
+
+    def __init__(self, workers: int, queue_max: int, kind: str = "thread"):
+        self.workers      = workers
+        self.queue_max    = queue_max
+        self.kind         = kind
+        self._executor    = None
+        self._lock        = threading.Lock()
+        self._in_flight   = 0
+        self._peak_queued = 0
+        self._counts      = {"submitted": 0, "completed": 0, "rejected": 0, "failed": 0}
+        self._wait_ms     = deque(maxlen=METRICS_WINDOW)
+        self._run_ms      = deque(maxlen=METRICS_WINDOW)
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.queue_max:
+                self._counts["rejected"] += 1
+                raise PoolBusy(f"{self._in_flight} password checks in flight")
+            self._in_flight += 1
+            self._counts["submitted"] += 1
+            self._peak_queued = max(self._peak_queued, self._in_flight - self.workers)
+            executor = self._get_executor()
+
+        submitted = time.time()
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(
+                executor, _timed_call, fn, args
+            )
+        except Exception:
+            with self._lock:
+                self._counts["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        with self._lock:
+            self._counts["completed"] += 1
+            self._wait_ms.append(max(0.0, started - submitted) * 1000)
+            self._run_ms.append((finished - started) * 1000)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits, runs = sorted(self._wait_ms), sorted(self._run_ms)
+            return {
+                "kind":          self.kind,
+                "workers":       self.workers,
+                "queue_max":     self.queue_max,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                "in_flight":     self._in_flight,
+                "queued":        max(0, self._in_flight - self.workers),
+                "peak_queued":   self._peak_queued,
+                **self._counts,
+                "wait_p50_ms":   _percentile(waits, 50),
+                "wait_p95_ms":   _percentile(waits, 95),
+                "run_p50_ms":    _percentile(runs, 50),
+                "run_p95_ms":    _percentile(runs, 95),
+            }
+
+
+def _percentile(ordered: list, pct: float) -> float | None:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 2)
+
+
+hash_pool = HashPool(HASH_WORKERS, HASH_QUEUE_MAX, HASH_POOL)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hash_pool.run(verify_password, plain_password, hashed_password)
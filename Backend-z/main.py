@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from db.db import async_client
 from db.indexes import create_indexes
 from routers import auth
 from routers import advisors, fydp_ideas_by_advisor
@@ -18,6 +19,7 @@ from routers import team_members
 from routers import student_pitches
 from routers import project_proposals
 from routers import committee
+from routers import retrieval
 
 app = FastAPI()
 
@@ -44,6 +46,10 @@ def health_check():
 def startup():
     create_indexes()
 
+@app.on_event("shutdown")
+async def shutdown():
+    await async_client.close()
+
 app.include_router(auth.router)
 app.include_router(advisors.router)
 app.include_router(fydp_ideas_by_advisor.router)
@@ -61,4 +67,5 @@ app.include_router(stages_status.router)
 app.include_router(team_members.router)
 app.include_router(student_pitches.router)
 app.include_router(project_proposals.router)
-app.include_router(committee.router)
\ No newline at end of file
+app.include_router(committee.router)
+app.include_router(retrieval.router)
\ No newline at end of file
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from bson import ObjectId
 from datetime import datetime
 
-from db.db import db
+from db.db import adb
 from dependencies.auth import get_current_user
 from utils.scoring import calculate_match_scores
 from utils.mongo import serialize_mongo
@@ -10,14 +10,14 @@ from utils.mongo import serialize_mongo
 
 router = APIRouter(prefix="/advisor-projects", tags=["Advisor Projects"])
 
-profiles_col = db["profiles"]
-teams_col = db["teams"]
-projects_col = db["Advisor_ideas"]
-interested_col = db["interested_teams"]
+profiles_col = adb["profiles"]
+teams_col = adb["teams"]
+projects_col = adb["Advisor_ideas"]
+interested_col = adb["interested_teams"]
 
 
 @router.post("/{project_id}/interested", status_code=status.HTTP_201_CREATED)
-def mark_interested(
+async def mark_interested(
     project_id: str,
     current_user: dict = Depends(get_current_user)
 ):
@@ -35,38 +35,36 @@ def mark_interested(
     
     user_id = ObjectId(current_user["_id"])
 
-    profile = profiles_col.find_one({"user_id": user_id})
+    profile = await profiles_col.find_one({"user_id": user_id})
     if not profile or not profile.get("team_id"):
         raise HTTPException(400, "User is not part of a team")
 
     team_id = profile["team_id"]
 
-    team = teams_col.find_one({"final_team_id": team_id})
+    team = await teams_col.find_one({"final_team_id": team_id})
     if not team:
         raise HTTPException(404, "Team not found")
 
-    if interested_col.find_one({
+    if await interested_col.find_one({
         "project_id": ObjectId(project_id),
         "team_id": team_id
     }):
         raise HTTPException(409, "Team already marked interest")
 
-    project = projects_col.find_one({"_id": ObjectId(project_id)})
+    project = await projects_col.find_one({"_id": ObjectId(project_id)})
     if not project:
         raise HTTPException(404, "Project not found")
 
-    team_profiles = list(
-        profiles_col.find({
-            "user_id": {"$in": [ObjectId(uid) for uid in team["members"]]}
-        })
-    )
+    team_profiles = await profiles_col.find({
+        "user_id": {"$in": [ObjectId(uid) for uid in team["members"]]}
+    }).to_list()
 
     team_score, matched_skills, members = calculate_match_scores(
         team_profiles,
         project.get("skills_required", [])
     )
 
-    interested_col.insert_one({
+    await interested_col.insert_one({
         "advisor_id": project["advisor_id"],
         "project_id": ObjectId(project_id),
         "team_id": team_id,
@@ -86,7 +84,7 @@ def mark_interested(
 
 
 @router.get("/advisor/interested-teams/top3")
-def advisor_top3_interested_teams(current_user: dict = Depends(get_current_user)):
+async def advisor_top3_interested_teams(current_user: dict = Depends(get_current_user)):
     
     """
     Returns top 3 most recent teams interested in advisor's projects.
@@ -94,12 +92,10 @@ def advisor_top3_interested_teams(current_user: dict = Depends(get_current_user)
     Includes project title for each interest.
     """
     
-    data = list(
-        interested_col.find(
-            {"advisor_id": ObjectId(current_user["_id"])},
-            {"_id": 0}
-        ).sort("created_at", -1).limit(3)
-    )
+    data = await interested_col.find(
+        {"advisor_id": ObjectId(current_user["_id"])},
+        {"_id": 0}
+    ).sort("created_at", -1).limit(3).to_list()
     
     # Enrich members with name and roll_number from profiles, and add project title
     enriched_data = []
@@ -111,7 +107,7 @@ def advisor_top3_interested_teams(current_user: dict = Depends(get_current_user)
         if project_id:
             try:
                 project_obj_id = ObjectId(project_id) if not isinstance(project_id, ObjectId) else project_id
-                project = projects_col.find_one({"_id": project_obj_id}, {"title": 1})
+                project = await projects_col.find_one({"_id": project_obj_id}, {"title": 1})
                 if project:
                     enriched_item["project_title"] = project.get("title", "Unknown Project")
             except:
@@ -126,7 +122,7 @@ def advisor_top3_interested_teams(current_user: dict = Depends(get_current_user)
                     try:
                         # Handle both string and ObjectId formats
                         user_obj_id = ObjectId(user_id) if not isinstance(user_id, ObjectId) else user_id
-                        profile = profiles_col.find_one({"user_id": user_obj_id})
+                        profile = await profiles_col.find_one({"user_id": user_obj_id})
                         if profile:
                             enriched_members.append({
                                 **member,
@@ -147,7 +143,7 @@ def advisor_top3_interested_teams(current_user: dict = Depends(get_current_user)
 
 
 @router.get("/advisor/interested-teams")
-def advisor_notifications(current_user: dict = Depends(get_current_user)):
+async def advisor_notifications(current_user: dict = Depends(get_current_user)):
     
     """
     Allows an advisor to view all teams interested in their projects.
@@ -155,12 +151,10 @@ def advisor_notifications(current_user: dict = Depends(get_current_user)):
     Enriches member data with names and roll numbers from profiles.
     """
     
-    data = list(
-        interested_col.find(
-            {"advisor_id": ObjectId(current_user["_id"])},
-            {"_id": 0}
-        ).sort("created_at", -1)
-    )
+    data = await interested_col.find(
+        {"advisor_id": ObjectId(current_user["_id"])},
+        {"_id": 0}
+    ).sort("created_at", -1).to_list()
     
     # Enrich members with name and roll_number from profiles
     enriched_data = []
@@ -174,7 +168,7 @@ def advisor_notifications(current_user: dict = Depends(get_current_user)):
                     try:
                         # Handle both string and ObjectId formats
                         user_obj_id = ObjectId(user_id) if not isinstance(user_id, ObjectId) else user_id
-                        profile = profiles_col.find_one({"user_id": user_obj_id})
+                        profile = await profiles_col.find_one({"user_id": user_obj_id})
                         if profile:
                             enriched_members.append({
                                 **member,
@@ -194,7 +188,7 @@ def advisor_notifications(current_user: dict = Depends(get_current_user)):
     return serialize_mongo(enriched_data)
 
 @router.get("/{project_id}/interested-teams")
-def project_interested_teams(project_id: str):
+async def project_interested_teams(project_id: str):
     
     """
     Returns all teams interested in a specific project.
@@ -202,12 +196,10 @@ def project_interested_teams(project_id: str):
     Enriches member data with names and roll numbers from profiles.
     """
     
-    data = list(
-        interested_col.find(
-            {"project_id": ObjectId(project_id)},
-            {"_id": 0}
-        ).sort("team_score", -1)
-    )
+    data = await interested_col.find(
+        {"project_id": ObjectId(project_id)},
+        {"_id": 0}
+    ).sort("team_score", -1).to_list()
     
     # Enrich members with name and roll_number from profiles
     enriched_data = []
@@ -221,7 +213,7 @@ def project_interested_teams(project_id: str):
                     try:
                         # Handle both string and ObjectId formats
                         user_obj_id = ObjectId(user_id) if not isinstance(user_id, ObjectId) else user_id
-                        profile = profiles_col.find_one({"user_id": user_obj_id})
+                        profile = await profiles_col.find_one({"user_id": user_obj_id})
                         if profile:
                             enriched_members.append({
                                 **member,
@@ -241,25 +233,23 @@ def project_interested_teams(project_id: str):
     return serialize_mongo(enriched_data)
 
 @router.get("/team/my-interests")
-def my_team_interests(current_user: dict = Depends(get_current_user)):
+async def my_team_interests(current_user: dict = Depends(get_current_user)):
     
     """
     Allows a student to see all projects their team has applied for.
     """
     
-    profile = profiles_col.find_one(
+    profile = await profiles_col.find_one(
         {"user_id": ObjectId(current_user["_id"])}
     )
 
     if not profile or not profile.get("team_id"):
         raise HTTPException(400, "User not in a team")
 
-    data = list(
-        interested_col.find(
-            {"team_id": profile["team_id"]},
-            {"_id": 0}
-        ).sort("created_at", -1)
-    )
+    data = await interested_col.find(
+        {"team_id": profile["team_id"]},
+        {"_id": 0}
+    ).sort("created_at", -1).to_list()
     return serialize_mongo(data)
 
 
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
-from db.db import db, users_col
+from db.db import adb
 from schemas.advisors import AdvisorCreate
-from dependencies.auth import get_current_user
+from dependencies.auth import get_auth_context, get_current_user, invalidate_auth_context
 
 router = APIRouter(prefix="/advisors", tags=["Advisors"])
 
-advisors_col = db["advisors"]
+advisors_col = adb["advisors"]
 
 @router.post("/")
-def create_advisor(
+async def create_advisor(
     advisor: AdvisorCreate,
     current_user: dict = Depends(get_current_user)
 ):
@@ -19,7 +19,7 @@ def create_advisor(
 
     advisor_id = current_user["_id"]
 
-    existing = advisors_col.find_one({"advisor_id": advisor_id})
+    existing = await advisors_col.find_one({"advisor_id": advisor_id})
     if existing:
         raise HTTPException(status_code=400, detail="Advisor already exists")
 
@@ -30,7 +30,8 @@ def create_advisor(
         "committee_member": advisor.committee_member
     }
 
-    advisors_col.insert_one(advisor_doc)
+    await advisors_col.insert_one(advisor_doc)
+    invalidate_auth_context(advisor_id)   # cached contexts still say "not an advisor"
 
     return {
         "message": "Advisor profile created successfully",
@@ -42,22 +43,19 @@ def create_advisor(
 # -------------------
 
 @router.get("/me")
-def get_current_user_advisor_info(
-    current_user: dict = Depends(get_current_user)
+async def get_current_user_advisor_info(
+    auth: dict = Depends(get_auth_context)
 ):
     """
     Get the current logged-in user's advisor information (name and committee member status).
     """
-    advisor_id = current_user["_id"]
-    
-    advisor_doc = advisors_col.find_one({"advisor_id": advisor_id})
+    advisor_doc = auth["advisor"]
     
     if not advisor_doc:
         raise HTTPException(status_code=404, detail="Advisor profile not found")
     
-    # Fetch gsuite_id from users collection (advisor_id is the same as user _id)
-    user_doc = users_col.find_one({"_id": advisor_id})
-    gsuite_id = user_doc.get("gsuite_id") if user_doc else None
+    # gsuite_id comes from the user document (advisor_id is the same as user _id)
+    gsuite_id = auth["user"].get("gsuite_id")
     
     return {
         "advisor_id": str(advisor_doc["advisor_id"]),
@@ -72,30 +70,29 @@ def get_current_user_advisor_info(
 # -------------------
 
 @router.get("/all")
-def get_all_advisors(current_user: dict = Depends(get_current_user)):
+async def get_all_advisors(current_user: dict = Depends(get_current_user)):
     user_id_str = str(current_user["_id"])
     
-    from db.db import db
-    teams_col = db["teams"]
-    student_pitches_col = db["student_pitches"]
+    teams_col = adb["teams"]
+    student_pitches_col = adb["student_pitches"]
     
     # 1. Get user's team id
-    team = teams_col.find_one({"members": user_id_str})
+    team = await teams_col.find_one({"members": user_id_str})
     team_id_str = str(team["_id"]) if team else None
 
     advisors_list = []
     cursor = advisors_col.find()
     
-    for adv in cursor:
+    async for adv in cursor:
         adv_id_str = str(adv["advisor_id"])
         
         # Calculate available slots
-        industry_accepted = student_pitches_col.count_documents({
+        industry_accepted = await student_pitches_col.count_documents({
             "advisor_id": adv_id_str,
             "is_industry": True,
             "status": "accepted"
         })
-        normal_accepted = student_pitches_col.count_documents({
+        normal_accepted = await student_pitches_col.count_documents({
             "advisor_id": adv_id_str,
             "is_industry": False,
             "status": "accepted"
@@ -108,7 +105,7 @@ def get_all_advisors(current_user: dict = Depends(get_current_user)):
         team_pitch_status = "none"
         if team_id_str:
             # Find any active pitch (pending or accepted) to this advisor from this team
-            existing_pitch = student_pitches_col.find_one({
+            existing_pitch = await student_pitches_col.find_one({
                 "team_id": team_id_str,
                 "advisor_id": adv_id_str,
                 "status": {"$in": ["pending", "accepted"]}
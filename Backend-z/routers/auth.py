@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from schemas.user import SignInResponse, User
-from hashing import hash_password, verify_password
-from db.db import db
+from hashing import PoolBusy, hash_password_async, hash_pool, needs_rehash, verify_password_async
+from db.db import adb
 from JWT.JWTtoken import (
     create_access_token,
     create_refresh_token,
@@ -13,20 +13,33 @@ from datetime import timedelta
 from schemas.token import Token
 from jose import jwt, JWTError
 from pydantic import BaseModel
+from dependencies.auth import require_committee_member
 
 router = APIRouter(prefix="/auth", tags=["auth"])  
-users_col = db["users"]
+users_col = adb["users"]
+
+
+def _pool_busy() -> HTTPException:
+    # Login burst beyond what the hash pool can queue: shed load instead of stalling everyone
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-ins at once. Please try again in a moment.",
+        headers={"Retry-After": "2"},
+    )
 
 
 @router.post("/signup/")
 async def signup(user: User):
     # Check if user already exists
-    existing_user = users_col.find_one({"gsuite_id": user.gsuite_id})
+    existing_user = await users_col.find_one({"gsuite_id": user.gsuite_id})
     if existing_user:
         raise HTTPException(status_code=400, detail="User already registered")
     
-    # Hash the user's password
-    hashed_password = hash_password(user.password)
+    # Hash the user's password (on the hash pool, off the event loop)
+    try:
+        hashed_password = await hash_password_async(user.password)
+    except PoolBusy:
+        raise _pool_busy()
     
     # Insert user data into MongoDB
     user_data = {
@@ -36,7 +49,7 @@ async def signup(user: User):
         "created_at": "2021-05-01T12:00:00Z",
         "updated_at": "2021-05-01T12:00:00Z"
     }
-    result = users_col.insert_one(user_data)
+    result = await users_col.insert_one(user_data)
     
     return {"id": str(result.inserted_id)}
 
@@ -45,14 +58,28 @@ async def signup(user: User):
 @router.post("/signin/")
 async def signin(user: SignInResponse):
     # Find the user in the database
-    existing_user = users_col.find_one({"gsuite_id": user.gsuite_id})
+    existing_user = await users_col.find_one({"gsuite_id": user.gsuite_id})
     
     if not existing_user:
         raise HTTPException(status_code=400, detail="Invalid gsuite_id or password")
     
-    # Verify the user's password
-    if not verify_password(user.password, existing_user["hashed_password"]):
+    # Verify the user's password (on the hash pool, off the event loop)
+    try:
+        password_ok = await verify_password_async(user.password, existing_user["hashed_password"])
+    except PoolBusy:
+        raise _pool_busy()
+    if not password_ok:
         raise HTTPException(status_code=400, detail="Invalid email or password")
+
+    # Re-hash at the configured work factor once BCRYPT_ROUNDS has changed
+    if needs_rehash(existing_user["hashed_password"]):
+        try:
+            await users_col.update_one(
+                {"_id": existing_user["_id"]},
+                {"$set": {"hashed_password": await hash_password_async(user.password)}}
+            )
+        except PoolBusy:
+            pass   # upgrade on a quieter sign-in
     
     token_data = {
         "sub": str(existing_user["_id"]),
@@ -102,7 +129,7 @@ async def refresh_access_token(body: RefreshRequest):
 
     # Confirm user still exists in DB
     from bson import ObjectId
-    user = users_col.find_one({"_id": ObjectId(user_id)})
+    user = await users_col.find_one({"_id": ObjectId(user_id)})
     if user is None:
         raise credentials_exception
 
@@ -114,3 +141,9 @@ async def refresh_access_token(body: RefreshRequest):
     )
 
     return {"access_token": new_access_token, "token_type": "bearer"}
+
+
+@router.get("/hash-pool")
+async def get_hash_pool_stats(current_user: dict = Depends(require_committee_member)):
+    """Queue depth, rejections and wait/run percentiles of the password hashing pool."""
+    return hash_pool.stats()
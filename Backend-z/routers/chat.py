@@ -1,18 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import os
+import threading
 import asyncio
 
-from langchain_core.messages import HumanMessage, AIMessage
+import numpy as np
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
 
-from dependencies.auth import get_current_user
-from db.db import db
+from ai.agent_trace import TRACE_COLLECTION, stage_latency, trace_writer
+from ai.archive import args_share_term
+from ai.history import needs_summary, rank_turns
+from ai.tokens import count_tokens, clip_to_tokens
+from ai.semantic_cache import SemanticCache
+
+from dependencies.auth import get_current_user, require_committee_member
+from db.db import adb, db
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-sessions_col = db["chat_sessions"]
-messages_col = db["chat_messages"]
+# Sync handles: the agent pipeline (history build, cache lookup) on executor
+# threads and the background workers. Handlers await the async ones.
+sessions_col     = db["chat_sessions"]
+messages_col     = db["chat_messages"]
+answer_cache_col = db["chat_answer_cache"]
+
+async_sessions_col     = adb["chat_sessions"]
+async_messages_col     = adb["chat_messages"]
+async_answer_cache_col = adb["chat_answer_cache"]
+async_traces_col       = adb[TRACE_COLLECTION]
 
 
 # ============================================================
@@ -21,6 +40,9 @@ messages_col = db["chat_messages"]
 
 _run_agent        = None
 _preprocess_query = None
+_summarize_fn     = None
+_embedding_model  = None
+_index_version_fn = None
 
 def get_run_agent():
     global _run_agent
@@ -38,12 +60,42 @@ def get_preprocess_query():
         _preprocess_query = preprocess_query
     return _preprocess_query
 
+def get_summarize_fn():
+    global _summarize_fn
+    if _summarize_fn is None:
+        from ai.fydp_agent import summarize_conversation
+        _summarize_fn = summarize_conversation
+    return _summarize_fn
+
+def get_embedding_model():
+    global _embedding_model
+    if _embedding_model is None:
+        from ai.fydp_agent import embedding_model
+        _embedding_model = embedding_model
+    return _embedding_model
+
+def get_index_version() -> str:
+    global _index_version_fn
+    if _index_version_fn is None:
+        from ai.fydp_agent import get_index_version as fn
+        _index_version_fn = fn
+    return _index_version_fn()
+
 
 # ============================================================
 # Constants
 # ============================================================
 
-HISTORY_WINDOW       = 6
+BASELINE_MESSAGES    = 5      # what the old fixed window sent verbatim; the tokens_saved reference
+HISTORY_TOKEN_BUDGET = 3000   # summary + verbatim turns sent per request
+EMBED_TEXT_CHARS     = 2000   # prefix of each message that gets embedded
+CACHE_THRESHOLD      = 0.93   # cosine similarity needed to serve a cached answer
+CACHE_TTL_SECONDS    = 7 * 24 * 3600
+CACHE_SYNC_SECONDS   = 30     # how stale a worker's view of other workers' stores/revocations may get
+SUMMARY_KEEP_RECENT  = 2      # most recent turns never folded into the summary
+SUMMARY_MIN_TURNS    = 2      # fold older turns only once this many have piled up
+TOOL_RESULT_CHARS    = 3000   # stored size of each tool output kept for follow-ups
+REHYDRATE_BUDGET     = 2500   # tokens of prior tool output replayed per request
 ANALYSIS_MARKER  = "## 🔍 Feasibility & Complexity Analysis"
 ADVISOR_MARKER   = "### 🥇 Rank #1"
 PORTFOLIO_MARKER = "## 📋 Advisor Portfolio"
@@ -67,10 +119,6 @@ FEASIBILITY_SYSTEM_NOTE = (
 # Helpers
 # ============================================================
 
-def get_window_size(message: str) -> int:
-    return HISTORY_WINDOW
-
-
 def detect_response_type(text: str) -> str:
     if ANALYSIS_MARKER  in text: return "analysis"
     if ADVISOR_MARKER   in text: return "advisor_ranking"
@@ -78,37 +126,211 @@ def detect_response_type(text: str) -> str:
     return "chat"
 
 
-def build_lc_history(session_id: ObjectId, message: str, window: int) -> list:
+def _sorted_messages(query: dict, newest_first: bool = False):
+    # user/assistant pairs share a created_at; _id breaks the tie in insert order
+    order = -1 if newest_first else 1
+    return messages_col.find(
+        query, {"role": 1, "content": 1, "created_at": 1, "tool_results": 1}
+    ).sort([("created_at", order), ("_id", order)])
+
+
+@functools.lru_cache(maxsize=512)
+def _embed_text(text: str) -> tuple:
+    # Cached so the new user message is embedded once: at lookup, then at write
+    return tuple(get_embedding_model().embed_query(text[:EMBED_TEXT_CHARS]))
+
+
+def _group_turns(docs: list) -> list:
+    """Chronological docs -> list of turns (messages sharing one created_at)."""
+    turns: list = []
+    for doc in docs:
+        if turns and turns[-1][0]["created_at"] == doc["created_at"]:
+            turns[-1].append(doc)
+        else:
+            turns.append([doc])
+    return turns
+
+
+def _rank_session_turns(session_id: ObjectId, message: str, latest_time) -> tuple[list, list]:
+    """
+    Rank every embedded past turn of the session against the new message,
+    summarized or not; only created_at and embedding are read per message.
+    Returns (created_at of the relevant past turns, best first;
+    created_at of every turn in the session).
+    """
+    all_times, times, vectors, missing = set(), [], [], []
+    for doc in messages_col.find({"session_id": session_id}, {"created_at": 1, "embedding": 1}):
+        all_times.add(doc["created_at"])
+        if doc["created_at"] == latest_time:
+            continue
+        if doc.get("embedding"):
+            times.append(doc["created_at"])
+            vectors.append(doc["embedding"])
+        else:
+            missing.append(doc["_id"])
+
+    if missing:
+        # Messages stored before turn embeddings existed — backfill for next time
+        _background_executor.submit(_backfill_embeddings, missing)
+
+    relevant = rank_turns(times, vectors, _embed_text(message)) if vectors else []
+    return relevant, sorted(all_times)
+
+
+def compact_tool_results(tool_log: list) -> list:
+    """Trim a run_agent tool log down to what is worth storing for follow-ups."""
+    compact = []
+    for call in tool_log:
+        output = call["output"]
+        if output.startswith(("ERROR", "TOOL ERROR", "TAVILY ERROR", "ARCHIVE ERROR")):
+            continue
+        if len(output) > TOOL_RESULT_CHARS:
+            output = output[:TOOL_RESULT_CHARS] + "\n...[stored excerpt]"
+        compact.append({"tool": call["tool"], "args": call["args"], "output": output})
+    return compact
+
+
+def _rehydrate_tool_results(kept: list, message: str) -> dict:
+    """
+    Pick which stored tool results to replay, keyed by message index, newest
+    turn first. A result only qualifies when its arguments share a term with
+    the new message: a replayed result lets the agent skip the forced
+    retrieval round, so an unrelated question must not get one.
+    """
+    budget    = REHYDRATE_BUDGET
+    selected: dict = {}
+
+    assistant_idx = [i for i, m in enumerate(kept) if m["role"] == "assistant" and m.get("tool_results")]
+    for idx in reversed(assistant_idx):
+        for res in kept[idx]["tool_results"]:
+            if not args_share_term(res["args"], message):
+                continue
+            cost = count_tokens(res["output"])
+            if cost > budget:
+                continue
+            selected.setdefault(idx, []).append(res)
+            budget -= cost
+    return selected
+
+
+def build_lc_history(session_id: ObjectId, message: str) -> tuple[list, dict]:
     """
-    Fetch the last (window-1) stored messages, convert to LangChain
-    message objects, then append the new user message (with feasibility
-    injection if needed).
+    Build the LangChain history for the next agent call: the latest turn,
+    then the past turns of the whole session most relevant to the new
+    message (by embedding similarity, including turns already folded into
+    the rolling summary), admitted in that priority until
+    HISTORY_TOKEN_BUDGET is spent; the summary, ahead of them, fills what is
+    left of the budget when it covers turns retrieval did not bring back;
+    then the new user message (with feasibility injection if needed).
+
+    Tool outputs stored with the kept assistant turns are replayed as
+    AIMessage(tool_calls) + ToolMessage pairs ahead of the reply they fed,
+    so follow-ups can reuse them instead of calling the tool again.
+
+    Returns the history and token stats comparing it against the previous
+    fixed window (the last BASELINE_MESSAGES messages verbatim).
     """
-    past_docs = list(messages_col.find(
-        {"session_id": session_id},
-        {"_id": 0, "role": 1, "content": 1}
-    ).sort("created_at", -1).limit(window - 1))
-    past_docs.reverse()
+    session = sessions_col.find_one({"_id": session_id}, {"summary": 1, "summary_until": 1}) or {}
+    summary = session.get("summary") or ""
+    until   = session.get("summary_until")
+    recent  = list(_sorted_messages({"session_id": session_id}, newest_first=True).limit(BASELINE_MESSAGES))
+    baseline_tokens = sum(count_tokens(m["content"]) for m in recent)
+
+    latest_time = recent[0]["created_at"] if recent else None
+    relevant, turn_times = _rank_session_turns(session_id, message, latest_time) if recent else ([], [])
+    priority = ([latest_time] if recent else []) + relevant
+    turns    = {
+        turn[0]["created_at"]: turn
+        for turn in _group_turns(list(_sorted_messages(
+            {"session_id": session_id, "created_at": {"$in": priority}}
+        )))
+    } if priority else {}
+
+    budget = HISTORY_TOKEN_BUDGET
+
+    chosen: dict = {}
+    for t in priority:
+        turn = turns.get(t)
+        if not turn:
+            continue
+        cost = sum(count_tokens(m["content"]) for m in turn)
+        if cost <= budget:
+            chosen[t] = turn
+            budget -= cost
+        elif not chosen and budget > 0:
+            # Always keep some of the latest turn so follow-ups have an anchor
+            share = budget // len(turn)
+            chosen[t] = [{**m, "content": clip_to_tokens(m["content"], share)} for m in turn]
+            budget = 0
+
+    kept = [msg for t in sorted(chosen) for msg in chosen[t]]
+
+    # The summary stands in for the folded turns that were not retrieved
+    if summary and needs_summary(turn_times, chosen, until):
+        summary = clip_to_tokens(summary, budget)
+    else:
+        summary = ""
 
     lc_history = []
-    for msg in past_docs:
+    if summary:
+        lc_history.append(SystemMessage(content=(
+            "CONVERSATION SUMMARY (earlier turns, compressed — use as prior "
+            f"context for follow-ups):\n{summary}"
+        )))
+    rehydrated = _rehydrate_tool_results(kept, message)
+    for idx, msg in enumerate(kept):
         if msg["role"] == "user":
             lc_history.append(HumanMessage(content=msg["content"]))
         elif msg["role"] == "assistant":
+            results = rehydrated.get(idx, [])
+            if results:
+                call_ids = [f"history_{idx}_{n}" for n in range(len(results))]
+                lc_history.append(AIMessage(content="", tool_calls=[
+                    {"name": res["tool"], "args": res["args"], "id": cid}
+                    for res, cid in zip(results, call_ids)
+                ]))
+                lc_history += [
+                    ToolMessage(content=res["output"], tool_call_id=cid)
+                    for res, cid in zip(results, call_ids)
+                ]
             lc_history.append(AIMessage(content=msg["content"]))
 
+    sent_tokens = sum(count_tokens(m.content) for m in lc_history)
+    stats = {
+        "turns_sent":      len(chosen),
+        "turns_scanned":   len(turn_times),
+        "turns_unfolded":  sum(1 for t in chosen if until is not None and t <= until),
+        "history_tokens":  sent_tokens,
+        "baseline_tokens": baseline_tokens,
+        "tokens_saved":    max(0, baseline_tokens - sent_tokens),
+        "summarized":      bool(summary),
+        "rehydrated_tools": sum(len(r) for r in rehydrated.values()),
+    }
     preprocess_fn       = get_preprocess_query()
     _, needs_analysis   = preprocess_fn(message)
 
     final_message = message + FEASIBILITY_SYSTEM_NOTE if needs_analysis else message
     lc_history.append(HumanMessage(content=final_message))
 
-    return lc_history
+    return lc_history, stats
 
 
-def persist_messages(session_id: ObjectId, user_id, message: str, reply: str):
+async def persist_messages(session_id: ObjectId, user_id, message: str, reply: str,
+                           history_stats: dict | None = None, tool_log: list | None = None):
     now = datetime.utcnow()
-    messages_col.insert_many([
+    assistant_doc = {
+        "session_id": session_id,
+        "user_id":    user_id,
+        "role":       "assistant",
+        "content":    reply,
+        "created_at": now
+    }
+    if history_stats:
+        assistant_doc["history_stats"] = history_stats
+    if tool_log:
+        assistant_doc["tool_results"] = compact_tool_results(tool_log)
+
+    result = await async_messages_col.insert_many([
         {
             "session_id": session_id,
             "user_id":    user_id,
@@ -116,14 +338,230 @@ def persist_messages(session_id: ObjectId, user_id, message: str, reply: str):
             "content":    message,
             "created_at": now
         },
-        {
-            "session_id": session_id,
-            "user_id":    user_id,
-            "role":       "assistant",
-            "content":    reply,
-            "created_at": now
-        }
+        assistant_doc
     ])
+    _background_executor.submit(
+        _embed_messages, list(zip(result.inserted_ids, [message, reply]))
+    )
+    schedule_summary_refresh(session_id)
+
+
+# ============================================================
+# Background Work: turn embeddings + rolling summary
+# ============================================================
+
+_background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-bg")
+
+
+def _backfill_embeddings(msg_ids: list):
+    try:
+        docs = messages_col.find({"_id": {"$in": msg_ids}}, {"content": 1})
+        _embed_messages([(d["_id"], d["content"]) for d in docs])
+    except Exception as e:
+        print(f"System Log: message embedding failed — {e}")
+
+
+def _embed_messages(items: list):
+    """Store an embedding on each (message _id, content) pair, once."""
+    try:
+        for msg_id, content in items:
+            messages_col.update_one(
+                {"_id": msg_id, "embedding": {"$exists": False}},
+                {"$set": {"embedding": list(_embed_text(content))}}
+            )
+    except Exception as e:
+        print(f"System Log: message embedding failed — {e}")
+
+
+_summary_lock       = threading.Lock()
+_summary_in_flight: set = set()
+
+
+def schedule_summary_refresh(session_id: ObjectId):
+    with _summary_lock:
+        if session_id in _summary_in_flight:
+            return
+        _summary_in_flight.add(session_id)
+    _background_executor.submit(_refresh_session_summary, session_id)
+
+
+def _refresh_session_summary(session_id: ObjectId):
+    """
+    Fold every complete turn older than the SUMMARY_KEEP_RECENT most recent
+    ones into the session's rolling summary.
+    """
+    try:
+        session = sessions_col.find_one({"_id": session_id}, {"summary": 1, "summary_until": 1})
+        if not session:
+            return
+
+        query = {"session_id": session_id}
+        if session.get("summary_until") is not None:
+            query["created_at"] = {"$gt": session["summary_until"]}
+        pending = list(_sorted_messages(query))
+
+        # Whole turns only: a turn is the messages sharing one created_at
+        turn_times = sorted({m["created_at"] for m in pending})
+        fold_times = turn_times[:-SUMMARY_KEEP_RECENT]
+        if len(fold_times) < SUMMARY_MIN_TURNS:
+            return
+
+        cutoff   = fold_times[-1]
+        to_fold  = [m for m in pending if m["created_at"] <= cutoff]
+        summary  = get_summarize_fn()(session.get("summary") or "", to_fold)
+        if not summary:
+            return
+
+        sessions_col.update_one(
+            {"_id": session_id},
+            {"$set": {
+                "summary":            summary,
+                "summary_until":      cutoff,
+                "summary_updated_at": datetime.utcnow()
+            }}
+        )
+    except Exception as e:
+        print(f"System Log: summary refresh failed for {session_id} — {e}")
+    finally:
+        with _summary_lock:
+            _summary_in_flight.discard(session_id)
+
+
+# ============================================================
+# Semantic Answer Cache (first-turn questions only)
+# ============================================================
+
+_semantic_cache   = SemanticCache(threshold=CACHE_THRESHOLD, ttl_seconds=CACHE_TTL_SECONDS)
+_cache_sync_lock  = threading.Lock()
+_cache_synced_at  = None   # utc time of the last sync with answer_cache_col
+_cache_synced_for = None   # index version that sync loaded entries for
+
+
+def _sync_semantic_cache():
+    """
+    Bring this worker's cache in line with answer_cache_col: the first call
+    loads every live entry for the current index version, later ones (at
+    most every CACHE_SYNC_SECONDS) add entries other workers stored and drop
+    entries revoked on any worker since the previous sync. After an index
+    reload the next sync loads the new version's entries in full again (the
+    cache itself drops the old version's on its next lookup).
+    """
+    global _cache_synced_at, _cache_synced_for
+    now = datetime.utcnow()
+    if _cache_synced_at is not None and (now - _cache_synced_at).total_seconds() < CACHE_SYNC_SECONDS:
+        return
+    if not _cache_sync_lock.acquire(blocking=_cache_synced_at is None):
+        return   # another thread is syncing; serve from what is loaded
+    try:
+        if _cache_synced_at is not None and (now - _cache_synced_at).total_seconds() < CACHE_SYNC_SECONDS:
+            return   # a concurrent first call finished the load while this one waited
+        previous = _cache_synced_at
+        version  = get_index_version()
+        if previous is not None:
+            # Overlap the window: created_at is stamped before the insert lands
+            since = previous - timedelta(seconds=CACHE_SYNC_SECONDS)
+            for doc in answer_cache_col.find({"revoked": True, "revoked_at": {"$gte": since}}, {"_id": 1}):
+                _semantic_cache.revoke(str(doc["_id"]))
+        if previous is None or version != _cache_synced_for:
+            since = now - timedelta(seconds=CACHE_TTL_SECONDS)
+
+        for doc in answer_cache_col.find({
+            "index_version": version,
+            "revoked":       {"$ne": True},
+            "created_at":    {"$gte": since}
+        }):
+            _semantic_cache.store(
+                str(doc["_id"]), doc["question"], doc["embedding"], doc["answer"],
+                doc["type"], doc["index_version"],
+                created_at=doc["created_at"].replace(tzinfo=timezone.utc).timestamp()
+            )
+        _cache_synced_at  = now
+        _cache_synced_for = version
+    except Exception as e:
+        print(f"System Log: answer cache sync failed — {e}")
+    finally:
+        _cache_sync_lock.release()
+
+
+async def is_first_turn(session_id: ObjectId) -> bool:
+    return await async_messages_col.find_one({"session_id": session_id}, {"_id": 1}) is None
+
+
+def lookup_cached_answer(message: str) -> dict | None:
+    _sync_semantic_cache()
+    hit = _semantic_cache.lookup(_embed_text(message), get_index_version())
+    if hit:
+        _background_executor.submit(
+            answer_cache_col.update_one,
+            {"_id": ObjectId(hit["id"])},
+            {"$inc": {"hits": 1}, "$set": {"last_hit_at": datetime.utcnow()}}
+        )
+    return hit
+
+
+async def cached_tool_log(hit: dict) -> list:
+    """Tool results behind a cached answer, so follow-ups can still replay them."""
+    doc = await async_answer_cache_col.find_one({"_id": ObjectId(hit["id"])}, {"tool_results": 1})
+    return (doc or {}).get("tool_results", [])
+
+
+def store_cached_answer(message: str, reply: str, tool_log: list):
+    if not reply.strip() or reply.startswith(("System Error", "(No response", "(Round limit")):
+        return
+    _background_executor.submit(_store_cached_answer, message, reply, compact_tool_results(tool_log))
+
+
+def _store_cached_answer(message: str, reply: str, tool_results: list):
+    try:
+        vector  = list(_embed_text(message))
+        version = get_index_version()
+        doc = {
+            "question":      message,
+            "embedding":     vector,
+            "answer":        reply,
+            "type":          detect_response_type(reply),
+            "index_version": version,
+            "tool_results":  tool_results,
+            "created_at":    datetime.utcnow(),
+            "hits":          0
+        }
+        entry_id = answer_cache_col.insert_one(doc).inserted_id
+        _semantic_cache.store(str(entry_id), message, vector, reply, doc["type"], version)
+    except Exception as e:
+        print(f"System Log: answer cache store failed — {e}")
+
+
+# ============================================================
+# Blocking Steps
+# ============================================================
+
+# Agent turns take 10-30 s each, so they get their own pool sized like the
+# 40-thread AnyIO pool the sync handler used to run on; the millisecond
+# steps (cache lookup, history build) stay on the default executor and
+# never queue behind them.
+AGENT_WORKERS   = int(os.getenv("CHAT_AGENT_WORKERS", "40"))
+_agent_executor = ThreadPoolExecutor(max_workers=AGENT_WORKERS, thread_name_prefix="chat-agent")
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """
+    Run a short blocking step of the chat pipeline — query embedding,
+    history build on the sync client — on the default executor so the event
+    loop keeps serving other requests meanwhile.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+def _run_agent_turn(lc_history: list, tool_log: list) -> str:
+    # get_run_agent() imports the agent (and loads its models) on first use
+    return get_run_agent()(lc_history, tool_log=tool_log)
+
+
+async def run_agent_turn(lc_history: list, tool_log: list) -> str:
+    """One agent turn on the dedicated agent pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_agent_executor, _run_agent_turn, lc_history, tool_log)
 
 
 # ============================================================
@@ -131,28 +569,28 @@ def persist_messages(session_id: ObjectId, user_id, message: str, reply: str):
 # ============================================================
 
 @router.post("/session")
-def create_or_resume_session(
+async def create_or_resume_session(
     session_id: str | None = None,
     current_user=Depends(get_current_user)
 ):
     user_id = current_user["_id"]
 
     if session_id:
-        session = sessions_col.find_one({
+        session = await async_sessions_col.find_one({
             "_id": ObjectId(session_id),
             "user_id": user_id
         })
         if not session:
             raise HTTPException(404, "Session not found")
 
-        all_msgs = list(messages_col.find(
+        all_msgs = await async_messages_col.find(
             {"session_id": ObjectId(session_id)},
             {"_id": 0, "role": 1, "content": 1, "created_at": 1}
-        ).sort("created_at", 1))
+        ).sort("created_at", 1).to_list()
 
         return {"session_id": session_id, "history": all_msgs}
 
-    result = sessions_col.insert_one({
+    result = await async_sessions_col.insert_one({
         "user_id":    user_id,
         "created_at": datetime.utcnow()
     })
@@ -164,7 +602,7 @@ def create_or_resume_session(
 # ============================================================
 
 @router.post("/message")
-def chat_message(
+async def chat_message(
     session_id: str,
     message: str,
     current_user=Depends(get_current_user)
@@ -175,22 +613,35 @@ def chat_message(
     except Exception:
         raise HTTPException(400, "Invalid session ID format")
 
-    if not sessions_col.find_one({"_id": sid, "user_id": user_id}):
+    if not await async_sessions_col.find_one({"_id": sid, "user_id": user_id}):
         raise HTTPException(403, "Invalid session")
 
-    lc_history   = build_lc_history(sid, message, get_window_size(message))
-    run_agent_fn = get_run_agent()
+    first_turn = await is_first_turn(sid)
+    cached     = await run_blocking(lookup_cached_answer, message) if first_turn else None
+    if cached:
+        await persist_messages(
+            sid, user_id, message, cached["answer"],
+            {"cache_hit": cached["id"], "similarity": round(cached["similarity"], 4)},
+            await cached_tool_log(cached)
+        )
+        return {"assistant": cached["answer"], "type": cached["type"], "cached": True}
+
+    lc_history, history_stats = await run_blocking(build_lc_history, sid, message)
+    tool_log: list = []
 
     try:
-        assistant_reply = run_agent_fn(lc_history)
+        assistant_reply = await run_agent_turn(lc_history, tool_log)
     except Exception as e:
         raise HTTPException(500, f"Agent error: {e}")
 
-    persist_messages(sid, user_id, message, assistant_reply)
+    await persist_messages(sid, user_id, message, assistant_reply, history_stats, tool_log)
+    if first_turn:
+        store_cached_answer(message, assistant_reply, tool_log)
 
     return {
         "assistant": assistant_reply,
-        "type":      detect_response_type(assistant_reply)
+        "type":      detect_response_type(assistant_reply),
+        "cached":    False
     }
 
 
@@ -222,20 +673,27 @@ async def chat_message_stream(
     except Exception:
         raise HTTPException(400, "Invalid session ID format")
 
-    if not sessions_col.find_one({"_id": sid, "user_id": user_id}):
+    if not await async_sessions_col.find_one({"_id": sid, "user_id": user_id}):
         raise HTTPException(403, "Invalid session")
 
-    lc_history = build_lc_history(sid, message, get_window_size(message))
+    first_turn = await is_first_turn(sid)
+    cached     = await run_blocking(lookup_cached_answer, message) if first_turn else None
+    lc_history, history_stats = (None, None) if cached else await run_blocking(build_lc_history, sid, message)
 
     async def event_generator():
-        loop         = asyncio.get_event_loop()
-        run_agent_fn = get_run_agent()
-
-        try:
-            reply = await loop.run_in_executor(None, run_agent_fn, lc_history)
-        except Exception as e:
-            yield f"data: ERROR: {e}\n\n"
-            return
+        tool_log: list = []
+
+        if cached:
+            reply         = cached["answer"]
+            stats         = {"cache_hit": cached["id"], "similarity": round(cached["similarity"], 4)}
+            tool_log      = await cached_tool_log(cached)
+        else:
+            stats        = history_stats
+            try:
+                reply = await run_agent_turn(lc_history, tool_log)
+            except Exception as e:
+                yield f"data: ERROR: {e}\n\n"
+                return
 
         import json
         # Stream word-by-word so the frontend can render progressively
@@ -250,7 +708,9 @@ async def chat_message_stream(
         yield f"event: done\ndata: {detect_response_type(reply)}\n\n"
 
         # Persist only after streaming is complete
-        persist_messages(sid, user_id, message, reply)
+        await persist_messages(sid, user_id, message, reply, stats, tool_log)
+        if first_turn and not cached:
+            store_cached_answer(message, reply, tool_log)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -260,7 +720,7 @@ async def chat_message_stream(
 # ============================================================
 
 @router.get("/history/{session_id}")
-def get_chat_history(
+async def get_chat_history(
     session_id: str,
     current_user=Depends(get_current_user)
 ):
@@ -270,13 +730,13 @@ def get_chat_history(
     except Exception:
         raise HTTPException(400, "Invalid session ID format")
 
-    if not sessions_col.find_one({"_id": sid, "user_id": user_id}):
+    if not await async_sessions_col.find_one({"_id": sid, "user_id": user_id}):
         raise HTTPException(403, "Invalid session")
 
-    history = list(messages_col.find(
+    history = await async_messages_col.find(
         {"session_id": sid},
         {"_id": 0, "role": 1, "content": 1, "created_at": 1}
-    ).sort("created_at", 1))
+    ).sort("created_at", 1).to_list()
 
     return {"history": history}
 
@@ -286,23 +746,23 @@ def get_chat_history(
 # ============================================================
 
 @router.get("/sessions")
-def list_user_sessions(current_user=Depends(get_current_user)):
+async def list_user_sessions(current_user=Depends(get_current_user)):
     user_id = current_user["_id"]
 
-    sessions = list(sessions_col.find(
+    sessions = await async_sessions_col.find(
         {"user_id": user_id},
         {"_id": 1, "created_at": 1}
-    ).sort("created_at", -1))
+    ).sort("created_at", -1).to_list()
 
     session_ids = [s["_id"] for s in sessions]
 
-    first_messages = messages_col.aggregate([
+    first_messages = await async_messages_col.aggregate([
         {"$match": {"session_id": {"$in": session_ids}, "role": "user"}},
         {"$sort":  {"created_at": 1}},
         {"$group": {"_id": "$session_id", "first_message": {"$first": "$content"}}}
     ])
 
-    first_map = {m["_id"]: m["first_message"] for m in first_messages}
+    first_map = {m["_id"]: m["first_message"] async for m in first_messages}
 
     return [
         {
@@ -319,7 +779,7 @@ def list_user_sessions(current_user=Depends(get_current_user)):
 # ============================================================
 
 @router.delete("/session/{session_id}")
-def delete_session(
+async def delete_session(
     session_id: str,
     current_user=Depends(get_current_user)
 ):
@@ -329,19 +789,114 @@ def delete_session(
     except Exception:
         raise HTTPException(400, "Invalid session ID format")
 
-    result = sessions_col.delete_one({"_id": sid, "user_id": user_id})
+    result = await async_sessions_col.delete_one({"_id": sid, "user_id": user_id})
     if result.deleted_count == 0:
         raise HTTPException(404, "Session not found")
 
-    messages_col.delete_many({"session_id": sid})
+    await async_messages_col.delete_many({"session_id": sid})
     return {"deleted": session_id}
 
 
 
+# ============================================================
+# Answer Cache Audit (committee members only)
+# ============================================================
+
+@router.get("/cache")
+async def get_answer_cache(
+    limit: int = 50,
+    current_user=Depends(require_committee_member)
+):
+    """
+    Hit-rate stats for this worker's cache plus the most-served cached
+    answers across all workers, so they can be reviewed and revoked.
+    """
+    totals = await (await async_answer_cache_col.aggregate([
+        {"$group": {
+            "_id":     None,
+            "entries": {"$sum": 1},
+            "hits":    {"$sum": "$hits"},
+            "revoked": {"$sum": {"$cond": [{"$eq": ["$revoked", True]}, 1, 0]}}
+        }}
+    ])).to_list()
+
+    entries = async_answer_cache_col.find(
+        {}, {"embedding": 0, "tool_results": 0}
+    ).sort([("hits", -1), ("created_at", -1)]).limit(limit)
+
+    return {
+        "worker": _semantic_cache.snapshot(),
+        "totals": {k: v for k, v in (totals[0] if totals else {}).items() if k != "_id"},
+        "entries": [
+            {
+                "entry_id":      str(e["_id"]),
+                "question":      e["question"],
+                "answer":        e["answer"],
+                "type":          e.get("type"),
+                "hits":          e.get("hits", 0),
+                "index_version": e.get("index_version"),
+                "created_at":    e.get("created_at"),
+                "last_hit_at":   e.get("last_hit_at"),
+                "revoked":       e.get("revoked", False)
+            }
+            async for e in entries
+        ]
+    }
+
+
+@router.delete("/cache/{entry_id}")
+async def revoke_cached_answer(
+    entry_id: str,
+    current_user=Depends(require_committee_member)
+):
+    """Stop serving a cached answer. Other workers drop it at their next sync (CACHE_SYNC_SECONDS)."""
+    try:
+        oid = ObjectId(entry_id)
+    except Exception:
+        raise HTTPException(400, "Invalid cache entry ID format")
+
+    result = await async_answer_cache_col.update_one({"_id": oid}, {"$set": {"revoked": True, "revoked_at": datetime.utcnow()}})
+    if result.matched_count == 0:
+        raise HTTPException(404, "Cache entry not found")
+
+    _semantic_cache.revoke(entry_id)
+    return {"revoked": entry_id}
+
+
+# ============================================================
+# Agent Traces & Latency Breakdown (committee members only)
+# ============================================================
+
+@router.get("/traces/latency")
+async def get_trace_latency(
+    hours: float = 24,
+    current_user=Depends(require_committee_member)
+):
+    """p50/p95/p99 per stage (total, router, llm, tool:<name>) across all workers."""
+    return {
+        "hours":  hours,
+        "stages": await stage_latency(async_traces_col, hours),
+        "writer": trace_writer.stats(),
+    }
+
+
+@router.get("/traces")
+async def list_traces(
+    limit: int = 20,
+    outcome: str | None = None,
+    current_user=Depends(require_committee_member)
+):
+    """Most recent agent traces, newest first."""
+    query = {"outcome": outcome} if outcome else {}
+    traces = async_traces_col.find(query, {"timings": 0}).sort("started_at", -1).limit(min(limit, 200))
+    return [{**t, "_id": str(t["_id"])} async for t in traces]
+
+
+
 # CHANGES FORM ORIGINAL
 
 # build_lc_history — single helper that fetches history, runs preprocess_query, and injects the feasibility note in one place instead of duplicating that logic
 # persist_messages — extracted so both /message and /message/stream share identical DB writes
 # detect_response_type — added to both endpoints so the frontend knows whether to render a plain chat bubble, a full analysis report, advisor cards, or a proposal
 # /message/stream — new SSE endpoint; runs the blocking agent in a thread executor so FastAPI stays non-blocking, then streams word-by-word with a done event at the end carrying the response type
-# DELETE /session/{session_id} — bonus endpoint that cleans up both the session document and all its messages, which you'll need for a sidebar "delete chat" button
\ No newline at end of file
+# DELETE /session/{session_id} — bonus endpoint that cleans up both the session document and all its messages, which you'll need for a sidebar "delete chat" button
@@ -1,33 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
-from db.db import db
-from dependencies.auth import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query
+from db.db import adb
+from dependencies.auth import get_auth_context, get_current_user
 from bson import ObjectId
+import asyncio
+import threading
 
 router = APIRouter(prefix="/committee", tags=["Committee"])
 
 @router.get("/dashboard-stats")
-def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
+async def get_dashboard_stats(auth: dict = Depends(get_auth_context)):
     # Verify the user is an advisor and a committee member
-    advisor = db["advisors"].find_one({"advisor_id": current_user["_id"]})
-    if not advisor or not advisor.get("committee_member"):
+    if not auth["committee_member"]:
         # We don't fail hard because this endpoint might be hit by UI proactively
         # but returning empty structure if unauthorized
         raise HTTPException(status_code=403, detail="Access denied. User is not a committee member.")
 
     # 1. Total Enrolled Students (Count from profiles instead of users)
-    total_students = db["profiles"].count_documents({})
+    total_students = await adb["profiles"].count_documents({})
     
     # 2. Total FYDP Groups (Locked Teams)
-    total_groups = db["teams"].count_documents({"is_locked": True})
+    total_groups = await adb["teams"].count_documents({"is_locked": True})
     
     # 3. Industry Stats
-    pending_industry_ideas = db["Industry_Ideas"].count_documents({"status": "pending"})
-    pending_industry_jobs = db["Industry_Jobs"].count_documents({"status": "pending"})
+    pending_industry_ideas = await adb["Industry_Ideas"].count_documents({"status": "pending"})
+    pending_industry_jobs = await adb["Industry_Jobs"].count_documents({"status": "pending"})
     
-    pending_proposals_cursor = db["project_proposals"].find({"status": "advisor_accepted"}).sort("_id", -1).limit(3)
+    pending_proposals_cursor = adb["project_proposals"].find({"status": "advisor_accepted"}).sort("_id", -1).limit(3)
     pending_proposals = []
-    for p in pending_proposals_cursor:
-        pitch = db["student_pitches"].find_one({"team_id": str(p.get("team_id", "")), "status": "accepted"})
+    async for p in pending_proposals_cursor:
+        pitch = await adb["student_pitches"].find_one({"team_id": str(p.get("team_id", "")), "status": "accepted"})
         project_title = pitch.get("title") if pitch else "Untitled Proposal"
         
         pending_proposals.append({
@@ -36,10 +37,10 @@ def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
             "submittedDate": p["_id"].generation_time.strftime("%Y-%m-%d")
         })
         
-    approved_proposals_cursor = db["project_proposals"].find({"status": "committee_accepted"}).sort("_id", -1).limit(3)
+    approved_proposals_cursor = adb["project_proposals"].find({"status": "committee_accepted"}).sort("_id", -1).limit(3)
     approved_proposals = []
-    for p in approved_proposals_cursor:
-        pitch = db["student_pitches"].find_one({"team_id": str(p.get("team_id", "")), "status": "accepted"})
+    async for p in approved_proposals_cursor:
+        pitch = await adb["student_pitches"].find_one({"team_id": str(p.get("team_id", "")), "status": "accepted"})
         project_title = pitch.get("title") if pitch else "Untitled Proposal"
         
         approved_proposals.append({
@@ -48,8 +49,8 @@ def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
             "approvedDate": p["_id"].generation_time.strftime("%Y-%m-%d")
         })
         
-    pending_count = db["project_proposals"].count_documents({"status": "advisor_accepted"})
-    approved_count = db["project_proposals"].count_documents({"status": "committee_accepted"})
+    pending_count = await adb["project_proposals"].count_documents({"status": "advisor_accepted"})
+    approved_count = await adb["project_proposals"].count_documents({"status": "committee_accepted"})
 
     return {
         "students": { "total_enrolled": total_students },
@@ -71,42 +72,41 @@ from pydantic import BaseModel
 from typing import Optional
 
 @router.get("/all-proposals")
-def get_all_proposals(current_user: dict = Depends(get_current_user)):
-    advisor = db["advisors"].find_one({"advisor_id": current_user["_id"]})
-    if not advisor or not advisor.get("committee_member"):
+async def get_all_proposals(auth: dict = Depends(get_auth_context)):
+    if not auth["committee_member"]:
         raise HTTPException(status_code=403, detail="Access denied.")
         
-    proposals_col = db["project_proposals"]
-    teams_col = db["teams"]
-    profiles_col = db["profiles"]
-    pitches_col = db["student_pitches"]
+    proposals_col = adb["project_proposals"]
+    teams_col = adb["teams"]
+    profiles_col = adb["profiles"]
+    pitches_col = adb["student_pitches"]
     
     valid_statuses = ["advisor_accepted", "committee_accepted", "committee_rejected"]
     proposals_cursor = proposals_col.find({"status": {"$in": valid_statuses}}).sort("created_at", -1)
     
     results = []
-    for p in proposals_cursor:
+    async for p in proposals_cursor:
         team_id = p.get("team_id")
         if not team_id: continue
         
-        team = teams_col.find_one({"_id": ObjectId(team_id)})
+        team = await teams_col.find_one({"_id": ObjectId(team_id)})
         if not team: continue
         
-        pitch = pitches_col.find_one({"team_id": str(team_id), "status": "accepted"})
+        pitch = await pitches_col.find_one({"team_id": str(team_id), "status": "accepted"})
         project_title = pitch.get("title", "Untitled Proposal") if pitch else "Untitled Proposal"
         project_summary = pitch.get("summary", "") if pitch else ""
         advisor_id_str = pitch.get("advisor_id") if pitch else None
         
         advisor_name = "Unknown Advisor"
         if advisor_id_str:
-            adv_profile = db["advisors"].find_one({"advisor_id": ObjectId(advisor_id_str)})
+            adv_profile = await adb["advisors"].find_one({"advisor_id": ObjectId(advisor_id_str)})
             if adv_profile:
                 advisor_name = adv_profile.get("name", "Unknown Advisor")
         
         members_data = []
         for member_id in team.get("members", []):
             try:
-                prof = profiles_col.find_one({"user_id": ObjectId(member_id)})
+                prof = await profiles_col.find_one({"user_id": ObjectId(member_id)})
                 if prof:
                     members_data.append({
                         "name": prof.get("name", "Unknown"),
@@ -135,17 +135,16 @@ class CommitteeReviewPayload(BaseModel):
     comment: Optional[str] = None
 
 @router.post("/review-proposal/{proposal_id}")
-def review_proposal(proposal_id: str, payload: CommitteeReviewPayload, current_user: dict = Depends(get_current_user)):
-    advisor = db["advisors"].find_one({"advisor_id": current_user["_id"]})
-    if not advisor or not advisor.get("committee_member"):
+async def review_proposal(proposal_id: str, payload: CommitteeReviewPayload, current_user: dict = Depends(get_current_user), auth: dict = Depends(get_auth_context)):
+    if not auth["committee_member"]:
         raise HTTPException(status_code=403, detail="Access denied.")
         
     if payload.action not in ["accepted", "rejected"]:
         raise HTTPException(status_code=400, detail="Invalid action.")
         
-    proposals_col = db["project_proposals"]
+    proposals_col = adb["project_proposals"]
     try:
-        proposal = proposals_col.find_one({"_id": ObjectId(proposal_id)})
+        proposal = await proposals_col.find_one({"_id": ObjectId(proposal_id)})
     except:
         raise HTTPException(status_code=400, detail="Invalid Proposal ID")
         
@@ -162,7 +161,7 @@ def review_proposal(proposal_id: str, payload: CommitteeReviewPayload, current_u
     
     new_status = f"committee_{payload.action}"
     
-    proposals_col.update_one(
+    await proposals_col.update_one(
         {"_id": ObjectId(proposal_id)},
         {
             "$set": {"status": new_status},
@@ -174,10 +173,10 @@ def review_proposal(proposal_id: str, payload: CommitteeReviewPayload, current_u
     if payload.action == "accepted":
         team_id = proposal.get("team_id")
         if team_id:
-            team = db["teams"].find_one({"_id": ObjectId(team_id)})
+            team = await adb["teams"].find_one({"_id": ObjectId(team_id)})
             if team:
                 member_ids = [ObjectId(m) for m in team.get("members", [])]
-                db["profiles"].update_many(
+                await adb["profiles"].update_many(
                     {"user_id": {"$in": member_ids}},
                     {"$set": {
                         "stages.stage3_completed": True,
@@ -186,3 +185,64 @@ def review_proposal(proposal_id: str, payload: CommitteeReviewPayload, current_u
                 )
                 
     return {"message": f"Proposal committee {payload.action} successfully."}
+
+
+# ============================================================
+# Archive Analytics (materialized stats cube)
+# ============================================================
+
+_cube = None
+_cube_mtime = None
+_cube_lock = threading.Lock()
+
+
+def get_stats_cube():
+    """The saved cube, re-read when an index build rewrites it; built on first use if missing."""
+    global _cube, _cube_mtime
+    from ai.stats_cube import STATS_CUBE_PATH, StatsCube, rebuild_stats_cube
+    from ai.archive import load_archive_documents
+
+    with _cube_lock:
+        mtime = STATS_CUBE_PATH.stat().st_mtime if STATS_CUBE_PATH.exists() else None
+        if mtime is None:
+            _cube = rebuild_stats_cube(load_archive_documents())
+            _cube_mtime = STATS_CUBE_PATH.stat().st_mtime
+        elif _cube is None or mtime != _cube_mtime:
+            _cube = StatsCube.load() or _cube
+            _cube_mtime = mtime
+        return _cube
+
+
+@router.get("/archive-analytics")
+async def get_archive_analytics(
+    group_by: str = Query("batch", description="Comma-separated: batch, advisor, pattern"),
+    batch_from: int | None = None,
+    batch_to: int | None = None,
+    advisor: str | None = None,
+    pattern: str | None = None,
+    auth: dict = Depends(get_auth_context)
+):
+    if not auth["committee_member"]:
+        raise HTTPException(status_code=403, detail="Access denied. User is not a committee member.")
+
+    from ai.stats_cube import DIMENSIONS
+    dims = [d.strip() for d in group_by.split(",") if d.strip()]
+    if not dims or any(d not in DIMENSIONS for d in dims) or len(set(dims)) != len(dims):
+        raise HTTPException(status_code=400, detail=f"group_by must be a subset of {', '.join(DIMENSIONS)}")
+
+    # First use (or a rewritten cube file) loads from disk: keep it off the event loop
+    cube = await asyncio.get_running_loop().run_in_executor(None, get_stats_cube)
+    return {
+        "group_by": dims,
+        "measure":  "pattern_occurrences" if "pattern" in dims or pattern else "projects",
+        "rows":     cube.query(dims, batch_from, batch_to, advisor, pattern),
+    }
+
+
+@router.get("/archive-analytics/summary")
+async def get_archive_analytics_summary(auth: dict = Depends(get_auth_context)):
+    if not auth["committee_member"]:
+        raise HTTPException(status_code=403, detail="Access denied. User is not a committee member.")
+
+    cube = await asyncio.get_running_loop().run_in_executor(None, get_stats_cube)
+    return cube.summary()
@@ -4,11 +4,12 @@ from bson import ObjectId
 from bson.errors import InvalidId
 from typing import Optional
 from schemas.fydp_ideas_by_advisor import FypIdeaByAdvisor
-from db.db import db, fs
+from db.db import adb, async_fs
+from utils.mongo import stream_grid_out
 
 router = APIRouter()
-advisor_ideas_col = db["Advisor_ideas"]
-advisors_col = db["advisors"]
+advisor_ideas_col = adb["Advisor_ideas"]
+advisors_col = adb["advisors"]
 
 # ------------------- POST: Add FYP Idea -------------------
 @router.post("/advisor_ideas")
@@ -49,7 +50,7 @@ async def ideabyadvisor(
             raise HTTPException(status_code=400, detail="Only PNG or JPG images allowed")
 
         image_bytes = await flowchart_image.read()
-        image_id = fs.put(
+        image_id = await async_fs.put(
             image_bytes,
             filename=flowchart_image.filename,
             contentType=flowchart_image.content_type
@@ -67,7 +68,7 @@ async def ideabyadvisor(
         "advisor_id": advisor_obj_id,
         "industry_name": industry_name
     }
-    duplicate = advisor_ideas_col.find_one(duplicate_query)
+    duplicate = await advisor_ideas_col.find_one(duplicate_query)
     if duplicate:
         raise HTTPException(
             status_code=400,
@@ -87,7 +88,7 @@ async def ideabyadvisor(
         "skills_required": skills_list
     }
 
-    result = advisor_ideas_col.insert_one(idea_doc)
+    result = await advisor_ideas_col.insert_one(idea_doc)
 
     return {
         "fyp_idea_id": str(result.inserted_id),
@@ -98,17 +99,17 @@ async def ideabyadvisor(
 
 
 @router.get("/advisor_ideas/top3")
-def get_top_3_recent_ideas():
+async def get_top_3_recent_ideas():
     ideas = advisor_ideas_col.find(
         {},                 # no filter
         {"_id": 0, "title": 1}  # exclude _id, include title only
     ).sort("_id", -1).limit(3)
 
-    return [idea["title"] for idea in ideas]
+    return [idea["title"] async for idea in ideas]
 
 
 @router.get("/advisor_ideas/my-ideas")
-def get_my_ideas(
+async def get_my_ideas(
     advisor_id: str = Query(...),
     source_type: str = Query("advisor", description="advisor | industry")
 ):
@@ -133,12 +134,12 @@ def get_my_ideas(
             "idea_id": str(idea["_id"]),
             "title": idea.get("title", "")
         }
-        for idea in ideas
+        async for idea in ideas
     ]
 
 
 @router.get("/advisor_ideas")
-def get_advisor_ideas(
+async def get_advisor_ideas(
     advisor_id: str | None = Query(None),
     sort: str | None = Query(None, description="az | za"),
     page: int = Query(1, ge=1),
@@ -168,13 +169,13 @@ def get_advisor_ideas(
 
     cursor = cursor.skip(skip).limit(limit)
 
-    total = advisor_ideas_col.count_documents(query)
+    total = await advisor_ideas_col.count_documents(query)
 
     ideas = []
-    for doc in cursor:
+    async for doc in cursor:
         advisor_name = None
         if doc.get("advisor_id"):
-            advisor_doc = advisors_col.find_one({"advisor_id": doc["advisor_id"]})
+            advisor_doc = await advisors_col.find_one({"advisor_id": doc["advisor_id"]})
             advisor_name = advisor_doc.get("name") if advisor_doc else None
         
         ideas.append({
@@ -204,17 +205,17 @@ def get_advisor_ideas(
 # -------------------
 
 @router.get("/advisor_ideas/image/{image_id}")
-def get_flowchart_image(image_id: str):
+async def get_flowchart_image(image_id: str):
     """
     Serve flowchart image from GridFS.
     """
     try:
-        grid_out = fs.get(ObjectId(image_id))
+        grid_out = await async_fs.get(ObjectId(image_id))
     except:
         raise HTTPException(status_code=404, detail="Image not found")
     
     return StreamingResponse(
-        grid_out,
+        stream_grid_out(grid_out),
         media_type=grid_out.content_type or "image/png",
         headers={"Content-Disposition": f'inline; filename="{grid_out.filename}"'}
     )
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, HTTPException, Depends
-from db.db import db
+from db.db import adb
 from schemas.industry_idea import IndustryIdea, IndustryIdeaStatusUpdate, ApprovedIdeaResponse, MyIdeaResponse
 from bson import ObjectId
 from dependencies.auth import get_current_user   # JWT dependency
 from typing import List
 
 router = APIRouter()
-industry_ideas_col = db["Industry_Ideas"]
+industry_ideas_col = adb["Industry_Ideas"]
 
 # ---------------- POST API ----------------
 @router.post("/industry/ideas")
-def create_industry_idea(
+async def create_industry_idea(
     idea: IndustryIdea,
     current_user: dict = Depends(get_current_user)  # JWT provides logged-in user
 ):
@@ -27,7 +27,7 @@ def create_industry_idea(
     }
 
     # Check for duplicate idea (title + description + industry_id)
-    duplicate_check = industry_ideas_col.find_one({
+    duplicate_check = await industry_ideas_col.find_one({
         "title": idea_doc["title"],
         "description": idea_doc["description"],
         "industry_id": ObjectId(user_industry_id)
@@ -39,7 +39,7 @@ def create_industry_idea(
             detail="An industry idea with the same title and description already exists."
         )
 
-    result = industry_ideas_col.insert_one(idea_doc)    
+    result = await industry_ideas_col.insert_one(idea_doc)    
     
     return {
         "message": "Industry idea submitted successfully and the status is pending for approval",
@@ -49,14 +49,14 @@ def create_industry_idea(
 
 
 @router.patch("/industry/ideas/{idea_id}/status")
-def update_industry_idea_status(
+async def update_industry_idea_status(
     idea_id: str,
     data: IndustryIdeaStatusUpdate
 ):
     if not ObjectId.is_valid(idea_id):
         raise HTTPException(status_code=400, detail="Invalid idea ID")
 
-    result = industry_ideas_col.update_one(
+    result = await industry_ideas_col.update_one(
         {"_id": ObjectId(idea_id)},
         {
             "$set": {
@@ -75,7 +75,7 @@ def update_industry_idea_status(
 
 
 @router.get("/industry/ideas/approved", response_model=List[ApprovedIdeaResponse])
-def get_approved_industry_ideas():
+async def get_approved_industry_ideas():
     """
     Get ALL approved industry ideas from ALL industries with their company profiles.
     Also includes advisor's gsuite_id if an advisor is assigned.
@@ -86,9 +86,9 @@ def get_approved_industry_ideas():
     # Get all approved ideas
     cursor = industry_ideas_col.find({"status": "approved"})
     
-    for doc in cursor:
+    async for doc in cursor:
         # Get the industry profile for each idea
-        industry_profile = db["industry_profiles"].find_one({
+        industry_profile = await adb["industry_profiles"].find_one({
             "industry_id": doc["industry_id"]
         })
         
@@ -100,7 +100,7 @@ def get_approved_industry_ideas():
         
         # If the idea has an advisor_id, look up the advisor's gsuite_id
         if doc.get("industry_id"):
-            industry = db["users"].find_one({
+            industry = await adb["users"].find_one({
                 "_id": ObjectId(doc["industry_id"])
             })
             
@@ -128,7 +128,7 @@ def get_approved_industry_ideas():
 
 
 @router.get("/industry/ideas/pending", response_model=List[ApprovedIdeaResponse])
-def get_pending_industry_ideas():
+async def get_pending_industry_ideas():
     """
     Get ALL pending industry ideas from ALL industries with their company profiles.
     Public endpoint - no authentication required.
@@ -138,9 +138,9 @@ def get_pending_industry_ideas():
     # Get all pending ideas
     cursor = industry_ideas_col.find({"status": "pending"})
     
-    for doc in cursor:
+    async for doc in cursor:
         # Get the industry profile for each idea
-        industry_profile = db["industry_profiles"].find_one({
+        industry_profile = await adb["industry_profiles"].find_one({
             "industry_id": doc["industry_id"]
         })
         
@@ -152,7 +152,7 @@ def get_pending_industry_ideas():
         
         # If the idea has an industry_id, look up the industry's gsuite_id
         if doc.get("industry_id"):
-            industry = db["users"].find_one({
+            industry = await adb["users"].find_one({
                 "_id": ObjectId(doc["industry_id"])
             })
             
@@ -178,7 +178,7 @@ def get_pending_industry_ideas():
     return ideas
 
 @router.get("/industry/ideas/my-ideas", response_model=List[MyIdeaResponse])
-def get_my_industry_ideas(
+async def get_my_industry_ideas(
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -191,7 +191,7 @@ def get_my_industry_ideas(
     cursor = industry_ideas_col.find({"industry_id": ObjectId(user_industry_id)})
     
     # Get the industry profile once
-    industry_profile = db["industry_profiles"].find_one({
+    industry_profile = await adb["industry_profiles"].find_one({
         "industry_id": ObjectId(user_industry_id)
     })
     
@@ -206,7 +206,7 @@ def get_my_industry_ideas(
             "location": "Unknown"
         }
         
-    for doc in cursor:
+    async for doc in cursor:
         ideas.append(MyIdeaResponse(
             idea_id=str(doc["_id"]),
             title=doc["title"],
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from bson import ObjectId
 from datetime import datetime
 
-from db.db import db
+from db.db import adb
 from dependencies.auth import get_current_user
 from utils.scoring import calculate_match_scores
 from utils.mongo import serialize_mongo
@@ -10,14 +10,14 @@ from utils.mongo import serialize_mongo
 
 router = APIRouter(prefix="/industry-projects", tags=["Industry Projects"])
 
-profiles_col = db["profiles"]
-teams_col = db["teams"]
-industry_projects_col = db["Industry_Ideas"]
-industry_interested_col = db["industry_interested_teams"]
+profiles_col = adb["profiles"]
+teams_col = adb["teams"]
+industry_projects_col = adb["Industry_Ideas"]
+industry_interested_col = adb["industry_interested_teams"]
 
 
 @router.post("/{project_id}/interested", status_code=status.HTTP_201_CREATED)
-def mark_interested(
+async def mark_interested(
     project_id: str,
     current_user: dict = Depends(get_current_user)
 ):
@@ -33,34 +33,32 @@ def mark_interested(
     """
     user_id = ObjectId(current_user["_id"])
 
-    profile = profiles_col.find_one({"user_id": user_id})
+    profile = await profiles_col.find_one({"user_id": user_id})
     if not profile or not profile.get("team_id"):
         raise HTTPException(400, "User is not part of a team")
 
     team_id = profile["team_id"]
 
-    team = teams_col.find_one({"final_team_id": team_id})
+    team = await teams_col.find_one({"final_team_id": team_id})
     if not team:
         raise HTTPException(404, "Team not found")
 
-    if industry_interested_col.find_one({
+    if await industry_interested_col.find_one({
         "project_id": ObjectId(project_id),
         "team_id": team_id
     }):
         raise HTTPException(409, "Team already marked interest in this industry project")
 
-    project = industry_projects_col.find_one({"_id": ObjectId(project_id)})
+    project = await industry_projects_col.find_one({"_id": ObjectId(project_id)})
     if not project:
         raise HTTPException(404, "Project not found")
 
     if project.get("status") != "approved":
         raise HTTPException(400, "Only approved industry projects can be applied to")
 
-    team_profiles = list(
-        profiles_col.find({
-            "user_id": {"$in": [ObjectId(uid) for uid in team["members"]]}
-        })
-    )
+    team_profiles = await profiles_col.find({
+        "user_id": {"$in": [ObjectId(uid) for uid in team["members"]]}
+    }).to_list()
 
     # Industry ideas use expected_skills and technology_stack. We'll use expected_skills for scoring.
     # We can combine expected_skills and technology_stack if we want to be thorough.
@@ -73,7 +71,7 @@ def mark_interested(
         unique_skills_required
     )
 
-    industry_interested_col.insert_one({
+    await industry_interested_col.insert_one({
         "industry_id": project.get("industry_id"),
         "project_id": ObjectId(project_id),
         "team_id": team_id,
@@ -93,32 +91,30 @@ def mark_interested(
 
 
 @router.get("/team/my-interests")
-def my_team_interests(current_user: dict = Depends(get_current_user)):
+async def my_team_interests(current_user: dict = Depends(get_current_user)):
     """
     Returns a list of all Industry projects the current user's team has shown interest in.
     """
     user_id = ObjectId(current_user["_id"])
     
-    profile = profiles_col.find_one({"user_id": user_id})
+    profile = await profiles_col.find_one({"user_id": user_id})
     if not profile or not profile.get("team_id"):
         return []
 
     team_id = profile["team_id"]
     
     try:
-        data = list(
-            industry_interested_col.find(
-                {"team_id": team_id},
-                {"_id": 0}
-            ).sort("created_at", -1)
-        )
+        data = await industry_interested_col.find(
+            {"team_id": team_id},
+            {"_id": 0}
+        ).sort("created_at", -1).to_list()
         return serialize_mongo(data)
     except Exception as e:
         print(f"Error fetching team industry interests: {e}")
         return []
 
 @router.get("/industry/interested-groups")
-def get_industry_interested_groups(current_user: dict = Depends(get_current_user)):
+async def get_industry_interested_groups(current_user: dict = Depends(get_current_user)):
     """
     Returns a list of all groups that have shown interest in the logged-in industry user's ideas.
     """
@@ -126,7 +122,7 @@ def get_industry_interested_groups(current_user: dict = Depends(get_current_user
     
     try:
         # Fetch all interest records matching the industry_id
-        interests = list(industry_interested_col.find({"industry_id": industry_id}))
+        interests = await industry_interested_col.find({"industry_id": industry_id}).to_list()
         
         # Enrich the records with Idea titles
         result = []
@@ -134,7 +130,7 @@ def get_industry_interested_groups(current_user: dict = Depends(get_current_user
             record = serialize_mongo(interest)
             
             # Lookup the idea title
-            idea = industry_projects_col.find_one({"_id": ObjectId(interest["project_id"])})
+            idea = await industry_projects_col.find_one({"_id": ObjectId(interest["project_id"])})
             if idea:
                 record["idea_title"] = idea.get("title", "Unknown Idea")
                 
@@ -148,11 +144,11 @@ def get_industry_interested_groups(current_user: dict = Depends(get_current_user
                         except Exception:
                             uid_obj = uid_str
                             
-                        profile = profiles_col.find_one({"user_id": uid_obj})
+                        profile = await profiles_col.find_one({"user_id": uid_obj})
                         mem["name"] = profile.get("name", "Unknown Member") if profile else "Unknown Member"
                         mem["roll_number"] = profile.get("roll_number", "") if profile else ""
                         
-                        user_doc = db["users"].find_one({"_id": uid_obj})
+                        user_doc = await adb["users"].find_one({"_id": uid_obj})
                         if user_doc:
                             mem["email"] = user_doc.get("email") or user_doc.get("gsuite_id") or "Unknown Email"
                         else:
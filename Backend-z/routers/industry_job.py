@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
-from db.db import db
+from db.db import adb
 from schemas.industry_job import IndustryJobPosting, IndustryJobStatusUpdate, IndustryJobResponse, MyIndustryJobResponse
 from bson import ObjectId
 from dependencies.auth import get_current_user   # JWT dependency
@@ -7,11 +7,11 @@ from typing import List
 from fastapi import Depends
 
 router = APIRouter()
-industry_jobs_col = db["Industry_Jobs"]
+industry_jobs_col = adb["Industry_Jobs"]
 
 # ---------------- POST API ----------------
 @router.post("/industry/jobs")
-def create_industry_job(
+async def create_industry_job(
     job: IndustryJobPosting,
     current_user: dict = Depends(get_current_user)  # JWT provides logged-in user
 ):
@@ -31,7 +31,7 @@ def create_industry_job(
     }
 
     # Check for duplicate job (title + description + industry_id)
-    duplicate_check = industry_jobs_col.find_one({
+    duplicate_check = await industry_jobs_col.find_one({
         "title": job_doc["title"],
         "description": job_doc["description"],
         "industry_id": ObjectId(user_industry_id)
@@ -43,7 +43,7 @@ def create_industry_job(
             detail="An industry job posting with the same title and description already exists."
         )
 
-    result = industry_jobs_col.insert_one(job_doc)    
+    result = await industry_jobs_col.insert_one(job_doc)    
     
     return {
         "message": "Industry job/internship/training submitted successfully and is pending approval",
@@ -54,14 +54,14 @@ def create_industry_job(
 
 # ---------------- PATCH API ----------------
 @router.patch("/industry/jobs/{job_id}/status")
-def update_industry_job_status(
+async def update_industry_job_status(
     job_id: str,
     data: IndustryJobStatusUpdate
 ):
     if not ObjectId.is_valid(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID")
 
-    result = industry_jobs_col.update_one(
+    result = await industry_jobs_col.update_one(
         {"_id": ObjectId(job_id)},
         {"$set": {"status": data.status}}
     )
@@ -76,7 +76,7 @@ def update_industry_job_status(
     
     
 @router.get("/industry/jobs/approved", response_model=List[IndustryJobResponse])
-def get_approved_industry_jobs():
+async def get_approved_industry_jobs():
     """
     Get ALL approved industry jobs from ALL industries with their company profiles.
     Public endpoint - no authentication required.
@@ -86,9 +86,9 @@ def get_approved_industry_jobs():
     # Get all approved jobs
     cursor = industry_jobs_col.find({"status": "approved"})
     
-    for doc in cursor:
+    async for doc in cursor:
         # Get the industry profile for each job
-        industry_profile = db["industry_profiles"].find_one({
+        industry_profile = await adb["industry_profiles"].find_one({
             "industry_id": doc["industry_id"]
         })
         
@@ -100,7 +100,7 @@ def get_approved_industry_jobs():
         
         # If the idea has an advisor_id, look up the advisor's gsuite_id
         if doc.get("industry_id"):
-            industry = db["users"].find_one({
+            industry = await adb["users"].find_one({
                 "_id": ObjectId(doc["industry_id"])
             })
             
@@ -130,7 +130,7 @@ def get_approved_industry_jobs():
 
 
 @router.get("/industry/jobs/pending", response_model=List[IndustryJobResponse])
-def get_pending_industry_jobs():
+async def get_pending_industry_jobs():
     """
     Get ALL pending industry jobs from ALL industries with their company profiles.
     Public endpoint - no authentication required.
@@ -140,9 +140,9 @@ def get_pending_industry_jobs():
     # Get all pending jobs
     cursor = industry_jobs_col.find({"status": "pending"})
     
-    for doc in cursor:
+    async for doc in cursor:
         # Get the industry profile for each job
-        industry_profile = db["industry_profiles"].find_one({
+        industry_profile = await adb["industry_profiles"].find_one({
             "industry_id": doc["industry_id"]
         })
         
@@ -154,7 +154,7 @@ def get_pending_industry_jobs():
         
         # If the job has an industry_id, look up the industry's gsuite_id
         if doc.get("industry_id"):
-            industry = db["users"].find_one({
+            industry = await adb["users"].find_one({
                 "_id": ObjectId(doc["industry_id"])
             })
             
@@ -182,7 +182,7 @@ def get_pending_industry_jobs():
     return jobs
 
 @router.get("/industry/jobs/my-jobs", response_model=List[MyIndustryJobResponse])
-def get_my_industry_jobs(
+async def get_my_industry_jobs(
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -195,7 +195,7 @@ def get_my_industry_jobs(
     cursor = industry_jobs_col.find({"industry_id": ObjectId(user_industry_id)})
     
     # Get the industry profile once
-    industry_profile = db["industry_profiles"].find_one({
+    industry_profile = await adb["industry_profiles"].find_one({
         "industry_id": ObjectId(user_industry_id)
     })
     
@@ -210,7 +210,7 @@ def get_my_industry_jobs(
             "location": "Unknown"
         }
         
-    for doc in cursor:
+    async for doc in cursor:
         jobs.append(MyIndustryJobResponse(
             job_id=str(doc["_id"]),
             title=doc["title"],
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from db.db import db
+from db.db import adb
 from fastapi import FastAPI, HTTPException
 from schemas.invites import InviteCreate, InviteOut, InviteAction, LockAction
 from bson import ObjectId
@@ -13,9 +13,9 @@ router = APIRouter()
 app = FastAPI()
 app.include_router(router)
 
-profiles_col = db["profiles"]
-invite_col = db['fydp_group_invites']
-teams_col = db['teams'] 
+profiles_col = adb["profiles"]
+invite_col = adb['fydp_group_invites']
+teams_col = adb['teams'] 
 
 # ---------------- WebSocket connections ----------------
 active_connections = {}
@@ -38,13 +38,13 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
 
 # ---------------- Users ----------------
 @router.get("/users")
-def get_all_users(current_user: dict = Depends(get_current_user)):
+async def get_all_users(current_user: dict = Depends(get_current_user)):
     # Get current user's ID
     current_user_id = str(current_user["_id"])
     
     # Get all users EXCEPT current user
     users = []
-    for doc in profiles_col.find({}, {"name": 1, "user_id": 1, "_id": 0}):
+    async for doc in profiles_col.find({}, {"name": 1, "user_id": 1, "_id": 0}):
         user_id = str(doc["user_id"])
         
         # Skip current user
@@ -52,7 +52,7 @@ def get_all_users(current_user: dict = Depends(get_current_user)):
             continue
         
         # Check if user is in any team
-        team_info = teams_col.find_one({
+        team_info = await teams_col.find_one({
             "$or": [
                 {"leader": user_id},
                 {"members": user_id}
@@ -86,17 +86,17 @@ async def send_invite(invite: InviteCreate, current_user: dict = Depends(get_cur
         raise HTTPException(400, "Cannot invite yourself")
     
     # 2. Check if sender is in locked team
-    locked_team = teams_col.find_one({"members": sender_id, "is_locked": True})
+    locked_team = await teams_col.find_one({"members": sender_id, "is_locked": True})
     if locked_team:
         raise HTTPException(400, "You are in a locked team. Cannot send invites.")
     
     # 3. Check if receiver is in locked team
-    receiver_locked_team = teams_col.find_one({"members": invite.receiver_id, "is_locked": True})
+    receiver_locked_team = await teams_col.find_one({"members": invite.receiver_id, "is_locked": True})
     if receiver_locked_team:
         raise HTTPException(400, "Receiver is already in a locked team")
     
     # ========== 4. Check duplicate invite FIRST ==========
-    existing = invite_col.find_one({
+    existing = await invite_col.find_one({
         "sender_id": sender_id,
         "receiver_id": invite.receiver_id,
         "status": {"$ne": "rejected"}
@@ -106,12 +106,12 @@ async def send_invite(invite: InviteCreate, current_user: dict = Depends(get_cur
     
     # ========== 5. Check group capacity ==========
     # Count ACCEPTED group members (including yourself)
-    accepted_invites = list(invite_col.find({
+    accepted_invites = await invite_col.find({
         "$or": [
             {"sender_id": sender_id, "status": "accepted"},
             {"receiver_id": sender_id, "status": "accepted"}
         ]
-    }))
+    }).to_list()
     
     group_members = set()
     for inv in accepted_invites:
@@ -129,7 +129,7 @@ async def send_invite(invite: InviteCreate, current_user: dict = Depends(get_cur
     
     # ========== 6. Check pending invites ==========
     # Count PENDING invites (not total invites)
-    pending_count = invite_col.count_documents({
+    pending_count = await invite_col.count_documents({
         "sender_id": sender_id,
         "status": "pending"
     })
@@ -144,12 +144,12 @@ async def send_invite(invite: InviteCreate, current_user: dict = Depends(get_cur
             raise HTTPException(400, f"Group has {current_members} members. Already have {pending_count} pending invites.")    
     
     # ========== Create group_id ==========
-    sender_accepted_invites = list(invite_col.find({
+    sender_accepted_invites = await invite_col.find({
     "$or": [
         {"sender_id": sender_id, "status": "accepted"},
         {"receiver_id": sender_id, "status": "accepted"}
     ]
-    }))
+    }).to_list()
 
     if sender_accepted_invites:
         group_id = sender_accepted_invites[0]["group_id"]  # Use existing group
@@ -157,7 +157,7 @@ async def send_invite(invite: InviteCreate, current_user: dict = Depends(get_cur
         group_id = str(ObjectId())  # Create new group if sender has no group
     
     # ========== Insert invite ==========
-    result = invite_col.insert_one({
+    result = await invite_col.insert_one({
         "sender_id": sender_id,
         "receiver_id": invite.receiver_id,
         "group_id": group_id,
@@ -190,7 +190,7 @@ async def respond_to_invite(
     except:
         raise HTTPException(400, "Invalid invite ID")
     
-    invite = invite_col.find_one({"_id": invite_id})
+    invite = await invite_col.find_one({"_id": invite_id})
     if not invite:
         raise HTTPException(404, "Invite not found")
     
@@ -216,19 +216,19 @@ async def respond_to_invite(
     
     if invite_action.action == "accepted":
         # Check if user is already in a locked team
-        locked_team = teams_col.find_one({"members": user_id, "is_locked": True})
+        locked_team = await teams_col.find_one({"members": user_id, "is_locked": True})
         if locked_team:
             raise HTTPException(400, "You are already in a locked team")
         
         sender_id = invite["sender_id"]
         
         # Check if SENDER is already in an accepted group (they might have joined one after sending this invite)
-        sender_accepted_invites = list(invite_col.find({
+        sender_accepted_invites = await invite_col.find({
             "$or": [
                 {"sender_id": sender_id, "status": "accepted"},
                 {"receiver_id": sender_id, "status": "accepted"}
             ]
-        }))
+        }).to_list()
         
         if sender_accepted_invites:
             target_group_id = sender_accepted_invites[0]["group_id"]
@@ -236,32 +236,32 @@ async def respond_to_invite(
             target_group_id = invite["group_id"]
         
         # Get sender's current group members
-        sender_invites = list(invite_col.find({
+        sender_invites = await invite_col.find({
             "group_id": target_group_id,
             "status": "accepted"
-        }))
+        }).to_list()
         sender_group_members = set([sender_id])
         for inv in sender_invites:
             sender_group_members.add(inv["sender_id"])
             sender_group_members.add(inv["receiver_id"])
             
         # Get receiver's current group members
-        receiver_accepted_invites = list(invite_col.find({
+        receiver_accepted_invites = await invite_col.find({
             "$or": [
                 {"sender_id": user_id, "status": "accepted"},
                 {"receiver_id": user_id, "status": "accepted"}
             ]
-        }))
+        }).to_list()
         
         receiver_group_members = set([user_id])
         receiver_group_id = None
         if receiver_accepted_invites:
             receiver_group_id = receiver_accepted_invites[0]["group_id"]
             # Get all invites from receiver's group
-            receiver_group_all_invites = list(invite_col.find({
+            receiver_group_all_invites = await invite_col.find({
                 "group_id": receiver_group_id,
                 "status": "accepted"
-            }))
+            }).to_list()
             for inv in receiver_group_all_invites:
                 receiver_group_members.add(inv["sender_id"])
                 receiver_group_members.add(inv["receiver_id"])
@@ -273,20 +273,20 @@ async def respond_to_invite(
             
         # Update receiver's entire old group to new group_id
         if receiver_group_id and receiver_group_id != target_group_id:
-            invite_col.update_many(
+            await invite_col.update_many(
                 {"group_id": receiver_group_id, "status": "accepted"},
                 {"$set": {"group_id": target_group_id}}
             )
             
         # Update this invite
-        invite_col.update_one(
+        await invite_col.update_one(
             {"_id": invite_id},
             {"$set": {"status": "accepted", "group_id": target_group_id}}
         )
     
     else:  # "rejected" action
         # Just update status
-        invite_col.update_one(
+        await invite_col.update_one(
             {"_id": invite_id},
             {"$set": {"status": "rejected"}}
         )
@@ -307,17 +307,17 @@ async def leave_temporary_group(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
     
     # Check if user is in a locked team
-    locked_team = teams_col.find_one({"members": user_id, "is_locked": True})
+    locked_team = await teams_col.find_one({"members": user_id, "is_locked": True})
     if locked_team:
         raise HTTPException(400, "Cannot leave a locked team")
     
     # Find all invites where user is involved
-    user_invites = list(invite_col.find({
+    user_invites = await invite_col.find({
         "$or": [
             {"sender_id": user_id, "status": "accepted"},
             {"receiver_id": user_id, "status": "accepted"}
         ]
-    }))
+    }).to_list()
     
     if not user_invites:
         raise HTTPException(400, "You are not in any temporary group")
@@ -327,10 +327,10 @@ async def leave_temporary_group(current_user: dict = Depends(get_current_user)):
         original_group_id = user_invites[0]["group_id"]
         
         # Find ALL members in the original group
-        all_group_invites = list(invite_col.find({
+        all_group_invites = await invite_col.find({
             "group_id": original_group_id,
             "status": "accepted"
-        }))
+        }).to_list()
         
         original_members = set()
         for inv in all_group_invites:
@@ -348,7 +348,7 @@ async def leave_temporary_group(current_user: dict = Depends(get_current_user)):
             # Delete ALL old invites between remaining members (from original group)
             for i in range(len(remaining_members)):
                 for j in range(i + 1, len(remaining_members)):
-                    invite_col.delete_many({
+                    await invite_col.delete_many({
                         "$or": [
                             {"sender_id": remaining_members[i], "receiver_id": remaining_members[j], "status": "accepted"},
                             {"sender_id": remaining_members[j], "receiver_id": remaining_members[i], "status": "accepted"}
@@ -362,7 +362,7 @@ async def leave_temporary_group(current_user: dict = Depends(get_current_user)):
             
             if len(remaining_members) == 2:
                 # A-B
-                invite_col.insert_one({
+                await invite_col.insert_one({
                     "sender_id": remaining_members[0],
                     "receiver_id": remaining_members[1],
                     "group_id": new_group_id,
@@ -371,14 +371,14 @@ async def leave_temporary_group(current_user: dict = Depends(get_current_user)):
                 })
             elif len(remaining_members) == 3:
                 # A-B, A-C (triangle with 2 edges)
-                invite_col.insert_one({
+                await invite_col.insert_one({
                     "sender_id": remaining_members[0],
                     "receiver_id": remaining_members[1],
                     "group_id": new_group_id,
                     "status": "accepted",
                     "created_at": datetime.utcnow()
                 })
-                invite_col.insert_one({
+                await invite_col.insert_one({
                     "sender_id": remaining_members[0],
                     "receiver_id": remaining_members[2],
                     "group_id": new_group_id,
@@ -387,21 +387,21 @@ async def leave_temporary_group(current_user: dict = Depends(get_current_user)):
                 })
             elif len(remaining_members) == 4:
                 # A-B, A-C, A-D (star pattern)
-                invite_col.insert_one({
+                await invite_col.insert_one({
                     "sender_id": remaining_members[0],
                     "receiver_id": remaining_members[1],
                     "group_id": new_group_id,
                     "status": "accepted",
                     "created_at": datetime.utcnow()
                 })
-                invite_col.insert_one({
+                await invite_col.insert_one({
                     "sender_id": remaining_members[0],
                     "receiver_id": remaining_members[2],
                     "group_id": new_group_id,
                     "status": "accepted",
                     "created_at": datetime.utcnow()
                 })
-                invite_col.insert_one({
+                await invite_col.insert_one({
                     "sender_id": remaining_members[0],
                     "receiver_id": remaining_members[3],
                     "group_id": new_group_id,
@@ -419,7 +419,7 @@ async def leave_temporary_group(current_user: dict = Depends(get_current_user)):
         group_members_notified.add(other_user)
         
         # Delete the invite
-        invite_col.delete_one({"_id": invite["_id"]})
+        await invite_col.delete_one({"_id": invite["_id"]})
         deleted_count += 1
 
     # Send notifications AFTER deleting all invites
@@ -438,12 +438,12 @@ async def lock_group(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
     
     # Find user's current temporary group
-    user_invites = list(invite_col.find({
+    user_invites = await invite_col.find({
         "$or": [
             {"sender_id": user_id, "status": "accepted"},
             {"receiver_id": user_id, "status": "accepted"}
         ]
-    }))
+    }).to_list()
     
     if not user_invites:
         raise HTTPException(400, "You are not in any temporary group")
@@ -451,10 +451,10 @@ async def lock_group(current_user: dict = Depends(get_current_user)):
     group_id = user_invites[0]["group_id"]
     
     # Get all accepted invites in this group
-    group_invites = list(invite_col.find({
+    group_invites = await invite_col.find({
         "group_id": group_id,
         "status": "accepted"
-    }))
+    }).to_list()
     
     # Get unique members
     group_members = set()
@@ -467,12 +467,12 @@ async def lock_group(current_user: dict = Depends(get_current_user)):
         raise HTTPException(400, "Group must have at least 3 members to lock")
     
     # Check if group already has a lock request from this user
-    existing_lock = teams_col.find_one({"team_id": group_id, "locked_by": user_id})
+    existing_lock = await teams_col.find_one({"team_id": group_id, "locked_by": user_id})
     if existing_lock:
         raise HTTPException(400, "You have already requested to lock this group")
     
     # Add lock request
-    teams_col.update_one(
+    await teams_col.update_one(
         {"team_id": group_id},
         {
             "$addToSet": {"locked_by": user_id},
@@ -487,13 +487,13 @@ async def lock_group(current_user: dict = Depends(get_current_user)):
     )
     
     # Check if all members have locked
-    lock_data = teams_col.find_one({"team_id": group_id})
+    lock_data = await teams_col.find_one({"team_id": group_id})
     if lock_data and len(lock_data.get("locked_by", [])) == len(group_members):
         # Generate final team ID
         final_team_id = f"team_{ObjectId()}"
         
         # All members have locked - finalize the team
-        teams_col.update_one(
+        await teams_col.update_one(
             {"team_id": group_id},
             {
                 "$set": {
@@ -507,7 +507,7 @@ async def lock_group(current_user: dict = Depends(get_current_user)):
         # 🔥 ADD THESE 3 LINES - Update team_id in all members' profiles 🔥
         for member_id in group_members:
             # Update team_id in profile
-            profiles_col.update_one(
+            await profiles_col.update_one(
                 {"user_id": ObjectId(member_id)},
                 {
                     "$set": {
@@ -536,12 +536,12 @@ async def get_group_members(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
     
     # Find user's group
-    user_invites = list(invite_col.find({
+    user_invites = await invite_col.find({
         "$or": [
             {"sender_id": user_id, "status": "accepted"},
             {"receiver_id": user_id, "status": "accepted"}
         ]
-    }))
+    }).to_list()
     
     if not user_invites:
         return {"message": "You are not in any group", "members": []}
@@ -549,10 +549,10 @@ async def get_group_members(current_user: dict = Depends(get_current_user)):
     group_id = user_invites[0]["group_id"]
     
     # Get all accepted invites in this group
-    group_invites = list(invite_col.find({
+    group_invites = await invite_col.find({
         "group_id": group_id,
         "status": "accepted"
-    }))
+    }).to_list()
     
     # Get unique members with names
     members = []
@@ -563,14 +563,14 @@ async def get_group_members(current_user: dict = Depends(get_current_user)):
             if uid not in member_ids:
                 member_ids.add(uid)
                 # Get user profile
-                profile = profiles_col.find_one({"user_id": ObjectId(uid)})
+                profile = await profiles_col.find_one({"user_id": ObjectId(uid)})
                 members.append({
                     "user_id": uid,
                     "name": profile.get("name", "Unknown") if profile else "Unknown"
                 })
     
     # Check if group is locked
-    team_data = teams_col.find_one({"team_id": group_id})
+    team_data = await teams_col.find_one({"team_id": group_id})
     is_locked = team_data.get("is_locked", False) if team_data else False
     locked_by = team_data.get("locked_by", []) if team_data else []
     user_has_requested_lock = user_id in locked_by
@@ -585,9 +585,9 @@ async def get_group_members(current_user: dict = Depends(get_current_user)):
 
 # ---------------- Get Sent Invites ----------------
 @router.get("/sent-invites/me") 
-def get_sent_invites(current_user: dict = Depends(get_current_user)):
+async def get_sent_invites(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
-    invites = list(invite_col.find({"sender_id": user_id}))
+    invites = await invite_col.find({"sender_id": user_id}).to_list()
     
     if not invites:
         return {"message": "You have not sent any invites."}
@@ -599,7 +599,7 @@ def get_sent_invites(current_user: dict = Depends(get_current_user)):
         except:
             receiver_obj_id = None
         
-        receiver_profile = profiles_col.find_one(
+        receiver_profile = await profiles_col.find_one(
             {"user_id": receiver_obj_id} if receiver_obj_id else {},
             {"name": 1, "_id": 0}
         )
@@ -616,9 +616,9 @@ def get_sent_invites(current_user: dict = Depends(get_current_user)):
 
 # ---------------- Get Pending Invites ----------------
 @router.get("/invites/me")
-def get_pending_invites(current_user: dict = Depends(get_current_user)):
+async def get_pending_invites(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
-    invites = list(invite_col.find({"receiver_id": user_id, "status": "pending"}))
+    invites = await invite_col.find({"receiver_id": user_id, "status": "pending"}).to_list()
     
     if not invites:
         return {"message": "You have no pending invites."}
@@ -630,7 +630,7 @@ def get_pending_invites(current_user: dict = Depends(get_current_user)):
         except:
             sender_obj_id = None
         
-        sender_profile = profiles_col.find_one(
+        sender_profile = await profiles_col.find_one(
             {"user_id": sender_obj_id} if sender_obj_id else {},
             {"name": 1, "_id": 0}
         )
@@ -647,13 +647,13 @@ def get_pending_invites(current_user: dict = Depends(get_current_user)):
 
 # ---------------- Delete Invite ----------------
 @router.delete("/invite/{invite_id}")
-def delete_invite(invite_id: str, current_user: dict = Depends(get_current_user)):
+async def delete_invite(invite_id: str, current_user: dict = Depends(get_current_user)):
     try:
         invite_obj_id = ObjectId(invite_id)
     except:
         raise HTTPException(status_code=400, detail="Invalid invite ID")
     
-    invite = invite_col.find_one({"_id": invite_obj_id})
+    invite = await invite_col.find_one({"_id": invite_obj_id})
     if not invite:
         raise HTTPException(status_code=404, detail="Invite not found")
     
@@ -661,7 +661,7 @@ def delete_invite(invite_id: str, current_user: dict = Depends(get_current_user)
     if invite["sender_id"] != str(current_user["_id"]):
         raise HTTPException(status_code=403, detail="Can only delete your own invites")
     
-    result = invite_col.delete_one({"_id": invite_obj_id})
+    result = await invite_col.delete_one({"_id": invite_obj_id})
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Invite not found")
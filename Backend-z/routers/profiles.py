@@ -4,14 +4,16 @@ from bson.errors import InvalidId
 from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from schemas.profiles import ProfileCreate, ProfileResponse, ProfileSummaryResponse
-from db.db import users_col, profiles_col, fs, db
+from db.db import adb, async_fs
 from fastapi import Depends
 from dependencies.auth import get_current_user
-from utils.mongo import serialize_mongo
+from utils.mongo import serialize_mongo, stream_grid_out
 # -------------------
 # CREATE PROFILE
 # -------------------
 router = APIRouter(prefix="/profiles", tags=["Profiles"])
+users_col = adb["users"]
+profiles_col = adb["profiles"]
 
 
 @router.post("/", response_model=ProfileCreate)
@@ -37,11 +39,11 @@ async def create_profile(
     user_obj_id = current_user["_id"]
 
     # Ensure user exists (same check as before)
-    user = users_col.find_one({"_id": user_obj_id})
+    user = await users_col.find_one({"_id": user_obj_id})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    existing_profile = profiles_col.find_one({"user_id": user_obj_id})
+    existing_profile = await profiles_col.find_one({"user_id": user_obj_id})
     if existing_profile:
         raise HTTPException(status_code=400, detail="Profile already exists")
 
@@ -52,7 +54,7 @@ async def create_profile(
             raise HTTPException(status_code=400, detail="Only PDF files allowed")
 
         pdf_bytes = await resume_pdf.read()
-        pdf_id = fs.put(
+        pdf_id = await async_fs.put(
             pdf_bytes,
             filename=resume_pdf.filename,
             contentType=resume_pdf.content_type
@@ -85,7 +87,7 @@ async def create_profile(
         },
     }
 
-    profiles_col.insert_one(profile_doc)
+    await profiles_col.insert_one(profile_doc)
 
     return {
         "user_id": str(user_obj_id),
@@ -128,7 +130,7 @@ async def update_profile(
 ):
     user_obj_id = current_user["_id"]
 
-    existing_profile = profiles_col.find_one({"user_id": user_obj_id})
+    existing_profile = await profiles_col.find_one({"user_id": user_obj_id})
     if not existing_profile:
         raise HTTPException(status_code=404, detail="Profile not found. Please create it first.")
 
@@ -161,12 +163,12 @@ async def update_profile(
         old_pdf_id = existing_profile.get("resume_pdf_id")
         if old_pdf_id:
             try:
-                fs.delete(old_pdf_id)
+                await async_fs.delete(old_pdf_id)
             except Exception as e:
                 pass
 
         pdf_bytes = await resume_pdf.read()
-        pdf_id = fs.put(
+        pdf_id = await async_fs.put(
             pdf_bytes,
             filename=resume_pdf.filename,
             contentType=resume_pdf.content_type
@@ -176,8 +178,8 @@ async def update_profile(
     if not update_fields:
         return {"detail": "No fields to update", "profile": serialize_mongo(existing_profile)}
 
-    profiles_col.update_one({"user_id": user_obj_id}, {"$set": update_fields})
-    updated_profile = profiles_col.find_one({"user_id": user_obj_id})
+    await profiles_col.update_one({"user_id": user_obj_id}, {"$set": update_fields})
+    updated_profile = await profiles_col.find_one({"user_id": user_obj_id})
 
     # Return serialized version
     serialized = serialize_mongo(updated_profile)
@@ -188,17 +190,17 @@ async def update_profile(
 # -------------------
 
 @router.get("/{user_id}", response_model=ProfileResponse)
-def get_profile(user_id: str):
+async def get_profile(user_id: str):
     try:
         user_obj_id = ObjectId(user_id)
     except InvalidId:
         raise HTTPException(status_code=400, detail="Invalid user_id format")
 
-    profile = profiles_col.find_one({"user_id": user_obj_id})
+    profile = await profiles_col.find_one({"user_id": user_obj_id})
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    user_doc = users_col.find_one({"_id": user_obj_id})
+    user_doc = await users_col.find_one({"_id": user_obj_id})
     gsuite_id = user_doc.get("gsuite_id") if user_doc else None
 
     # Get stage data or use default if not exists
@@ -233,14 +235,14 @@ def get_profile(user_id: str):
 # -------------------
 
 @router.get("/pdf/{pdf_id}")
-def preview_pdf(pdf_id: str):
+async def preview_pdf(pdf_id: str):
     try:
-        grid_out = fs.get(ObjectId(pdf_id))
+        grid_out = await async_fs.get(ObjectId(pdf_id))
     except:
         raise HTTPException(status_code=404, detail="PDF not found")
 
     return StreamingResponse(
-        grid_out,
+        stream_grid_out(grid_out),
         media_type="application/pdf",
         headers={"Content-Disposition": f'inline; filename="{grid_out.filename}"'}
     )
@@ -250,17 +252,17 @@ def preview_pdf(pdf_id: str):
 # -------------------
 
 @router.get("/profiles/summary/{user_id}", response_model=ProfileSummaryResponse)
-def get_profile_summary(user_id: str):
+async def get_profile_summary(user_id: str):
     try:
         user_obj_id = ObjectId(user_id)
     except InvalidId:
         raise HTTPException(status_code=400, detail="Invalid user_id format")
 
-    profile = profiles_col.find_one({"user_id": user_obj_id})
+    profile = await profiles_col.find_one({"user_id": user_obj_id})
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    user_doc = users_col.find_one({"_id": user_obj_id})
+    user_doc = await users_col.find_one({"_id": user_obj_id})
     gsuite_id = user_doc.get("gsuite_id") if user_doc else None
 
     return {
@@ -278,7 +280,7 @@ def get_profile_summary(user_id: str):
 # -------------------
 
 @router.get("/students/all")
-def get_all_students(
+async def get_all_students(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search by name or roll number"),
@@ -292,7 +294,7 @@ def get_all_students(
     # Check if user is committee member (you may want to add this check)
     # For now, we'll allow any authenticated user (committee check can be added later)
     
-    teams_col = db["teams"]
+    teams_col = adb["teams"]
     
     # Build query
     query = {}
@@ -339,7 +341,7 @@ def get_all_students(
         query.update(group_conditions)
     
     # Count total matching documents
-    total_count = profiles_col.count_documents(query)
+    total_count = await profiles_col.count_documents(query)
     
     # Calculate pagination
     skip = (page - 1) * limit
@@ -349,7 +351,7 @@ def get_all_students(
     cursor = profiles_col.find(query).skip(skip).limit(limit).sort("name", 1)
     
     students = []
-    for profile in cursor:
+    async for profile in cursor:
         user_id = str(profile.get("user_id"))
         
         # Get stage information
@@ -386,7 +388,7 @@ def get_all_students(
 # -------------------
 
 @router.get("/groups/all")
-def get_all_locked_groups(
+async def get_all_locked_groups(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search by member name or roll number"),
@@ -400,8 +402,8 @@ def get_all_locked_groups(
     """
     # TODO: Add committee member role check here
     
-    teams_col = db["teams"]
-    advisors_col = db["advisors"]
+    teams_col = adb["teams"]
+    advisors_col = adb["advisors"]
     
     # Get all locked teams
     query = {"is_locked": True}
@@ -412,7 +414,7 @@ def get_all_locked_groups(
         pass
     
     # Count total locked teams
-    total_count = teams_col.count_documents(query)
+    total_count = await teams_col.count_documents(query)
     
     # Calculate pagination
     skip = (page - 1) * limit
@@ -422,7 +424,7 @@ def get_all_locked_groups(
     teams_cursor = teams_col.find(query).skip(skip).limit(limit).sort("locked_at", -1)
     
     groups = []
-    for team in teams_cursor:
+    async for team in teams_cursor:
         team_id = team.get("final_team_id") or team.get("team_id", "")
         member_ids = team.get("members", [])
         
@@ -453,10 +455,10 @@ def get_all_locked_groups(
             continue
         
         # Fetch member profiles
-        member_profiles = list(profiles_col.find(
+        member_profiles = await profiles_col.find(
             {"user_id": {"$in": member_object_ids}},
             {"name": 1, "roll_number": 1, "user_id": 1, "stages": 1, "advisor_id": 1}
-        ))
+        ).to_list()
         
         # Get stage status from first member (all members should have same stage)
         stage_status = "Stage 1"
@@ -486,8 +488,8 @@ def get_all_locked_groups(
                 
                 # Fallback: check if there's an accepted pitch for this team
                 if not advisor_id:
-                    student_pitches_col = db["student_pitches"]
-                    accepted_pitch = student_pitches_col.find_one({
+                    student_pitches_col = adb["student_pitches"]
+                    accepted_pitch = await student_pitches_col.find_one({
                         "team_id": str(team.get("_id")),
                         "status": "accepted"
                     })
@@ -497,7 +499,7 @@ def get_all_locked_groups(
                 if advisor_id:
                     try:
                         advisor_obj_id = ObjectId(advisor_id) if isinstance(advisor_id, str) else advisor_id
-                        advisor_doc = advisors_col.find_one({"advisor_id": advisor_obj_id})
+                        advisor_doc = await advisors_col.find_one({"advisor_id": advisor_obj_id})
                         if advisor_doc:
                             advisor_name = advisor_doc.get("name", "")
                     except:
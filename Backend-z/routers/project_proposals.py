@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from fastapi.responses import StreamingResponse
-from db.db import db, fs
+from db.db import adb, async_fs
 from dependencies.auth import get_current_user
 from datetime import datetime
 from bson import ObjectId
 from bson.errors import InvalidId
+from utils.mongo import stream_grid_out
 
 router = APIRouter(prefix="/project_proposals", tags=["Project Proposals"])
-proposals_col = db["project_proposals"]
-teams_col = db["teams"]
+proposals_col = adb["project_proposals"]
+teams_col = adb["teams"]
 
 MAX_FILE_SIZE = 15 * 1024 * 1024  # 15MB limit for 10-20 page PDFs with graphs
 
@@ -20,13 +21,13 @@ async def submit_proposal(
     user_id_str = str(current_user["_id"])
     
     # 1. Find user's team
-    team = teams_col.find_one({"members": user_id_str})
+    team = await teams_col.find_one({"members": user_id_str})
     if not team:
         raise HTTPException(status_code=400, detail="You must be in a group to submit a proposal.")
     team_id_str = str(team["_id"])
     
     # 2. Check if there is already an active (non-rejected) proposal
-    active_proposal = proposals_col.find_one({
+    active_proposal = await proposals_col.find_one({
         "team_id": team_id_str,
         "status": {"$in": ["pending", "advisor_accepted", "committee_accepted"]}
     })
@@ -41,7 +42,7 @@ async def submit_proposal(
     if len(file_bytes) > MAX_FILE_SIZE:
         raise HTTPException(status_code=400, detail="File too large. Maximum size is 15MB.")
         
-    file_id = fs.put(
+    file_id = await async_fs.put(
         file_bytes,
         filename=proposal_file.filename,
         contentType=proposal_file.content_type
@@ -65,20 +66,20 @@ async def submit_proposal(
         "events": event_log
     }
     
-    result = proposals_col.insert_one(proposal_doc)
+    result = await proposals_col.insert_one(proposal_doc)
     return {"message": "Proposal submitted successfully.", "proposal_id": str(result.inserted_id)}
 
 
 @router.get("/my_proposal")
-def get_my_proposal(current_user: dict = Depends(get_current_user)):
+async def get_my_proposal(current_user: dict = Depends(get_current_user)):
     user_id_str = str(current_user["_id"])
     
-    team = teams_col.find_one({"members": user_id_str})
+    team = await teams_col.find_one({"members": user_id_str})
     if not team:
         raise HTTPException(status_code=400, detail="You are not in a group.")
     
     # Get the latest proposal by this team
-    proposal = proposals_col.find_one(
+    proposal = await proposals_col.find_one(
         {"team_id": str(team["_id"])},
         sort=[("created_at", -1)]
     )
@@ -97,14 +98,14 @@ def get_my_proposal(current_user: dict = Depends(get_current_user)):
 
 
 @router.get("/download/{file_id}")
-def download_proposal(file_id: str):
+async def download_proposal(file_id: str):
     try:
-        grid_out = fs.get(ObjectId(file_id))
+        grid_out = await async_fs.get(ObjectId(file_id))
     except:
         raise HTTPException(status_code=404, detail="File not found")
         
     return StreamingResponse(
-        grid_out,
+        stream_grid_out(grid_out),
         media_type="application/pdf",
         headers={"Content-Disposition": f'inline; filename="{grid_out.filename}"'}
     )
@@ -117,16 +118,16 @@ class ReviewPayload(BaseModel):
     comment: Optional[str] = None
 
 @router.get("/advisor/selected_groups")
-def get_advisor_selected_groups(current_user: dict = Depends(get_current_user)):
+async def get_advisor_selected_groups(current_user: dict = Depends(get_current_user)):
     user_id_str = str(current_user["_id"])
     
-    student_pitches_col = db["student_pitches"]
-    profiles_col = db["profiles"]
+    student_pitches_col = adb["student_pitches"]
+    profiles_col = adb["profiles"]
     
-    accepted_pitches = list(student_pitches_col.find({
+    accepted_pitches = await student_pitches_col.find({
         "advisor_id": user_id_str,
         "status": "accepted"
-    }))
+    }).to_list()
     
     selected_groups = []
     
@@ -135,7 +136,7 @@ def get_advisor_selected_groups(current_user: dict = Depends(get_current_user)):
         if not team_id: continue
         
         try:
-            team = teams_col.find_one({"_id": ObjectId(team_id)})
+            team = await teams_col.find_one({"_id": ObjectId(team_id)})
         except:
             continue
             
@@ -144,7 +145,7 @@ def get_advisor_selected_groups(current_user: dict = Depends(get_current_user)):
         members_data = []
         for member_id in team.get("members", []):
             try:
-                prof = profiles_col.find_one({"user_id": ObjectId(member_id)})
+                prof = await profiles_col.find_one({"user_id": ObjectId(member_id)})
                 if prof:
                     members_data.append({
                         "name": prof.get("name", "Unknown"),
@@ -153,7 +154,7 @@ def get_advisor_selected_groups(current_user: dict = Depends(get_current_user)):
             except:
                 pass
                 
-        proposal = proposals_col.find_one(
+        proposal = await proposals_col.find_one(
             {"team_id": str(team_id)},
             sort=[("created_at", -1)]
         )
@@ -177,7 +178,7 @@ def get_advisor_selected_groups(current_user: dict = Depends(get_current_user)):
     return selected_groups
 
 @router.post("/review/{proposal_id}")
-def review_proposal(
+async def review_proposal(
     proposal_id: str,
     payload: ReviewPayload,
     current_user: dict = Depends(get_current_user)
@@ -187,7 +188,7 @@ def review_proposal(
         raise HTTPException(status_code=400, detail="Invalid action.")
         
     try:
-        proposal = proposals_col.find_one({"_id": ObjectId(proposal_id)})
+        proposal = await proposals_col.find_one({"_id": ObjectId(proposal_id)})
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid Proposal ID")
         
@@ -195,8 +196,8 @@ def review_proposal(
         raise HTTPException(status_code=404, detail="Proposal not found")
         
     team_id = proposal.get("team_id")
-    student_pitches_col = db["student_pitches"]
-    pitch = student_pitches_col.find_one({
+    student_pitches_col = adb["student_pitches"]
+    pitch = await student_pitches_col.find_one({
         "team_id": team_id,
         "advisor_id": user_id_str,
         "status": "accepted"
@@ -215,7 +216,7 @@ def review_proposal(
     
     new_status = f"advisor_{payload.action}"
     
-    proposals_col.update_one(
+    await proposals_col.update_one(
         {"_id": ObjectId(proposal_id)},
         {
             "$set": {"status": new_status},
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Query
-from db.db import db
+from db.db import adb
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
-projects_col = db["Past_Projects"]
+projects_col = adb["Past_Projects"]
 
 #General Projects Page (No Search)
 #GET /projects?page=1&limit=12
@@ -24,7 +24,7 @@ def serialize_project(doc: dict) -> dict:
     return doc
 
 @router.get("/")
-def get_projects(
+async def get_projects(
     q: str | None = Query(None),
     batch: str | None = Query(None),
     advisor: str | None = Query(None),
@@ -57,23 +57,23 @@ def get_projects(
 
     cursor = cursor.skip(skip).limit(limit)
 
-    total = projects_col.count_documents(query)
+    total = await projects_col.count_documents(query)
 
     return {
         "page": page,
         "limit": limit,
         "total": total,
         "pages": (total + limit - 1) // limit,
-        "data": [serialize_project(doc) for doc in cursor]
+        "data": [serialize_project(doc) async for doc in cursor]
     }
 
     
     
 ##Filters Data for Frontend Dropdowns
 @router.get("/meta")
-def get_meta():
-    batches = projects_col.distinct("batch")
-    advisors = projects_col.distinct("advisor")
+async def get_meta():
+    batches = await projects_col.distinct("batch")
+    advisors = await projects_col.distinct("advisor")
 
     return {
         "batches": sorted(batches),
@@ -0,0 +1,156 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from collections import deque
+import threading
+import time
+
+from ai.metadata_filter import make_filter
+from dependencies.auth import get_current_user, require_committee_member
+
+router = APIRouter(prefix="/retrieval", tags=["Retrieval"])
+
+# Structured, LLM-free access to the archive tools, e.g. for live novelty
+# checks and advisor suggestions while a student types a pitch. Uses the
+# same index, query-vector cache and per-document facts as the chat agent.
+
+
+# ============================================================
+# Lazy Loader
+# ============================================================
+
+_agent = None
+
+def get_agent():
+    global _agent
+    if _agent is None:
+        print("🔄 Loading retrieval core...")
+        from ai import fydp_agent
+        _agent = fydp_agent
+        print("✅ Retrieval core loaded")
+    return _agent
+
+
+# ============================================================
+# Latency Tracking (target: p95 < 50 ms)
+# ============================================================
+
+LATENCY_WINDOW = 1000   # most recent requests kept per endpoint
+
+_latencies: dict = {}
+_latency_lock = threading.Lock()
+
+
+def _record_latency(endpoint: str, ms: float):
+    with _latency_lock:
+        _latencies.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(ms)
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[idx], 2)
+
+
+def _timed(endpoint: str, fn, *args) -> dict:
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Retrieval error: {e}")
+    took_ms = (time.perf_counter() - start) * 1000
+    _record_latency(endpoint, took_ms)
+    return {**result, "took_ms": round(took_ms, 2)}
+
+
+# ============================================================
+# Endpoints
+# ============================================================
+
+@router.get("/archive")
+def search_archive(
+    q: str = Query(..., min_length=2, max_length=200),
+    batch: str | None = Query(None, description="Comma-separated batch years, e.g. 2019,2020"),
+    batch_from: int | None = Query(None, ge=1990, le=2100),
+    batch_to: int | None = Query(None, ge=1990, le=2100),
+    advisor: str | None = Query(None, max_length=100),
+    source_file: str | None = Query(None, max_length=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """Archive matches with scores, saturation and novelty status, optionally filtered."""
+    batches = [b.strip() for b in batch.split(",") if b.strip()] if batch else None
+    filters = make_filter(advisor, batches, batch_from, batch_to, source_file)
+    return _timed("archive", get_agent().search_archive, q, filters)
+
+
+@router.get("/advisors")
+def rank_advisors(
+    idea: str = Query(..., min_length=2, max_length=300),
+    top_n: int = Query(3, ge=1, le=10),
+    batch_from: int | None = Query(None, ge=1990, le=2100),
+    batch_to: int | None = Query(None, ge=1990, le=2100),
+    current_user: dict = Depends(get_current_user)
+):
+    """Advisors ranked by alignment with a project idea, with evidence and themes."""
+    filters = make_filter(batch_from=batch_from, batch_to=batch_to)
+    return _timed("advisors", get_agent().rank_advisors_for, idea, top_n, filters)
+
+
+@router.get("/portfolio")
+def advisor_portfolio(
+    name: str = Query(..., min_length=2, max_length=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """All archived projects of one advisor, newest first, with recurring themes."""
+    return _timed("portfolio", get_agent().portfolio_for, name)
+
+
+@router.get("/advisor/resolve")
+def resolve_advisor(
+    name: str = Query(..., min_length=2, max_length=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """Canonical advisor for a misspelt or partial name, with a match confidence."""
+    resolved = get_agent().resolve_advisor(name)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail=f"No advisor matches '{name}'.")
+    return resolved
+
+
+@router.get("/latency")
+def get_latency(current_user: dict = Depends(get_current_user)):
+    with _latency_lock:
+        snapshot = {k: list(v) for k, v in _latencies.items()}
+
+    return {
+        endpoint: {
+            "count": len(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "max_ms": round(max(values), 2),
+        }
+        for endpoint, values in snapshot.items() if values
+    }
+
+
+# ============================================================
+# Index Administration (committee only)
+# ============================================================
+
+@router.get("/index")
+def get_index_status(current_user: dict = Depends(require_committee_member)):
+    """Served index version, document count and the last reload's outcome."""
+    return get_agent().index_status()
+
+
+@router.post("/index/reload", status_code=202)
+def reload_index(
+    rebuild: bool = False,
+    current_user: dict = Depends(require_committee_member)
+):
+    """
+    Swap in a new archive index without a restart. rebuild=true re-embeds the
+    archive JSON first; otherwise the index on disk (e.g. from an offline
+    build) is loaded. This worker reloads now; the others pick up the
+    published version within INDEX_SYNC_SECONDS. Poll GET /retrieval/index
+    for completion.
+    """
+    return get_agent().request_index_reload(rebuild)
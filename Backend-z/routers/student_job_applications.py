@@ -2,19 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from bson import ObjectId
 from datetime import datetime
 
-from db.db import db
+from db.db import adb
 from dependencies.auth import get_current_user
 from utils.mongo import serialize_mongo
 
 router = APIRouter(prefix="/student/jobs", tags=["Student Job Applications"])
 
-industry_jobs_col = db["Industry_Jobs"]
-student_job_applications_col = db["student_job_applications"]
-profiles_col = db["profiles"]
-users_col = db["users"]
+industry_jobs_col = adb["Industry_Jobs"]
+student_job_applications_col = adb["student_job_applications"]
+profiles_col = adb["profiles"]
+users_col = adb["users"]
 
 @router.post("/{job_id}/apply", status_code=status.HTTP_201_CREATED)
-def apply_to_industry_job(
+async def apply_to_industry_job(
     job_id: str,
     current_user: dict = Depends(get_current_user)
 ):
@@ -25,7 +25,7 @@ def apply_to_industry_job(
     user_id = ObjectId(current_user["_id"])
 
     # Verify user exists and is a student
-    profile = profiles_col.find_one({"user_id": user_id})
+    profile = await profiles_col.find_one({"user_id": user_id})
     if not profile:
         raise HTTPException(status_code=400, detail="User profile not found")
 
@@ -33,7 +33,7 @@ def apply_to_industry_job(
     if not ObjectId.is_valid(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID")
 
-    job = industry_jobs_col.find_one({"_id": ObjectId(job_id)})
+    job = await industry_jobs_col.find_one({"_id": ObjectId(job_id)})
     if not job:
         raise HTTPException(status_code=404, detail="Job posting not found")
 
@@ -41,13 +41,13 @@ def apply_to_industry_job(
         raise HTTPException(status_code=400, detail="Only approved industry jobs can be applied to")
 
     # Prevent duplicate applications
-    if student_job_applications_col.find_one({
+    if await student_job_applications_col.find_one({
         "job_id": ObjectId(job_id),
         "user_id": user_id
     }):
         raise HTTPException(status_code=409, detail="You have already applied for this job")
 
-    student_job_applications_col.insert_one({
+    await student_job_applications_col.insert_one({
         "job_id": ObjectId(job_id),
         "user_id": user_id,
         "industry_id": job.get("industry_id"),
@@ -61,19 +61,17 @@ def apply_to_industry_job(
 
 
 @router.get("/my-applications")
-def my_applied_jobs(current_user: dict = Depends(get_current_user)):
+async def my_applied_jobs(current_user: dict = Depends(get_current_user)):
     """
     Returns a list of all Industry jobs the current user has applied for.
     """
     user_id = ObjectId(current_user["_id"])
     
     try:
-        data = list(
-            student_job_applications_col.find(
-                {"user_id": user_id},
-                {"_id": 0}
-            ).sort("created_at", -1)
-        )
+        data = await student_job_applications_col.find(
+            {"user_id": user_id},
+            {"_id": 0}
+        ).sort("created_at", -1).to_list()
         return serialize_mongo(data)
     except Exception as e:
         print(f"Error fetching applied jobs: {e}")
@@ -81,7 +79,7 @@ def my_applied_jobs(current_user: dict = Depends(get_current_user)):
 
 
 @router.get("/industry-view/applicants")
-def get_industry_job_applicants(current_user: dict = Depends(get_current_user)):
+async def get_industry_job_applicants(current_user: dict = Depends(get_current_user)):
     """
     Returns a list of all students who have applied to the logged-in industry user's jobs.
     """
@@ -89,7 +87,7 @@ def get_industry_job_applicants(current_user: dict = Depends(get_current_user)):
     
     try:
         # Fetch all job application records matching the industry_id
-        applications = list(student_job_applications_col.find({"industry_id": industry_id}))
+        applications = await student_job_applications_col.find({"industry_id": industry_id}).to_list()
         
         # Enrich the records with Job titles and Student profiles
         result = []
@@ -97,16 +95,16 @@ def get_industry_job_applicants(current_user: dict = Depends(get_current_user)):
             record = serialize_mongo(app)
             
             # Lookup the job title
-            job = industry_jobs_col.find_one({"_id": ObjectId(app["job_id"])})
+            job = await industry_jobs_col.find_one({"_id": ObjectId(app["job_id"])})
             if job:
                 record["job_title"] = job.get("title", "Unknown Job")
                 
             # Lookup the student profile
-            profile = profiles_col.find_one({"user_id": ObjectId(app["user_id"])})
+            profile = await profiles_col.find_one({"user_id": ObjectId(app["user_id"])})
             if profile:
                 record["student_name"] = profile.get("name", "Unknown Name")
                 
-                user_doc = users_col.find_one({"_id": profile["user_id"]})
+                user_doc = await users_col.find_one({"_id": profile["user_id"]})
                 record["student_email"] = "Unknown Email"
                 if user_doc:
                     record["student_email"] = user_doc.get("email") or user_doc.get("gsuite_id") or "Unknown Email"
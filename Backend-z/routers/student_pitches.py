@@ -1,15 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
-from db.db import db, fs
-from dependencies.auth import get_current_user
+from db.db import adb, async_fs
+from dependencies.auth import get_auth_context, get_current_user
 from datetime import datetime
 from bson import ObjectId
 from bson.errors import InvalidId
+from utils.mongo import stream_grid_out
 
 router = APIRouter(prefix="/student_pitches", tags=["Student Pitches"])
-student_pitches_col = db["student_pitches"]
-advisors_col = db["advisors"]
-teams_col = db["teams"]
+student_pitches_col = adb["student_pitches"]
+advisors_col = adb["advisors"]
+teams_col = adb["teams"]
 
 @router.post("/")
 async def create_pitch(
@@ -25,7 +26,7 @@ async def create_pitch(
     industry_flag = is_industry.lower() == "true"
     
     # 1. Find user's team
-    team = teams_col.find_one({"members": user_id_str})
+    team = await teams_col.find_one({"members": user_id_str})
     if not team:
         raise HTTPException(status_code=400, detail="You must be in a group to pitch an idea.")
     team_id_str = str(team["_id"])
@@ -37,12 +38,12 @@ async def create_pitch(
         raise HTTPException(status_code=400, detail="Invalid advisor ID format.")
     
     # Check if advisor exists (they are stored with advisor_id as ObjectId in advisors collection)
-    advisor = advisors_col.find_one({"advisor_id": advisor_obj_id})
+    advisor = await advisors_col.find_one({"advisor_id": advisor_obj_id})
     if not advisor:
          raise HTTPException(status_code=404, detail="Advisor not found.")
          
     # 2. Check limits (1 pitch per advisor per group)
-    existing_pitch = student_pitches_col.find_one({
+    existing_pitch = await student_pitches_col.find_one({
         "team_id": team_id_str, 
         "advisor_id": advisor_id,
         "status": {"$in": ["pending", "accepted"]} # If rejected, they can submit again
@@ -54,7 +55,7 @@ async def create_pitch(
         
     # 3. Check advisor slots limits (4 normal, 1 industry)
     if industry_flag:
-        industry_accepted = student_pitches_col.count_documents({
+        industry_accepted = await student_pitches_col.count_documents({
             "advisor_id": advisor_id,
             "is_industry": True,
             "status": "accepted"
@@ -62,7 +63,7 @@ async def create_pitch(
         if industry_accepted >= 1:
             raise HTTPException(status_code=400, detail="Advisor already has 1 industry pitch accepted.")
     else:
-        normal_accepted = student_pitches_col.count_documents({
+        normal_accepted = await student_pitches_col.count_documents({
             "advisor_id": advisor_id,
             "is_industry": False,
             "status": "accepted"
@@ -75,7 +76,7 @@ async def create_pitch(
         raise HTTPException(status_code=400, detail="Only PNG or JPG images allowed for flowchart")
     
     image_bytes = await flowchart_image.read()
-    image_id = fs.put(
+    image_id = await async_fs.put(
         image_bytes,
         filename=flowchart_image.filename,
         contentType=flowchart_image.content_type
@@ -94,35 +95,35 @@ async def create_pitch(
         "status": "pending",
         "created_at": datetime.utcnow()
     }
-    result = student_pitches_col.insert_one(pitch_doc)
+    result = await student_pitches_col.insert_one(pitch_doc)
     return {"message": "Pitch submitted successfully", "pitch_id": str(result.inserted_id)}
 
 @router.get("/advisor/pitches")
-def get_advisor_pitches(current_user: dict = Depends(get_current_user)):
+async def get_advisor_pitches(current_user: dict = Depends(get_current_user), auth: dict = Depends(get_auth_context)):
     user_id_str = str(current_user["_id"])
     
     # Check if advisor
-    advisor = advisors_col.find_one({"advisor_id": current_user["_id"]})
+    advisor = auth["advisor"]
     if not advisor:
         raise HTTPException(status_code=403, detail="Only advisors can view these pitches.")
     advisor_id_str = str(advisor["advisor_id"])
     
-    profiles_col = db["profiles"]
+    profiles_col = adb["profiles"]
     
     pitches = []
     cursor = student_pitches_col.find({"advisor_id": advisor_id_str}).sort("created_at", -1)
-    for p in cursor:
+    async for p in cursor:
         team_id = p.get("team_id")
         
         # Get team to find members
-        team = teams_col.find_one({"_id": ObjectId(team_id)}) if team_id and len(team_id) == 24 else None
+        team = await teams_col.find_one({"_id": ObjectId(team_id)}) if team_id and len(team_id) == 24 else None
         
         members_data = []
         if team and "members" in team:
             # Fetch member names from profiles
             for m_id in team["members"]:
                 try:
-                    profile = profiles_col.find_one({"user_id": ObjectId(m_id)})
+                    profile = await profiles_col.find_one({"user_id": ObjectId(m_id)})
                     if profile:
                         members_data.append({
                             "user_id": m_id, 
@@ -150,17 +151,17 @@ def get_advisor_pitches(current_user: dict = Depends(get_current_user)):
 from schemas.student_pitches import PitchStatusUpdate
 
 @router.put("/{pitch_id}/status")
-def update_pitch_status(pitch_id: str, update_data: PitchStatusUpdate, current_user: dict = Depends(get_current_user)):
+async def update_pitch_status(pitch_id: str, update_data: PitchStatusUpdate, current_user: dict = Depends(get_current_user), auth: dict = Depends(get_auth_context)):
     if update_data.status not in ["accepted", "rejected"]:
         raise HTTPException(status_code=400, detail="Invalid status")
         
     # Verify advisor
-    advisor = advisors_col.find_one({"advisor_id": current_user["_id"]})
+    advisor = auth["advisor"]
     if not advisor:
          raise HTTPException(status_code=403, detail="Only advisors can update pitch status.")
          
     try:
-        pitch = student_pitches_col.find_one({"_id": ObjectId(pitch_id)})
+        pitch = await student_pitches_col.find_one({"_id": ObjectId(pitch_id)})
     except InvalidId:
         raise HTTPException(status_code=400, detail="Invalid pitch ID")
         
@@ -172,7 +173,7 @@ def update_pitch_status(pitch_id: str, update_data: PitchStatusUpdate, current_u
         raise HTTPException(status_code=403, detail="You can only review pitches sent to you.")
         
     # Update status
-    student_pitches_col.update_one({"_id": ObjectId(pitch_id)}, {"$set": {"status": update_data.status}})
+    await student_pitches_col.update_one({"_id": ObjectId(pitch_id)}, {"$set": {"status": update_data.status}})
     
     # Auto-cancel logic & stage advancement
     if update_data.status == "accepted":
@@ -180,7 +181,7 @@ def update_pitch_status(pitch_id: str, update_data: PitchStatusUpdate, current_u
         
         if team_id:
             # 1. Update all other 'pending' pitches for this team to 'rejected'
-            student_pitches_col.update_many(
+            await student_pitches_col.update_many(
                 {
                     "team_id": team_id, 
                     "status": "pending", 
@@ -190,9 +191,9 @@ def update_pitch_status(pitch_id: str, update_data: PitchStatusUpdate, current_u
             )
             
             # 2. Update profiles for stage2_completed
-            team = teams_col.find_one({"_id": ObjectId(team_id)})
+            team = await teams_col.find_one({"_id": ObjectId(team_id)})
             if team and "members" in team:
-                profiles_col = db["profiles"]
+                profiles_col = adb["profiles"]
                 member_obj_ids = []
                 for m in team["members"]:
                     try:
@@ -206,7 +207,7 @@ def update_pitch_status(pitch_id: str, update_data: PitchStatusUpdate, current_u
                     if advisor_id:
                         update_fields["advisor_id"] = str(advisor_id)
                         
-                    profiles_col.update_many(
+                    await profiles_col.update_many(
                         {"user_id": {"$in": member_obj_ids}},
                         {"$set": update_fields}
                     )
@@ -215,17 +216,17 @@ def update_pitch_status(pitch_id: str, update_data: PitchStatusUpdate, current_u
     return {"message": f"Pitch marked as {update_data.status}"}
 
 @router.get("/image/{image_id}")
-def get_pitch_flowchart_image(image_id: str):
+async def get_pitch_flowchart_image(image_id: str):
     """
     Serve pitch flowchart image from GridFS.
     """
     try:
-        grid_out = fs.get(ObjectId(image_id))
+        grid_out = await async_fs.get(ObjectId(image_id))
     except:
         raise HTTPException(status_code=404, detail="Image not found")
     
     return StreamingResponse(
-        grid_out,
+        stream_grid_out(grid_out),
         media_type=grid_out.content_type or "image/png",
         headers={"Content-Disposition": f'inline; filename="{grid_out.filename}"'}
     )
@@ -1,21 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends
 from bson import ObjectId
 from bson.errors import InvalidId
-from db.db import db
+from db.db import adb
 from dependencies.auth import get_current_user
 
 
 
 router = APIRouter()
 
-profiles_col = db["profiles"]
-teams_col = db["teams"]
+profiles_col = adb["profiles"]
+teams_col = adb["teams"]
 
 # -------------------------------
 # GET: My Team Members (Stage 1 Required)
 # -------------------------------
 @router.get("/my-team/members")
-def get_my_team_members(current_user: dict = Depends(get_current_user)):
+async def get_my_team_members(current_user: dict = Depends(get_current_user)):
     """
     Returns names of all team members except the logged-in user,
     only if stage1_completed is true
@@ -26,7 +26,7 @@ def get_my_team_members(current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=400, detail="User ID missing in token")
 
     # 1. Get profile by user_id (in profiles collection)
-    profile = profiles_col.find_one({"user_id": user_id_obj})
+    profile = await profiles_col.find_one({"user_id": user_id_obj})
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -40,7 +40,7 @@ def get_my_team_members(current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=404, detail="User is not in a team")
 
     # 4. Get team document by final_team_id
-    team = teams_col.find_one({"final_team_id": team_id})
+    team = await teams_col.find_one({"final_team_id": team_id})
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
@@ -56,7 +56,7 @@ def get_my_team_members(current_user: dict = Depends(get_current_user)):
         {"_id": 0, "user_id": 1, "name": 1}
     )
 
-    member_list = [{"user_id": str(m["user_id"]), "name": m["name"]} for m in members_cursor]
+    member_list = [{"user_id": str(m["user_id"]), "name": m["name"]} async for m in members_cursor]
 
     return {
         "team_id": team_id,
@@ -66,7 +66,7 @@ def get_my_team_members(current_user: dict = Depends(get_current_user)):
 
 
 @router.get("/group/lock-status")
-def get_group_lock_status(current_user: dict = Depends(get_current_user)):
+async def get_group_lock_status(current_user: dict = Depends(get_current_user)):
     """
     Returns the lock status of the current user's group:
     - how many members have locked
@@ -76,7 +76,7 @@ def get_group_lock_status(current_user: dict = Depends(get_current_user)):
     user_id_str = str(current_user["_id"])
 
     # 1. Find the team where the user is a member
-    team = teams_col.find_one({"members": user_id_str})
+    team = await teams_col.find_one({"members": user_id_str})
     if not team:
         raise HTTPException(status_code=404, detail="You are not in any group")
 
@@ -93,7 +93,7 @@ def get_group_lock_status(current_user: dict = Depends(get_current_user)):
 
     # 3. Optional: update is_locked if everyone has locked
     if remaining == 0 and not team.get("is_locked", False):
-        teams_col.update_one({"_id": team["_id"]}, {"$set": {"is_locked": True}})
+        await teams_col.update_one({"_id": team["_id"]}, {"$set": {"is_locked": True}})
         is_fully_locked = True
     else:
         is_fully_locked = team.get("is_locked", False)
@@ -11,3 +11,9 @@ def serialize_mongo(doc):
         return str(doc)
 
     return doc
+
+
+async def stream_grid_out(grid_out):
+    """Yield an async GridFS file chunk by chunk, for StreamingResponse."""
+    while chunk := await grid_out.readchunk():
+        yield chunk